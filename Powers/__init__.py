@@ -122,6 +122,8 @@ DB_URI         = Config.DB_URI
 DB_NAME        = Config.DB_NAME
 NO_LOAD        = Config.NO_LOAD
 WORKERS        = Config.WORKERS
+DB_WORKERS     = Config.DB_WORKERS
+BIO_CACHE_TTL  = Config.BIO_CACHE_TTL
 BDB_URI        = Config.BDB_URI
 PREFIX_HANDLER = Config.PREFIX_HANDLER
 HELP_COMMANDS  = {}
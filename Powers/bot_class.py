@@ -16,10 +16,16 @@ from Powers import (
     aiogram_bot, aiogram_dp,
     tele_client,
 )
-from Powers.database import MongoDB
+from Powers.database import MongoDB, ensure_indexes, run_db
+from Powers.database.chats_db import Chats
+from Powers.database.stats_db import stats_refresher
+from Powers.database.tracker_db import sightings
 from Powers.plugins import all_plugins
 from Powers.plugins.scheduled_jobs import *
 from Powers.supports import *
+from Powers.utils.broadcast import broadcaster
+from Powers.utils.caching import ADMIN_CACHE
+from Powers.utils.captcha_helper import captcha_pool
 from Powers.vars import Config
 
 INITIAL_LOCK = RLock()
@@ -102,6 +108,24 @@ class Gojo(Client):
         LOGGER.info(f"Whitelist Users : {SUPPORT_USERS['White']}")
         LOGGER.info(f"Plugins Loaded  : {cmd_list}")
 
+        # ── Write-behind chat/user tracking ───────────────────────────────────
+        sightings.start()
+
+        # ── Database indexes, built in the background ─────────────────────────
+        self._index_task = asyncio.create_task(run_db(ensure_indexes))
+
+        # ── /stats snapshot, refreshed periodically ───────────────────────────
+        self._stats_task = asyncio.create_task(stats_refresher())
+
+        # ── Admin registry sized to the chats we are in ───────────────────────
+        ADMIN_CACHE.resize(await run_db(Chats.count_chats))
+
+        # ── Pre-rendered captchas for incoming joins ──────────────────────────
+        captcha_pool.start()
+
+        # ── Broadcasts interrupted by the last restart ────────────────────────
+        await broadcaster.resume(self)
+
         # ── Scheduler ─────────────────────────────────────────────────────────
         if Config.BDB_URI:
             scheduler.add_job(send_wishish, "cron", [self], hour=0, minute=0, second=0)
@@ -128,6 +152,9 @@ class Gojo(Client):
         runtime = strftime("%Hh %Mm %Ss", gmtime(t() - UPTIME))
         LOGGER.info("Stopping all clients...")
         scheduler.remove_all_jobs()
+        if hasattr(self, "_stats_task"):
+            self._stats_task.cancel()
+        captcha_pool.stop()
 
         # Stop Aiogram
         if hasattr(self, "_aiogram_task"):
@@ -165,5 +192,6 @@ class Gojo(Client):
             pass
 
         await super().stop()
+        await sightings.stop()
         MongoDB.close()
         LOGGER.info(f"✅ Stopped cleanly. Runtime: {runtime}")
@@ -1,9 +1,15 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from sys import exit as exiter
+from threading import RLock
+from time import perf_counter
 
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
+from cachetools import TTLCache
+from pymongo import ASCENDING, IndexModel, MongoClient, ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
 
-from Powers import DB_NAME, DB_URI, LOGGER
+from Powers import DB_NAME, DB_URI, DB_WORKERS, LOGGER
 
 try:
     Powers_db_client = MongoClient(DB_URI)
@@ -12,10 +18,50 @@ except PyMongoError as f:
     exiter(1)
 Powers_main_db = Powers_db_client[DB_NAME]
 
+# Bounded pool so blocking pymongo calls never run on the event loop
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DB_WORKERS, thread_name_prefix="powers_db")
+
+
+# Per chat settings documents, keyed by (collection, chat_id)
+SETTINGS_CACHE = TTLCache(maxsize=4096, ttl=(60 * 10), timer=perf_counter)
+SETTINGS_LOCK = RLock()
+
+# db_name -> IndexModels declared by the classes using that collection
+INDEX_REGISTRY = {}
+# (collection, sorted query keys) -> a sample query, used by /dbindexes
+QUERY_SHAPES = {}
+# IndexOptionsConflict, IndexKeySpecsConflict
+INDEX_CONFLICT_CODES = (85, 86)
+
+
+def index(*keys: str, **kwargs) -> IndexModel:
+    """Ascending (compound) index on keys, kwargs are passed to IndexModel."""
+    return IndexModel([(key, ASCENDING) for key in keys], **kwargs)
+
+
+def _record_shape(collection, query) -> None:
+    if query:
+        QUERY_SHAPES.setdefault((collection.name, tuple(sorted(query))), query)
+
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database callable in DB_EXECUTOR and await its result."""
+    loop = get_running_loop()
+    return await loop.run_in_executor(DB_EXECUTOR, partial(func, *args, **kwargs))
+
 
 class MongoDB:
     """Class for interacting with Bot database."""
 
+    # Indexes a subclass needs on its db_name collection, see ensure_indexes
+    indexes = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if (db_name := cls.__dict__.get("db_name")) and "indexes" in cls.__dict__:
+            INDEX_REGISTRY.setdefault(db_name, []).extend(cls.indexes)
+
     def __init__(self, collection) -> None:
         self.collection = Powers_main_db[collection]
 
@@ -26,44 +72,217 @@ class MongoDB:
 
     # Find one entry from collection
     def find_one(self, query):
+        _record_shape(self.collection, query)
         return result if (result := self.collection.find_one(query)) else False
 
     # Find entries from collection
     def find_all(self, query=None):
         if query is None:
             query = {}
+        _record_shape(self.collection, query)
         return list(self.collection.find(query))
 
     # Count entries from collection
     def count(self, query=None):
         if query is None:
             query = {}
+        _record_shape(self.collection, query)
         return self.collection.count_documents(query)
 
     # Delete entry/entries from collection
     def delete_one(self, query):
+        _record_shape(self.collection, query)
         self.collection.delete_many(query)
         return self.collection.count_documents({})
 
     # Replace one entry in collection
     def replace(self, query, new_data):
-        old = self.collection.find_one(query)
-        _id = old["_id"]
-        self.collection.replace_one({"_id": _id}, new_data)
-        new = self.collection.find_one({"_id": _id})
-        return old, new
+        _record_shape(self.collection, query)
+        old = self.collection.find_one_and_replace(query, new_data)
+        if old is None:
+            return None, None
+        return old, {**new_data, "_id": old["_id"]}
 
     # Update one entry from collection
     def update(self, query, update):
-        result = self.collection.update_one(query, {"$set": update})
-        new_document = self.collection.find_one(query)
-        return result.modified_count, new_document
+        new_document = self.modify(query, {"$set": update})
+        return int(new_document is not None), new_document
+
+    # Run an aggregation pipeline on the server
+    def aggregate(self, pipeline):
+        return list(self.collection.aggregate(pipeline))
+
+    # Number of distinct values of field among documents matching query
+    def count_distinct(self, field: str, query=None) -> int:
+        pipeline = [{"$match": query}] if query else []
+        pipeline += [{"$group": {"_id": f"${field}"}}, {"$count": "total"}]
+        return result[0]["total"] if (result := self.aggregate(pipeline)) else 0
+
+    # Sum of an aggregation expression over documents matching query
+    def sum_field(self, expression, query=None) -> int:
+        pipeline = [{"$match": query}] if query else []
+        pipeline += [{"$group": {"_id": None, "total": {"$sum": expression}}}]
+        return result[0]["total"] if (result := self.aggregate(pipeline)) else 0
+
+    # Apply raw update operators atomically, returns the document after it
+    def modify(self, query, update, upsert=False):
+        _record_shape(self.collection, query)
+        return self.collection.find_one_and_update(
+            query, update, upsert=upsert, return_document=ReturnDocument.AFTER)
+
+    def upsert(self, query, update, on_insert=None):
+        ops = {"$set": update}
+        if on_insert:
+            ops["$setOnInsert"] = on_insert
+        return self.modify(query, ops, upsert=True)
+
+    def inc(self, query, fields: dict, upsert=False):
+        return self.modify(query, {"$inc": fields}, upsert)
+
+    def push(self, query, field: str, value, slice_: int = None, upsert=False):
+        if slice_ is None:
+            return self.modify(query, {"$push": {field: value}}, upsert)
+        return self.modify(
+            query, {"$push": {field: {"$each": [value], "$slice": slice_}}}, upsert)
+
+    def pull(self, query, field: str, value):
+        return self.modify(query, {"$pull": {field: value}})
+
+    def add_to_set(self, query, field: str, value, upsert=False):
+        return self.modify(query, {"$addToSet": {field: value}}, upsert)
 
     @staticmethod
     def close():
+        DB_EXECUTOR.shutdown(wait=True)
         return Powers_db_client.close()
 
 
+def ensure_indexes(db_name: str = None) -> None:
+    """
+    Create the registered indexes, for one collection or all of them.
+    create_indexes is a no-op for indexes that already exist, so this is
+    safe to run on every start.
+    """
+    names = [db_name] if db_name else list(INDEX_REGISTRY)
+    for name in names:
+        if not (models := INDEX_REGISTRY.get(name)):
+            continue
+        for model in models:
+            try:
+                Powers_main_db[name].create_indexes([model])
+            except OperationFailure as ef:
+                if ef.code not in INDEX_CONFLICT_CODES:
+                    LOGGER.error(f"Could not create indexes on {name}: {ef}")
+                    continue
+                _rebuild_index(name, model)
+            except PyMongoError as ef:
+                LOGGER.error(f"Could not create indexes on {name}: {ef}")
+
+
+def _rebuild_index(name: str, model: IndexModel) -> None:
+    """
+    Same keys already indexed with other options (e.g. an index that is
+    now declared unique), replace the old one. If the new one can't be
+    built (duplicates), put back a plain index so queries stay indexed.
+    """
+    collection = Powers_main_db[name]
+    spec = model.document
+    try:
+        collection.drop_index(spec["name"])
+        collection.create_indexes([model])
+        LOGGER.info(f"Rebuilt index {spec['name']} on {name}")
+    except PyMongoError as ef:
+        LOGGER.error(f"Could not rebuild index {spec['name']} on {name}: {ef}")
+        try:
+            collection.create_index(list(spec["key"].items()), name=spec["name"])
+        except PyMongoError:
+            pass
+
+
+def _has_collscan(plan: dict) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages", []) + [
+        plan[i] for i in ("inputStage", "queryPlan") if i in plan]
+    return any(_has_collscan(i) for i in children)
+
+
+def index_report() -> dict:
+    """
+    Index usage from $indexStats for every registered collection, and the
+    recorded query shapes whose winning plan is still a COLLSCAN.
+    """
+    usage, collscans = {}, []
+    # DB_EXECUTOR threads keep recording shapes, work on a snapshot
+    shapes = list(QUERY_SHAPES.items())
+    for name in sorted(set(INDEX_REGISTRY) | {i for (i, _), _ in shapes}):
+        try:
+            usage[name] = {
+                i["name"]: i["accesses"]["ops"]
+                for i in Powers_main_db[name].aggregate([{"$indexStats": {}}])
+            }
+        except PyMongoError as ef:
+            LOGGER.error(f"$indexStats failed on {name}: {ef}")
+    for (name, keys), query in shapes:
+        try:
+            plan = Powers_main_db[name].find(query).explain()
+        except PyMongoError as ef:
+            LOGGER.error(f"explain failed on {name}: {ef}")
+            continue
+        if _has_collscan(plan.get("queryPlanner", {}).get("winningPlan", {})):
+            collscans.append((name, keys))
+    return {"usage": usage, "collscans": collscans}
+
+
+def invalidate_settings(collection: str, chat_id: int) -> None:
+    """Drop a chat's cached settings document, next access reloads it."""
+    with SETTINGS_LOCK:
+        SETTINGS_CACHE.pop((collection, chat_id), None)
+
+
+class ChatSettingsDB(MongoDB):
+    """
+    MongoDB for collections storing one settings document per chat (_id = chat_id).
+    Documents are served from SETTINGS_CACHE and refreshed on every write.
+    """
+
+    def __init__(self, collection, chat_id: int) -> None:
+        super().__init__(collection)
+        self.chat_id = chat_id
+
+    def load_settings(self, new_data: dict):
+        """Return the chat's document from cache, db or insert new_data."""
+        key = (self.collection.name, self.chat_id)
+        with SETTINGS_LOCK:
+            chat_data = SETTINGS_CACHE.get(key)
+        if chat_data is not None:
+            return chat_data
+        chat_data = self.find_one({"_id": self.chat_id})
+        if not chat_data:
+            self.insert_one(new_data)
+            chat_data = new_data
+        with SETTINGS_LOCK:
+            SETTINGS_CACHE[key] = chat_data
+        return chat_data
+
+    # Write-through, the fresh document replaces the cached one
+    def modify(self, query, update, upsert=False):
+        new_document = super().modify(query, update, upsert)
+        if new_document and new_document.get("_id") == self.chat_id:
+            self.chat_info = new_document
+            with SETTINGS_LOCK:
+                SETTINGS_CACHE[(self.collection.name, self.chat_id)] = new_document
+        return new_document
+
+    def delete_one(self, query):
+        invalidate_settings(self.collection.name, query.get("_id", self.chat_id))
+        return super().delete_one(query)
+
+    def insert_one(self, document):
+        invalidate_settings(self.collection.name, document.get("_id"))
+        return super().insert_one(document)
+
+
 def __connect_first():
     _ = MongoDB("test")
     LOGGER.info("Initialized Database!\n")
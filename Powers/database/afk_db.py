@@ -1,13 +1,18 @@
 from threading import RLock
+from time import time
 
-from Powers.database import MongoDB
+from Powers import LOGGER
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
+# (chat_id, user_id) of everyone currently afk, kept in sync by insert_afk/delete_afk
+AFK_USERS = set()
 
 
 class AFK(MongoDB):
     """Class to store afk users"""
     db_name = "afk"
+    indexes = [index("chat_id", "user_id")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
@@ -32,10 +37,11 @@ class AFK(MongoDB):
                         "media_type": media_type
                     }
                 )
+                AFK_USERS.add((chat_id, user_id))
             return True
 
     def check_afk(self, chat_id, user_id):
-        return bool(curr := self.find_one({"chat_id": chat_id, "user_id": user_id}))
+        return (chat_id, user_id) in AFK_USERS
 
     def get_afk(self, chat_id, user_id):
         if curr := self.find_one({"chat_id": chat_id, "user_id": user_id}):
@@ -46,4 +52,19 @@ class AFK(MongoDB):
         with INSERTION_LOCK:
             if curr := self.check_afk(chat_id, user_id):
                 self.delete_one({"chat_id": chat_id, "user_id": user_id})
+                AFK_USERS.discard((chat_id, user_id))
             return
+
+
+def __load_afk():
+    start = time()
+    LOGGER.info("Loading AFK users into memory...")
+    collection = MongoDB(AFK.db_name)
+    AFK_USERS.update(
+        (i["chat_id"], i["user_id"])
+        for i in collection.collection.find({}, {"_id": 0, "chat_id": 1, "user_id": 1})
+    )
+    LOGGER.info(f"Loaded {len(AFK_USERS)} afk users in {round((time() - start), 3)}s!")
+
+
+__load_afk()
@@ -1,10 +1,13 @@
 from datetime import datetime
 from threading import RLock
+from time import time
 
+from Powers import LOGGER
 from Powers import TIME_ZONE as TZ
 from Powers.database import MongoDB
 
 INSERTION_LOCK = RLock()
+# In-memory index of gbanned user ids, kept in sync by add_gban/remove_gban
 ANTISPAM_BANNED = set()
 
 
@@ -17,11 +20,9 @@ class GBan(MongoDB):
         super().__init__(self.db_name)
 
     def check_gban(self, user_id: int):
-        with INSERTION_LOCK:
-            return bool(self.find_one({"_id": user_id}))
+        return user_id in ANTISPAM_BANNED
 
     def add_gban(self, user_id: int, reason: str, by_user: int):
-        global ANTISPAM_BANNED
         with INSERTION_LOCK:
             # Check if  user is already gbanned or not
             if self.find_one({"_id": user_id}):
@@ -40,11 +41,10 @@ class GBan(MongoDB):
             )
 
     def remove_gban(self, user_id: int):
-        global ANTISPAM_BANNED
         with INSERTION_LOCK:
             # Check if  user is already gbanned or not
             if self.find_one({"_id": user_id}):
-                ANTISPAM_BANNED.remove(user_id)
+                ANTISPAM_BANNED.discard(user_id)
                 return self.delete_one({"_id": user_id})
             return "User not gbanned!"
 
@@ -62,8 +62,7 @@ class GBan(MongoDB):
             )
 
     def count_gbans(self):
-        with INSERTION_LOCK:
-            return self.count()
+        return self.count()
 
     def load_from_db(self):
         with INSERTION_LOCK:
@@ -72,3 +71,16 @@ class GBan(MongoDB):
     def list_gbans(self):
         with INSERTION_LOCK:
             return self.find_all()
+
+
+def __load_gbans():
+    start = time()
+    LOGGER.info("Loading Gbans into memory...")
+    collection = MongoDB(GBan.db_name)
+    ANTISPAM_BANNED.update(
+        i["_id"] for i in collection.collection.find({}, {"_id": 1})
+    )
+    LOGGER.info(f"Loaded {len(ANTISPAM_BANNED)} gbans in {round((time() - start), 3)}s!")
+
+
+__load_gbans()
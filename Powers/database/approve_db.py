@@ -1,19 +1,18 @@
 from threading import RLock
 
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import ChatSettingsDB, MongoDB
 
 INSERTION_LOCK = RLock()
 
 
-class Approve(MongoDB):
+class Approve(ChatSettingsDB):
     """Class for managing Approves in Chats in Bot."""
     # Database name to connect to to preform operations
     db_name = "approve"
 
     def __init__(self, chat_id: int) -> None:
-        super().__init__(self.db_name)
-        self.chat_id = chat_id
+        super().__init__(self.db_name, chat_id)
         self.chat_info = self.__ensure_in_db()
 
     def check_approve(self, user_id: int):
@@ -29,32 +28,21 @@ class Approve(MongoDB):
             return j
 
     def add_approve(self, user_id: int, user_name: str):
-        with INSERTION_LOCK:
-            if not self.check_approve(user_id):
-                self.chat_info["users"].append((user_id, user_name))
-                return self.update(
-                    {"_id": self.chat_id},
-                    {"users": self.chat_info["users"]},
-                )
-            return True
+        # users holds [user_id, user_name] pairs, only push if no pair has user_id
+        self.modify(
+            {"_id": self.chat_id,
+             "users": {"$not": {"$elemMatch": {"$elemMatch": {"$eq": user_id}}}}},
+            {"$push": {"users": (user_id, user_name)}},
+        )
+        return True
 
     def remove_approve(self, user_id: int):
-        with INSERTION_LOCK:
-            if self.check_approve(user_id):
-                inde = next(
-                    (
-                        index
-                        for index, user in enumerate(self.chat_info["users"])
-                        if user[0] == user_id
-                    ),
-                    0,
-                )
-                self.chat_info["users"].pop(inde)
-                return self.update(
-                    {"_id": self.chat_id},
-                    {"users": self.chat_info["users"]},
-                )
-            return True
+        self.pull(
+            {"_id": self.chat_id},
+            "users",
+            {"$elemMatch": {"$eq": user_id}},
+        )
+        return True
 
     def unapprove_all(self):
         with INSERTION_LOCK:
@@ -80,12 +68,8 @@ class Approve(MongoDB):
         return self.find_all()
 
     def __ensure_in_db(self):
-        chat_data = self.find_one({"_id": self.chat_id})
-        if not chat_data:
-            new_data = {"_id": self.chat_id, "users": []}
-            self.insert_one(new_data)
-            return new_data
-        return chat_data
+        new_data = {"_id": self.chat_id, "users": []}
+        return self.load_settings(new_data)
 
     # Migrate if chat id changes!
 
@@ -97,17 +81,13 @@ class Approve(MongoDB):
 
     @staticmethod
     def count_all_approved():
-        with INSERTION_LOCK:
-            collection = MongoDB(Approve.db_name)
-            all_data = collection.find_all()
-            return sum(len(i["users"]) for i in all_data if len(i["users"]) >= 1)
+        collection = MongoDB(Approve.db_name)
+        return collection.sum_field({"$size": {"$ifNull": ["$users", []]}})
 
     @staticmethod
     def count_approved_chats():
-        with INSERTION_LOCK:
-            collection = MongoDB(Approve.db_name)
-            all_data = collection.find_all()
-            return sum(len(i["users"]) >= 1 for i in all_data)
+        collection = MongoDB(Approve.db_name)
+        return collection.count({"users.0": {"$exists": True}})
 
     @staticmethod
     def repair_db(collection):
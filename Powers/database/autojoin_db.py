@@ -1,6 +1,6 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
@@ -9,6 +9,7 @@ class AUTOJOIN(MongoDB):
     """class to store auto join requests"""
 
     db_name = "autojoin"
+    indexes = [index("chat_id")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
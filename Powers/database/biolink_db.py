@@ -1,11 +1,22 @@
 """
 Powers/database/biolink_db.py
 """
-from Powers.database import MongoDB
+from threading import RLock
+from time import time
+
+from Powers import LOGGER
+from Powers.database import MongoDB, index
+
+INSERTION_LOCK = RLock()
+# chat_id -> mode, only chats with the check on are present
+BIOLINK_MODES = {}
+# chat_id -> set of exempted user ids
+BIOLINK_EXEMPT = {}
 
 
 class BioLinkSettings(MongoDB):
     db_name = "biolink_settings"
+    indexes = [index("chat_id")]
 
     def __init__(self):
         super().__init__(self.db_name)
@@ -17,37 +28,62 @@ class BioLinkSettings(MongoDB):
         }
 
     def get_mode(self, chat_id: int) -> str:
-        doc = self.find_one({"chat_id": chat_id})
-        return doc.get("mode", "off") if doc else "off"
+        return BIOLINK_MODES.get(chat_id, "off")
 
     def set_mode(self, chat_id: int, mode: str) -> bool:
         if mode not in ("off", "admin", "normal", "strict"):
             return False
-        existing = self.find_one({"chat_id": chat_id})
-        if existing:
-            self.update({"chat_id": chat_id}, {"$set": {"mode": mode}})
-        else:
-            self.insert_one({"chat_id": chat_id, "mode": mode})
+        with INSERTION_LOCK:
+            self.upsert({"chat_id": chat_id}, {"mode": mode})
+            if mode == "off":
+                BIOLINK_MODES.pop(chat_id, None)
+            else:
+                BIOLINK_MODES[chat_id] = mode
         return True
 
 
 class BioLinkApprove(MongoDB):
     db_name = "biolink_approve"
+    indexes = [index("chat_id", "user_id")]
 
     def __init__(self):
         super().__init__(self.db_name)
 
     def approve(self, chat_id: int, user_id: int) -> bool:
-        if self.is_approved(chat_id, user_id):
-            return False
-        self.insert_one({"chat_id": chat_id, "user_id": user_id})
+        with INSERTION_LOCK:
+            if self.is_approved(chat_id, user_id):
+                return False
+            self.insert_one({"chat_id": chat_id, "user_id": user_id})
+            BIOLINK_EXEMPT.setdefault(chat_id, set()).add(user_id)
         return True
 
     def unapprove(self, chat_id: int, user_id: int) -> bool:
-        if not self.is_approved(chat_id, user_id):
-            return False
-        self.delete_one({"chat_id": chat_id, "user_id": user_id})
+        with INSERTION_LOCK:
+            if not self.is_approved(chat_id, user_id):
+                return False
+            self.delete_one({"chat_id": chat_id, "user_id": user_id})
+            BIOLINK_EXEMPT[chat_id].discard(user_id)
         return True
 
     def is_approved(self, chat_id: int, user_id: int) -> bool:
-        return bool(self.find_one({"chat_id": chat_id, "user_id": user_id}))
+        return user_id in BIOLINK_EXEMPT.get(chat_id, ())
+
+
+def __load_biolink():
+    start = time()
+    LOGGER.info("Loading Bio link settings into memory...")
+    BIOLINK_MODES.update(
+        {
+            i["chat_id"]: i["mode"]
+            for i in MongoDB(BioLinkSettings.db_name).find_all({"mode": {"$ne": "off"}})
+        }
+    )
+    for i in MongoDB(BioLinkApprove.db_name).find_all():
+        BIOLINK_EXEMPT.setdefault(i["chat_id"], set()).add(i["user_id"])
+    LOGGER.info(
+        f"Loaded {len(BIOLINK_MODES)} chats and {len(BIOLINK_EXEMPT)} exemption lists "
+        f"in {round((time() - start), 3)}s!"
+    )
+
+
+__load_biolink()
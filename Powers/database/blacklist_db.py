@@ -2,20 +2,20 @@ from threading import RLock
 from time import time
 
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import ChatSettingsDB, MongoDB
+from Powers.utils.regex_utils import invalidate_trigger_matcher
 
 INSERTION_LOCK = RLock()
 
 
-class Blacklist(MongoDB):
+class Blacklist(ChatSettingsDB):
     """Class to manage database for blacklists for chats."""
 
     # Database name to connect to to preform operations
     db_name = "blacklists"
 
     def __init__(self, chat_id: int) -> None:
-        super().__init__(self.db_name)
-        self.chat_id = chat_id
+        super().__init__(self.db_name, chat_id)
         self.chat_info = self.__ensure_in_db()
 
     def check_word_blacklist_status(self, word: str):
@@ -24,27 +24,14 @@ class Blacklist(MongoDB):
             return word in bl_words
 
     def add_blacklist(self, trigger: str):
-        with INSERTION_LOCK:
-            if not self.check_word_blacklist_status(trigger):
-                return self.update(
-                    {"_id": self.chat_id},
-                    {
-                        "_id": self.chat_id,
-                        "triggers": self.chat_info["triggers"] + [trigger],
-                    },
-                )
+        result = self.add_to_set({"_id": self.chat_id}, "triggers", trigger)
+        invalidate_trigger_matcher(self.db_name, self.chat_id)
+        return result
 
     def remove_blacklist(self, trigger: str):
-        with INSERTION_LOCK:
-            if self.check_word_blacklist_status(trigger):
-                self.chat_info["triggers"].remove(trigger)
-                return self.update(
-                    {"_id": self.chat_id},
-                    {
-                        "_id": self.chat_id,
-                        "triggers": self.chat_info["triggers"],
-                    },
-                )
+        result = self.pull({"_id": self.chat_id}, "triggers", trigger)
+        invalidate_trigger_matcher(self.db_name, self.chat_id)
+        return result
 
     def get_blacklists(self):
         with INSERTION_LOCK:
@@ -52,18 +39,13 @@ class Blacklist(MongoDB):
 
     @staticmethod
     def count_blacklists_all():
-        with INSERTION_LOCK:
-            collection = MongoDB(Blacklist.db_name)
-            curr = collection.find_all()
-            return sum(len(chat["triggers"]) for chat in curr)
+        collection = MongoDB(Blacklist.db_name)
+        return collection.sum_field({"$size": {"$ifNull": ["$triggers", []]}})
 
     @staticmethod
     def count_blackists_chats():
-        with INSERTION_LOCK:
-            collection = MongoDB(Blacklist.db_name)
-            curr = collection.find_all()
-            return sum(bool(chat["triggers"])
-                       for chat in curr)
+        collection = MongoDB(Blacklist.db_name)
+        return collection.count({"triggers.0": {"$exists": True}})
 
     def set_action(self, action: str):
         with INSERTION_LOCK:
@@ -89,34 +71,33 @@ class Blacklist(MongoDB):
 
     @staticmethod
     def count_action_bl_all(action: str):
-        with INSERTION_LOCK:
-            collection = MongoDB(Blacklist.db_name)
-            all_data = collection.find_all({"action": action})
-            return sum(len(i["triggers"]) >= 1 for i in all_data)
+        collection = MongoDB(Blacklist.db_name)
+        return collection.count(
+            {"action": action, "triggers.0": {"$exists": True}})
 
     def rm_all_blacklist(self):
         with INSERTION_LOCK:
-            return self.update(
+            result = self.update(
                 {"_id": self.chat_id},
                 {"triggers": []},
             )
+            invalidate_trigger_matcher(self.db_name, self.chat_id)
+            return result
 
     def __ensure_in_db(self):
-        chat_data = self.find_one({"_id": self.chat_id})
-        if not chat_data:
-            new_data = new_data = {
-                "_id": self.chat_id,
-                "triggers": [],
-                "action": "none",
-                "reason": "Automated blacklisted word: {{}}",
-            }
-            self.insert_one(new_data)
-            return new_data
-        return chat_data
+        new_data = {
+            "_id": self.chat_id,
+            "triggers": [],
+            "action": "none",
+            "reason": "Automated blacklisted word: {{}}",
+        }
+        return self.load_settings(new_data)
 
     def clean_blacklist(self):
         with INSERTION_LOCK:
-            return self.delete_one({"_id": self.chat_id})
+            result = self.delete_one({"_id": self.chat_id})
+            invalidate_trigger_matcher(self.db_name, self.chat_id)
+            return result
 
     # Migrate if chat id changes!
     def migrate_chat(self, new_chat_id: int):
@@ -124,6 +105,7 @@ class Blacklist(MongoDB):
         new_data = old_chat_db.update({"_id": new_chat_id})
         self.insert_one(new_data)
         self.delete_one({"_id": self.chat_id})
+        invalidate_trigger_matcher(self.db_name, self.chat_id)
 
     @staticmethod
     def repair_db(collection):
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from Powers.database import MongoDB, index
+
+
+class Broadcasts(MongoDB):
+    """
+    Broadcast jobs. A job stores its peer list and a cursor, every chunk
+    that finishes moves the cursor so a restart resumes where it stopped.
+    """
+
+    db_name = "broadcasts"
+    indexes = [index("status")]
+
+    def __init__(self) -> None:
+        super().__init__(self.db_name)
+
+    def create_job(self, kind: str, peers: list, payload: dict, report_chat: int, report_msg: int):
+        job = {
+            "kind": kind,  # send | forward
+            "payload": payload,
+            "peers": peers,
+            "cursor": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "errors": [],
+            "status": "running",
+            "report_chat": report_chat,
+            "report_msg": report_msg,
+            "started_at": datetime.utcnow(),
+        }
+        job["_id"] = self.collection.insert_one(job).inserted_id
+        return job
+
+    def get_job(self, job_id):
+        return self.find_one({"_id": ObjectId(job_id)})
+
+    def running_jobs(self):
+        return self.find_all({"status": "running"})
+
+    def save_progress(self, job_id, cursor: int, sent: int, failed: int, dropped: int, errors: list):
+        update = {
+            "$set": {"cursor": cursor},
+            "$inc": {"sent": sent, "failed": failed, "dropped": dropped},
+        }
+        if errors:
+            # Keep only the latest errors, the full count is in failed
+            update["$push"] = {"errors": {"$each": errors, "$slice": -100}}
+        return self.modify({"_id": job_id}, update)
+
+    def set_status(self, job_id, status: str):
+        return self.update(
+            {"_id": ObjectId(job_id)},
+            {"status": status, "finished_at": datetime.utcnow()},
+        )
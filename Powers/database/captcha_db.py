@@ -1,6 +1,6 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
@@ -8,6 +8,7 @@ INSERTION_LOCK = RLock()
 class CAPTCHA(MongoDB):
     """Class to store captcha's info"""
     db_name = "captcha"
+    indexes = [index("chat_id")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
@@ -54,6 +55,7 @@ class CAPTCHA(MongoDB):
 class CAPTCHA_DATA(MongoDB):
     """class to store captcha data"""
     db_name = "captcha_data"
+    indexes = [index("chat_id", "user_id")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
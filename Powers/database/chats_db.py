@@ -1,96 +1,131 @@
 from threading import RLock
 from time import time
 
+from pymongo import UpdateOne
+
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import (ChatSettingsDB, MongoDB, ensure_indexes, index,
+                             invalidate_settings)
 
 INSERTION_LOCK = RLock()
 
 
-class Chats(MongoDB):
+class ChatMembers(MongoDB):
+    """One document per (chat_id, user_id) the bot has seen in a chat."""
+
+    db_name = "chat_members"
+    indexes = [index("chat_id", "user_id", unique=True), index("user_id")]
+
+    def __init__(self) -> None:
+        super().__init__(self.db_name)
+
+    @staticmethod
+    def upsert_op(chat_id: int, user_id: int):
+        return UpdateOne(
+            {"chat_id": chat_id, "user_id": user_id},
+            {"$setOnInsert": {"chat_id": chat_id, "user_id": user_id}},
+            upsert=True,
+        )
+
+    def add_member(self, chat_id: int, user_id: int):
+        return self.collection.update_one(
+            {"chat_id": chat_id, "user_id": user_id},
+            {"$setOnInsert": {"chat_id": chat_id, "user_id": user_id}},
+            upsert=True,
+        )
+
+    def is_member(self, chat_id: int, user_id: int) -> bool:
+        return bool(
+            self.collection.count_documents(
+                {"chat_id": chat_id, "user_id": user_id}, limit=1)
+        )
+
+    def count_members(self, chat_id: int) -> int:
+        return self.collection.count_documents({"chat_id": chat_id})
+
+    def members(self, chat_id: int):
+        return [
+            i["user_id"]
+            for i in self.collection.find(
+                {"chat_id": chat_id}, {"_id": 0, "user_id": 1})
+        ]
+
+    def chats_of(self, user_ids: list) -> dict:
+        """user_id -> chat ids the user was seen in, for every given user."""
+        chats = {}
+        for i in self.collection.find(
+                {"user_id": {"$in": list(user_ids)}}, {"_id": 0, "chat_id": 1, "user_id": 1}):
+            chats.setdefault(i["user_id"], []).append(i["chat_id"])
+        return chats
+
+    def remove_chat(self, chat_id: int):
+        return self.collection.delete_many({"chat_id": chat_id})
+
+    def migrate_chat(self, old_chat_id: int, new_chat_id: int):
+        ops = [
+            self.upsert_op(new_chat_id, user_id)
+            for user_id in self.members(old_chat_id)
+        ]
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+        self.remove_chat(old_chat_id)
+
+
+class Chats(ChatSettingsDB):
     """Class to manage users for bot."""
 
     # Database name to connect to to preform operations
     db_name = "chats"
 
     def __init__(self, chat_id: int) -> None:
-        super().__init__(self.db_name)
-        self.chat_id = chat_id
+        super().__init__(self.db_name, chat_id)
         self.chat_info = self.__ensure_in_db()
 
     def user_is_in_chat(self, user_id: int):
-        return user_id in set(self.chat_info["users"])
+        return ChatMembers().is_member(self.chat_id, user_id)
 
     def update_chat(self, chat_name: str, user_id: int):
         with INSERTION_LOCK:
-
-            if chat_name == self.chat_info["chat_name"] and self.user_is_in_chat(
-                    user_id,
-            ):
-                return True
-
-            if chat_name != self.chat_info["chat_name"] and self.user_is_in_chat(
-                    user_id,
-            ):
+            ChatMembers().add_member(self.chat_id, user_id)
+            if chat_name != self.chat_info["chat_name"]:
                 return self.update(
                     {"_id": self.chat_id},
                     {"chat_name": chat_name},
                 )
-
-            if chat_name == self.chat_info["chat_name"] and not self.user_is_in_chat(
-                    user_id,
-            ):
-                self.chat_info["users"].append(user_id)
-                return self.update(
-                    {"_id": self.chat_id},
-                    {"users": self.chat_info["users"]},
-                )
-
-            users_old = self.chat_info["users"]
-            users_old.append(user_id)
-            users = list(set(users_old))
-            return self.update(
-                {"_id": self.chat_id},
-                {
-                    "_id": self.chat_id,
-                    "chat_name": chat_name,
-                    "users": users,
-                },
-            )
+            return True
 
     def count_chat_users(self):
         with INSERTION_LOCK:
-            return len(self.chat_info["users"]) or 0
+            return ChatMembers().count_members(self.chat_id)
 
     def chat_members(self):
         with INSERTION_LOCK:
-            return self.chat_info["users"]
+            return ChatMembers().members(self.chat_id)
 
     @staticmethod
     def remove_chat(chat_id: int):
         with INSERTION_LOCK:
             collection = MongoDB(Chats.db_name)
             collection.delete_one({"_id": chat_id})
+            ChatMembers().remove_chat(chat_id)
+            invalidate_settings(Chats.db_name, chat_id)
 
     @staticmethod
     def count_chats():
-        with INSERTION_LOCK:
-            collection = MongoDB(Chats.db_name)
-            return collection.count() or 0
+        collection = MongoDB(Chats.db_name)
+        return collection.count() or 0
 
     @staticmethod
     def list_chats_by_id():
         with INSERTION_LOCK:
             collection = MongoDB(Chats.db_name)
-            chats = collection.find_all()
-            chat_list = {i["_id"] for i in chats}
-            return list(chat_list)
+            return [i["_id"] for i in collection.collection.find({}, {"_id": 1})]
 
     @staticmethod
     def list_chats_full():
         with INSERTION_LOCK:
             collection = MongoDB(Chats.db_name)
-            return collection.find_all()
+            return list(collection.collection.find({}, {"users": 0}))
 
     @staticmethod
     def get_chat_info(chat_id: int):
@@ -103,24 +138,21 @@ class Chats(MongoDB):
             return self.find_all()
 
     def __ensure_in_db(self):
-        chat_data = self.find_one({"_id": self.chat_id})
-        if not chat_data:
-            new_data = {"_id": self.chat_id, "chat_name": "", "users": []}
-            self.insert_one(new_data)
-            return new_data
-        return chat_data
+        new_data = {"_id": self.chat_id, "chat_name": ""}
+        return self.load_settings(new_data)
 
     # Migrate if chat id changes!
     def migrate_chat(self, new_chat_id: int):
         old_chat_db = self.find_one({"_id": self.chat_id})
-        new_data = old_chat_db.update({"_id": new_chat_id})
-        self.insert_one(new_data)
+        old_chat_db["_id"] = new_chat_id
+        self.insert_one(old_chat_db)
         self.delete_one({"_id": self.chat_id})
+        ChatMembers().migrate_chat(self.chat_id, new_chat_id)
 
     @staticmethod
     def repair_db(collection):
         all_data = collection.find_all()
-        keys = {"chat_name": "", "users": []}
+        keys = {"chat_name": ""}
         for data in all_data:
             for key, val in keys.items():
                 try:
@@ -138,3 +170,28 @@ def __pre_req_chats():
     collection = MongoDB(Chats.db_name)
     Chats.repair_db(collection)
     LOGGER.info(f"Done in {round((time() - start), 3)}s!")
+
+
+def __migrate_chat_members():
+    """One time move of the old per chat `users` arrays into chat_members."""
+    # Upserts below rely on the unique index, don't wait for the startup run
+    ensure_indexes(ChatMembers.db_name)
+    members = MongoDB(ChatMembers.db_name).collection
+    chats = MongoDB(Chats.db_name).collection
+    if not chats.count_documents({"users": {"$exists": True}}, limit=1):
+        return
+    start = time()
+    LOGGER.info("Migrating chat members out of the Chats Database...")
+    moved = 0
+    # Stream one chat at a time so big arrays never sit in memory together
+    for chat in chats.find({"users": {"$exists": True}}, {"users": 1}):
+        ops = [ChatMembers.upsert_op(chat["_id"], user_id)
+               for user_id in set(chat["users"])]
+        for i in range(0, len(ops), 1000):
+            members.bulk_write(ops[i:i + 1000], ordered=False)
+        chats.update_one({"_id": chat["_id"]}, {"$unset": {"users": ""}})
+        moved += len(ops)
+    LOGGER.info(f"Moved {moved} memberships in {round((time() - start), 3)}s!")
+
+
+__migrate_chat_members()
@@ -2,36 +2,24 @@ from threading import RLock
 from time import time
 
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import ChatSettingsDB, MongoDB
 
 INSERTION_LOCK = RLock()
-DISABLED_CMDS = {}
 
 
-class Disabling(MongoDB):
+class Disabling(ChatSettingsDB):
     """Class to manage database for Disabling for chats."""
 
     # Database name to connect to perform operations
     db_name = "disabled"
 
     def __init__(self, chat_id: int) -> None:
-        super().__init__(self.db_name)
-        self.chat_id = chat_id
+        super().__init__(self.db_name, chat_id)
         self.chat_info = self.__ensure_in_db()
 
     def check_cmd_status(self, cmd: str):
         with INSERTION_LOCK:
-            try:
-                cmds = DISABLED_CMDS[self.chat_id]["commands"]
-            except KeyError:
-                cmds = self.chat_info["commands"]
-                act = self.chat_info["action"]
-                DISABLED_CMDS[self.chat_id] = {
-                    "command": cmds or [],
-                    "action": act or "none",
-                }
-            # return bool(cmd in cmds)
-            return bool(cmd in cmds if cmds else [])
+            return cmd in (self.chat_info["commands"] or [])
 
     def add_disable(self, cmd: str):
         with INSERTION_LOCK:
@@ -40,61 +28,31 @@ class Disabling(MongoDB):
                     {"_id": self.chat_id},
                     {
                         "_id": self.chat_id,
-                        "commands": self.chat_info["commands"].append(cmd),
+                        "commands": (self.chat_info["commands"] or []) + [cmd],
                     },
                 )
 
     def remove_disabled(self, comm: str):
         with INSERTION_LOCK:
             if self.check_cmd_status(comm):
-                self.chat_info["commands"].remove(comm)
-                return self.update(
-                    {"_id": self.chat_id},
-                    {
-                        "_id": self.chat_id,
-                        "commands": self.chat_info["commands"],
-                    },
-                )
+                return self.pull({"_id": self.chat_id}, "commands", comm)
 
     def get_disabled(self):
         with INSERTION_LOCK:
-            try:
-                cmds = DISABLED_CMDS[self.chat_id]["commands"]
-            except KeyError:
-                cmds = self.chat_info["commands"]
-                DISABLED_CMDS[self.chat_id] = {
-                    "commands": cmds or [],
-                    "action": self.chat_info["action"],
-                }
-            return cmds or []
+            return self.chat_info["commands"] or []
 
     @staticmethod
     def count_disabled_all():
-        with INSERTION_LOCK:
-            collection = MongoDB(Disabling.db_name)
-            curr = collection.find_all()
-            return sum(
-                len(chat["commands"] or []) for chat in curr
-            )
+        collection = MongoDB(Disabling.db_name)
+        return collection.sum_field({"$size": {"$ifNull": ["$commands", []]}})
 
     @staticmethod
     def count_disabling_chats():
-        with INSERTION_LOCK:
-            collection = MongoDB(Disabling.db_name)
-            curr = collection.find_all()
-            return sum(bool(chat["commands"])
-                       for chat in curr)
+        collection = MongoDB(Disabling.db_name)
+        return collection.count({"commands.0": {"$exists": True}})
 
     def set_action(self, action: str):
         with INSERTION_LOCK:
-            try:
-                DISABLED_CMDS[self.chat_id]["action"] = action
-            except KeyError:
-                cmds = self.chat_info["commands"]
-                DISABLED_CMDS[self.chat_id] = {
-                    "commands": cmds or [],
-                    "action": action,
-                }
             return self.update(
                 {"_id": self.chat_id},
                 {"_id": self.chat_id, "action": action},
@@ -102,63 +60,33 @@ class Disabling(MongoDB):
 
     def get_action(self):
         with INSERTION_LOCK:
-            try:
-                val = DISABLED_CMDS[self.chat_id]["action"]
-            except KeyError:
-                cmds = self.chat_info["commands"]
-                val = self.chat_info["action"]
-                DISABLED_CMDS[self.chat_id] = {
-                    "commands": cmds or [],
-                    "action": val,
-                }
-            return val or "none"
+            return self.chat_info["action"] or "none"
 
     @staticmethod
     def count_action_dis_all(action: str):
-        with INSERTION_LOCK:
-            collection = MongoDB(Disabling.db_name)
-            all_data = collection.find_all({"action": action})
-            return sum(
-                len(i["commands"] or []) >= 1 for i in all_data
-            )
+        collection = MongoDB(Disabling.db_name)
+        return collection.count(
+            {"action": action, "commands.0": {"$exists": True}})
 
     def rm_all_disabled(self):
         with INSERTION_LOCK:
-            try:
-                DISABLED_CMDS[self.chat_id]["commands"] = []
-            except KeyError:
-                DISABLED_CMDS[self.chat_id] = {
-                    "commands": [],
-                    "action": self.chat_info["action"],
-                }
             return self.update(
                 {"_id": self.chat_id},
                 {"commands": []},
             )
 
     def __ensure_in_db(self):
-        try:
-            chat_data = DISABLED_CMDS[self.chat_id]
-        except KeyError:
-            chat_data = self.find_one({"_id": self.chat_id})
-            if not chat_data:
-                new_data = {
-                    "_id": self.chat_id,
-                    "commands": [],
-                    "action": "none",
-                }
-                DISABLED_CMDS[self.chat_id] = {
-                    "commands": [], "action": "none"}
-                self.insert_one(new_data)
-                return new_data
-            DISABLED_CMDS[self.chat_id] = chat_data
-        return chat_data
+        new_data = {
+            "_id": self.chat_id,
+            "commands": [],
+            "action": "none",
+        }
+        return self.load_settings(new_data)
 
     # Migrate if chat id changes!
     def migrate_chat(self, new_chat_id: int):
         old_chat_db = self.find_one({"_id": self.chat_id})
         new_data = old_chat_db.update({"_id": new_chat_id})
-        DISABLED_CMDS[new_chat_id] = DISABLED_CMDS.pop(self.chat_id)
         self.insert_one(new_data)
         self.delete_one({"_id": self.chat_id})
 
@@ -168,15 +96,7 @@ class Disabling(MongoDB):
 
     @staticmethod
     def repair_db(collection):
-        global DISABLED_CMDS
         all_data = collection.find_all()
-        DISABLED_CMDS = {
-            i["_id"]: {
-                "action": i["action"] or "none",
-                "commands": i["commands"] or [],
-            }
-            for i in all_data
-        }
         keys = {
             "commands": [],
             "action": "none",
@@ -1,11 +1,12 @@
 """
 Powers/database/edit_db.py
 """
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 
 class EditSettings(MongoDB):
     db_name = "edit_settings"
+    indexes = [index("chat_id")]
 
     def __init__(self):
         super().__init__(self.db_name)
@@ -23,13 +24,9 @@ class EditSettings(MongoDB):
         return doc if doc else self._default(chat_id)
 
     def _save(self, chat_id: int, key: str, value):
-        existing = self.find_one({"chat_id": chat_id})
-        if existing:
-            self.update({"chat_id": chat_id}, {"$set": {key: value}})
-        else:
-            data = self._default(chat_id)
-            data[key] = value
-            self.insert_one(data)
+        defaults = self._default(chat_id)
+        del defaults["chat_id"], defaults[key]
+        self.upsert({"chat_id": chat_id}, {key: value}, on_insert=defaults)
 
     def set_anti_edit(self, chat_id: int, mode: str):
         """mode: off | admin | normal | strict"""
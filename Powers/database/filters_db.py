@@ -1,13 +1,15 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 from Powers.utils.msg_types import Types
+from Powers.utils.regex_utils import invalidate_trigger_matcher
 
 INSERTION_LOCK = RLock()
 
 
 class Filters(MongoDB):
     db_name = "chat_filters"
+    indexes = [index("chat_id", "keyword")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
@@ -30,8 +32,9 @@ class Filters(MongoDB):
                         "fileid": fileid
                     }
                 )
+                invalidate_trigger_matcher(self.db_name, chat_id)
                 return
-            return self.insert_one(
+            result = self.insert_one(
                 {
                     "chat_id": chat_id,
                     "keyword": keyword,
@@ -40,6 +43,8 @@ class Filters(MongoDB):
                     "fileid": fileid,
                 },
             )
+            invalidate_trigger_matcher(self.db_name, chat_id)
+            return result
 
     def get_filter(self, chat_id: int, keyword: str):
         with INSERTION_LOCK:
@@ -47,6 +52,15 @@ class Filters(MongoDB):
                 return curr
             return "Filter does not exist!"
 
+    def get_filter_triggers(self, chat_id: int):
+        """Map every alias of the chat's filters to its full keyword."""
+        with INSERTION_LOCK:
+            return {
+                alias: keyword
+                for keyword in self.get_all_filters(chat_id)
+                for alias in keyword.split("|")
+            }
+
     def get_all_filters(self, chat_id: int):
         with INSERTION_LOCK:
             if curr := self.find_all({"chat_id": chat_id}):
@@ -58,31 +72,24 @@ class Filters(MongoDB):
         with INSERTION_LOCK:
             if curr := self.find_one({"chat_id": chat_id, "keyword": keyword}):
                 self.delete_one(curr)
+                invalidate_trigger_matcher(self.db_name, chat_id)
                 return True
             return False
 
     def rm_all_filters(self, chat_id: int):
         with INSERTION_LOCK:
-            return self.delete_one({"chat_id": chat_id})
+            result = self.delete_one({"chat_id": chat_id})
+            invalidate_trigger_matcher(self.db_name, chat_id)
+            return result
 
     def count_filters_all(self):
-        with INSERTION_LOCK:
-            return self.count()
+        return self.count()
 
     def count_filter_aliases(self):
-        with INSERTION_LOCK:
-            if curr := self.find_all():
-                return len(
-                    [z for z in (i["keyword"].split("|")
-                                 for i in curr) if len(z) >= 2],
-                )
-            return 0
+        return self.count({"keyword": {"$regex": r"\|"}})
 
     def count_filters_chats(self):
-        with INSERTION_LOCK:
-            filters = self.find_all()
-            chats_ids = {i["chat_id"] for i in filters}
-            return len(chats_ids)
+        return self.count_distinct("chat_id")
 
     def count_all_filters(self):
         with INSERTION_LOCK:
@@ -103,3 +110,4 @@ class Filters(MongoDB):
                 new_data = old_chat_db.update({"_id": new_chat_id})
                 self.delete_one({"_id": old_chat_id})
                 self.insert_one(new_data)
+            invalidate_trigger_matcher(self.db_name, old_chat_id)
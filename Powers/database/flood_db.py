@@ -1,8 +1,12 @@
 from threading import RLock
+from time import time
 
+from Powers import LOGGER
 from Powers.database import MongoDB
 
 INSERTION_LOCK = RLock()
+# chat_id -> flood document, only chats with flood protection on are present
+FLOOD_SETTINGS = {}
 
 
 class Floods(MongoDB):
@@ -20,20 +24,21 @@ class Floods(MongoDB):
             action: str,
     ):
         with INSERTION_LOCK:
-            if not (curr := self.find_one({"chat_id": chat_id})):
-                return self.insert_one(
-                    {
-                        "chat_id": chat_id,
-                        "limit": limit,
-                        "within": within,
-                        "action": action
-                    },
-                )
+            if not (curr := FLOOD_SETTINGS.get(chat_id)):
+                new_data = {
+                    "chat_id": chat_id,
+                    "limit": limit,
+                    "within": within,
+                    "action": action
+                }
+                FLOOD_SETTINGS[chat_id] = new_data
+                return self.insert_one(dict(new_data))
             if (
                     limit != int(curr['limit'])
                     or within != int(curr['within'])
                     or action != str(curr['action'])
             ):
+                curr.update({"limit": limit, "within": within, "action": action})
                 return self.update(
                     {
                         "chat_id": chat_id
@@ -48,24 +53,45 @@ class Floods(MongoDB):
                 return
 
     def is_chat(self, chat_id: int):
-        with INSERTION_LOCK:
-            if curr := self.find_one({"chat_id": chat_id}):
-                return [
-                    str(curr['limit']),
-                    str(curr['within']),
-                    str(curr['action']),
-                ]
-            return False
+        if curr := FLOOD_SETTINGS.get(chat_id):
+            return [
+                str(curr['limit']),
+                str(curr['within']),
+                str(curr['action']),
+            ]
+        return False
 
     def get_action(self, chat_id: int):
+        if curr := FLOOD_SETTINGS.get(chat_id):
+            return curr['action']
+        return "Flood haven't set"
+
+    def get_mode(self, chat_id: int):
+        if curr := FLOOD_SETTINGS.get(chat_id):
+            return curr.get("mode", "sliding")
+        return "sliding"
+
+    def set_mode(self, chat_id: int, mode: str):
         with INSERTION_LOCK:
-            if curr := self.find_one({"chat_id": chat_id}):
-                return curr['action']
-            return "Flood haven't set"
+            if curr := FLOOD_SETTINGS.get(chat_id):
+                curr["mode"] = mode
+                return self.update({"chat_id": chat_id}, {"mode": mode})
+            return False
 
     def rm_flood(self, chat_id: int):
         with INSERTION_LOCK:
-            if curr := self.find_one({"chat_id": chat_id}):
+            if FLOOD_SETTINGS.pop(chat_id, None):
                 self.delete_one({"chat_id": chat_id})
                 return True
             return False
+
+
+def __load_flood_settings():
+    start = time()
+    LOGGER.info("Loading Flood settings into memory...")
+    collection = MongoDB(Floods.db_name)
+    FLOOD_SETTINGS.update({i["chat_id"]: i for i in collection.find_all()})
+    LOGGER.info(f"Loaded {len(FLOOD_SETTINGS)} chats in {round((time() - start), 3)}s!")
+
+
+__load_flood_settings()
@@ -1,19 +1,18 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import ChatSettingsDB, MongoDB
 
 INSERTION_LOCK = RLock()
 
 
-class Greetings(MongoDB):
+class Greetings(ChatSettingsDB):
     """Class for managing antichannelpins in chats."""
 
     # Database name to connect to to preform operations
     db_name = "welcome_chats"
 
     def __init__(self, chat_id: int) -> None:
-        super().__init__(self.db_name)
-        self.chat_id = chat_id
+        super().__init__(self.db_name, chat_id)
         self.chat_info = self.__ensure_in_db()
 
     # Get settings from database
@@ -69,6 +68,11 @@ class Greetings(MongoDB):
         with INSERTION_LOCK:
             return self.chat_info["cleangoodbye_id"]
 
+    def get_raid_mode(self):
+        with INSERTION_LOCK:
+            # Older documents predate raid mode
+            return self.chat_info.get("raid_mode", False)
+
     # Set settings in database
     def set_current_welcome_settings(self, status: bool):
         with INSERTION_LOCK:
@@ -126,6 +130,13 @@ class Greetings(MongoDB):
                 {"cleangoodbye": status},
             )
 
+    def set_raid_mode(self, status: bool):
+        with INSERTION_LOCK:
+            return self.update(
+                {"_id": self.chat_id},
+                {"raid_mode": status},
+            )
+
     def set_cleanwlcm_id(self, status: int):
         with INSERTION_LOCK:
             return self.update(
@@ -141,27 +152,24 @@ class Greetings(MongoDB):
             )
 
     def __ensure_in_db(self):
-        chat_data = self.find_one({"_id": self.chat_id})
-        if not chat_data:
-            new_data = {
-                "_id": self.chat_id,
-                "cleanwelcome": False,
-                "cleanwelcome_id": None,
-                "cleangoodbye_id": None,
-                "cleangoodbye": False,
-                "cleanservice": False,
-                "goodbye_text": "Sad to see you leaving {first}.\nTake Care!",
-                "welcome_text": "Hey {first}, welcome to {chatname}!",
-                "welcome": True,
-                "goodbye": True,
-                "welcome_media": False,
-                "welcome_mtype": False,
-                "goodbye_media": False,
-                "goodbye_mtype": False
-            }
-            self.insert_one(new_data)
-            return new_data
-        return chat_data
+        new_data = {
+            "_id": self.chat_id,
+            "cleanwelcome": False,
+            "cleanwelcome_id": None,
+            "cleangoodbye_id": None,
+            "cleangoodbye": False,
+            "cleanservice": False,
+            "goodbye_text": "Sad to see you leaving {first}.\nTake Care!",
+            "welcome_text": "Hey {first}, welcome to {chatname}!",
+            "welcome": True,
+            "goodbye": True,
+            "welcome_media": False,
+            "welcome_mtype": False,
+            "goodbye_media": False,
+            "goodbye_mtype": False,
+            "raid_mode": False
+        }
+        return self.load_settings(new_data)
 
     # Migrate if chat id changes!
     def migrate_chat(self, new_chat_id: int):
@@ -176,6 +184,5 @@ class Greetings(MongoDB):
 
     @staticmethod
     def count_chats(query: str):
-        with INSERTION_LOCK:
-            collection = MongoDB(Greetings.db_name)
-            return collection.count({query: True})
+        collection = MongoDB(Greetings.db_name)
+        return collection.count({query: True})
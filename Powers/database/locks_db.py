@@ -1,6 +1,6 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
@@ -12,6 +12,7 @@ class LOCKS(MongoDB):
     """Class to store locks"""
 
     db_name = "locks"
+    indexes = [index("chat_id", "locktype")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
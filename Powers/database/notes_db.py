@@ -2,7 +2,7 @@ from hashlib import md5
 from threading import RLock
 from time import time
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 from Powers.utils.msg_types import Types
 
 INSERTION_LOCK = RLock()
@@ -10,6 +10,7 @@ INSERTION_LOCK = RLock()
 
 class Notes(MongoDB):
     db_name = "notes"
+    indexes = [index("chat_id", "note_name"), index("hash")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
@@ -72,17 +73,13 @@ class Notes(MongoDB):
 
     def count_notes(self, chat_id: int):
         with INSERTION_LOCK:
-            return len(curr) if (curr := self.find_all({"chat_id": chat_id})) else 0
+            return self.count({"chat_id": chat_id})
 
     def count_notes_chats(self):
-        with INSERTION_LOCK:
-            notes = self.find_all()
-            chats_ids = [chat["chat_id"] for chat in notes]
-            return len(set(chats_ids))
+        return self.count_distinct("chat_id")
 
     def count_all_notes(self):
-        with INSERTION_LOCK:
-            return self.count()
+        return self.count()
 
     def count_notes_type(self, ntype):
         with INSERTION_LOCK:
@@ -122,7 +119,7 @@ class NotesSettings(MongoDB):
         return self.find_all({"privatenotes": True})
 
     def count_chats(self):
-        return len(self.find_all({"privatenotes": True}))
+        return self.count({"privatenotes": True})
 
     # Migrate if chat id changes!
     def migrate_chat(self, old_chat_id: int, new_chat_id: int):
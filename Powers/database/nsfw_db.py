@@ -2,11 +2,24 @@
 Powers/database/nsfw_db.py
 """
 from datetime import datetime
-from Powers.database import MongoDB
+from threading import RLock
+
+from cachetools import LRUCache
+from pymongo import UpdateOne
+
+from Powers.database import MongoDB, index
+
+# Verdicts for recently seen media, in front of the nsfw_verdicts collection
+VERDICT_CACHE = LRUCache(maxsize=4096)
+VERDICT_LOCK  = RLock()
+VERDICT_STATS = {"lookups": 0, "file_hits": 0, "hash_hits": 0}
+# Stored verdicts expire this long after their media was last scanned
+VERDICT_TTL   = 30 * 24 * 60 * 60
 
 
 class NSFWSettings(MongoDB):
     db_name = "nsfw_settings"
+    indexes = [index("chat_id")]
 
     def __init__(self):
         super().__init__(self.db_name)
@@ -18,11 +31,7 @@ class NSFWSettings(MongoDB):
     def set_mode(self, chat_id, mode):
         if mode not in ("off", "soft", "normal", "strict"):
             return False
-        existing = self.find_one({"chat_id": chat_id})
-        if existing:
-            self.update({"chat_id": chat_id}, {"$set": {"mode": mode}})
-        else:
-            self.insert_one({"chat_id": chat_id, "mode": mode})
+        self.upsert({"chat_id": chat_id}, {"mode": mode})
         return True
 
     def is_enabled(self, chat_id):
@@ -31,6 +40,7 @@ class NSFWSettings(MongoDB):
 
 class NSFWApprove(MongoDB):
     db_name = "nsfw_approve"
+    indexes = [index("chat_id", "user_id")]
 
     def __init__(self):
         super().__init__(self.db_name)
@@ -59,30 +69,18 @@ class NSFWApprove(MongoDB):
 
 class NSFWViolations(MongoDB):
     db_name = "nsfw_violations"
+    # add_violation upserts on all three, prefix serves per-user lookups
+    indexes = [index("chat_id", "user_id", "category", unique=True)]
 
     def __init__(self):
         super().__init__(self.db_name)
 
     def add_violation(self, chat_id, user_id, category):
-        """
-        Fix: MongoDB.update() wraps in $set internally,
-        so $inc nahi chal sakda. Manual fetch + increment karo.
-        """
-        existing = self.find_one({
-            "chat_id": chat_id, "user_id": user_id, "category": category
-        })
-        if existing:
-            # Manual increment — $inc nahi, fetch karke +1 karo
-            new_count = existing.get("count", 0) + 1
-            self.update(
-                {"chat_id": chat_id, "user_id": user_id, "category": category},
-                {"count": new_count, "last_seen": datetime.utcnow()}
-            )
-        else:
-            self.insert_one({
-                "chat_id": chat_id, "user_id": user_id, "category": category,
-                "count": 1, "last_seen": datetime.utcnow()
-            })
+        self.modify(
+            {"chat_id": chat_id, "user_id": user_id, "category": category},
+            {"$inc": {"count": 1}, "$set": {"last_seen": datetime.utcnow()}},
+            upsert=True,
+        )
 
     def get_violations(self, chat_id, user_id):
         return self.find_all({"chat_id": chat_id, "user_id": user_id}) or []
@@ -92,3 +90,66 @@ class NSFWViolations(MongoDB):
 
     def clear_violations(self, chat_id, user_id):
         self.delete_one({"chat_id": chat_id, "user_id": user_id})
+
+
+class NSFWVerdicts(MongoDB):
+    """
+    Scan results keyed by Telegram file_unique_id ("file:<id>") and by
+    perceptual hash of the decoded frame ("hash:<dhash>").
+    """
+    db_name = "nsfw_verdicts"
+    indexes = [index("seen_at", expireAfterSeconds=VERDICT_TTL)]
+
+    def __init__(self):
+        super().__init__(self.db_name)
+
+    def _get(self, key):
+        with VERDICT_LOCK:
+            if (result := VERDICT_CACHE.get(key)) is not None:
+                return result
+        if doc := self.find_one({"_id": key}):
+            with VERDICT_LOCK:
+                VERDICT_CACHE[key] = doc["result"]
+            return doc["result"]
+        return None
+
+    def get_by_file(self, file_unique_id):
+        result = self._get(f"file:{file_unique_id}")
+        with VERDICT_LOCK:
+            VERDICT_STATS["lookups"] += 1
+            if result is not None:
+                VERDICT_STATS["file_hits"] += 1
+        return result
+
+    def get_by_hash(self, dhash):
+        result = self._get(f"hash:{dhash}")
+        if result is not None:
+            with VERDICT_LOCK:
+                VERDICT_STATS["hash_hits"] += 1
+        return result
+
+    def save_verdict(self, result, file_unique_id, dhash=None):
+        keys = [f"file:{file_unique_id}"]
+        if dhash:
+            keys.append(f"hash:{dhash}")
+        with VERDICT_LOCK:
+            for key in keys:
+                VERDICT_CACHE[key] = result
+        # One atomic upsert per key in a single round-trip, concurrent scans
+        # of the same media just overwrite each other
+        now = datetime.utcnow()
+        self.collection.bulk_write(
+            [
+                UpdateOne({"_id": key}, {"$set": {"result": result, "seen_at": now}}, upsert=True)
+                for key in keys
+            ],
+            ordered=False,
+        )
+
+    @staticmethod
+    def cache_stats():
+        with VERDICT_LOCK:
+            stats = dict(VERDICT_STATS)
+        hits = stats["file_hits"] + stats["hash_hits"]
+        stats["hit_rate"] = hits / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
@@ -79,9 +79,8 @@ class Pins(MongoDB):
     # ----- Static Methods -----
     @staticmethod
     def count_chats(atype: str):
-        with INSERTION_LOCK:
-            collection = MongoDB(Pins.db_name)
-            return collection.count({atype: True})
+        collection = MongoDB(Pins.db_name)
+        return collection.count({atype: True})
 
     @staticmethod
     def list_chats(query: str):
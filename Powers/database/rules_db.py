@@ -41,15 +41,13 @@ class Rules(MongoDB):
 
     @staticmethod
     def count_chats_with_rules():
-        with INSERTION_LOCK:
-            collection = MongoDB(Rules.db_name)
-            return collection.count({"rules": {"$regex": ".*"}})
+        collection = MongoDB(Rules.db_name)
+        return collection.count({"rules": {"$regex": ".*"}})
 
     @staticmethod
     def count_privrules_chats():
-        with INSERTION_LOCK:
-            collection = MongoDB(Rules.db_name)
-            return collection.count({"privrules": True})
+        collection = MongoDB(Rules.db_name)
+        return collection.count({"privrules": True})
 
     @staticmethod
     def count_grouprules_chats():
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime
+from time import time
+from traceback import format_exc
+
+from Powers import LOGGER
+from Powers.database import MongoDB, run_db
+from Powers.database.antispam_db import GBan
+from Powers.database.approve_db import Approve
+from Powers.database.blacklist_db import Blacklist
+from Powers.database.chats_db import Chats
+from Powers.database.disable_db import Disabling
+from Powers.database.filters_db import Filters
+from Powers.database.greetings_db import Greetings
+from Powers.database.notes_db import Notes, NotesSettings
+from Powers.database.pins_db import Pins
+from Powers.database.rules_db import Rules
+from Powers.database.users_db import Users
+from Powers.database.warns_db import Warns, WarnSettings
+
+REFRESH_INTERVAL  = 60 * 15  # seconds between snapshot refreshes
+STATS_CONCURRENCY = 2        # counters in DB_EXECUTOR at once, the rest wait
+
+# Latest snapshot, also stored in the db so it survives restarts
+STATS_SNAPSHOT = {}
+
+
+class StatsSnapshot(MongoDB):
+    """Single document holding the last computed /stats numbers."""
+
+    db_name = "bot_stats"
+
+    def __init__(self) -> None:
+        super().__init__(self.db_name)
+
+    def get_snapshot(self):
+        return self.find_one({"_id": "snapshot"})
+
+    def save_snapshot(self, stats: dict):
+        return self.upsert({"_id": "snapshot"}, stats)
+
+
+def _counters() -> dict:
+    """Name -> (blocking callable, args) for every number shown in /stats."""
+    return {
+        "users": (Users.count_users, ()),
+        "chats": (Chats.count_chats, ()),
+        "antichannelpin": (Pins.count_chats, ("antichannelpin",)),
+        "cleanlinked": (Pins.count_chats, ("cleanlinked",)),
+        "filters": (Filters().count_filters_all, ()),
+        "filters_chats": (Filters().count_filters_chats, ()),
+        "filter_aliases": (Filters().count_filter_aliases, ()),
+        "blacklists": (Blacklist.count_blacklists_all, ()),
+        "blacklists_chats": (Blacklist.count_blackists_chats, ()),
+        "bl_none": (Blacklist.count_action_bl_all, ("none",)),
+        "bl_kick": (Blacklist.count_action_bl_all, ("kick",)),
+        "bl_warn": (Blacklist.count_action_bl_all, ("warn",)),
+        "bl_ban": (Blacklist.count_action_bl_all, ("ban",)),
+        "rules": (Rules.count_chats_with_rules, ()),
+        "privrules": (Rules.count_privrules_chats, ()),
+        "warns": (Warns.count_warns_total, ()),
+        "warns_chats": (Warns.count_all_chats_using_warns, ()),
+        "warned_users": (Warns.count_warned_users, ()),
+        "warn_kick": (WarnSettings.count_action_chats, ("kick",)),
+        "warn_mute": (WarnSettings.count_action_chats, ("mute",)),
+        "warn_ban": (WarnSettings.count_action_chats, ("ban",)),
+        "notes": (Notes().count_all_notes, ()),
+        "notes_chats": (Notes().count_notes_chats, ()),
+        "private_notes": (NotesSettings().count_chats, ()),
+        "gbans": (GBan().count_gbans, ()),
+        "welcome": (Greetings.count_chats, ("welcome",)),
+        "approved": (Approve.count_all_approved, ()),
+        "approved_chats": (Approve.count_approved_chats, ()),
+        "disabled": (Disabling.count_disabled_all, ()),
+        "disabling_chats": (Disabling.count_disabling_chats, ()),
+        "dis_del": (Disabling.count_action_dis_all, ("del",)),
+    }
+
+
+async def refresh_stats() -> dict:
+    """
+    Run every counter in the db executor and store the result. Only a few
+    run at a time so handlers sharing DB_EXECUTOR aren't queued behind them.
+    """
+    start = time()
+    counters = _counters()
+    sem = asyncio.Semaphore(STATS_CONCURRENCY)
+
+    async def _count(func, args):
+        async with sem:
+            return await run_db(func, *args)
+
+    results = await asyncio.gather(
+        *(_count(func, args) for func, args in counters.values())
+    )
+    stats = dict(zip(counters, results))
+    stats["updated_at"] = datetime.utcnow()
+    STATS_SNAPSHOT.clear()
+    STATS_SNAPSHOT.update(stats)
+    await run_db(StatsSnapshot().save_snapshot, stats)
+    LOGGER.info(f"Refreshed stats snapshot in {round((time() - start), 3)}s!")
+    return stats
+
+
+async def get_stats() -> dict:
+    """Latest snapshot, computed on the spot only if none exists yet."""
+    if STATS_SNAPSHOT:
+        return STATS_SNAPSHOT
+    if snapshot := await run_db(StatsSnapshot().get_snapshot):
+        STATS_SNAPSHOT.update(snapshot)
+        return STATS_SNAPSHOT
+    return await refresh_stats()
+
+
+async def stats_refresher():
+    while True:
+        try:
+            await refresh_stats()
+        except Exception as ef:
+            LOGGER.error(f"Failed to refresh stats: {ef}")
+            LOGGER.error(format_exc())
+        await asyncio.sleep(REFRESH_INTERVAL)
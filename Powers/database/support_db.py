@@ -1,6 +1,6 @@
 from threading import RLock
 
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
@@ -12,6 +12,7 @@ class SUPPORTS(MongoDB):
     """
 
     db_name = "supports"
+    indexes = [index("user_id"), index("support_type")]
 
     def __init__(self) -> None:
         super().__init__(self.db_name)
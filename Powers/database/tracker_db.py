@@ -0,0 +1,126 @@
+import asyncio
+from threading import RLock
+from traceback import format_exc
+
+from cachetools import LRUCache
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from Powers import LOGGER
+from Powers.database import MongoDB, invalidate_settings, run_db
+from Powers.database.chats_db import ChatMembers, Chats
+from Powers.database.users_db import Users
+
+FLUSH_INTERVAL = 10  # seconds between flushes
+FLUSH_SIZE = 500  # pending entries that trigger an early flush
+
+
+class Sightings:
+    """
+    Write-behind tracker for the chats and users collections.
+
+    record() only touches memory; what actually changed since the last
+    write is buffered and flushed as unordered bulk_write upserts into
+    the users, chats and chat_members collections. Repeat sightings of an unchanged user cost nothing.
+    """
+
+    def __init__(self) -> None:
+        # What is already in the db, so unchanged sightings can be skipped
+        self.known_users = LRUCache(maxsize=100000)  # user_id -> (name, username)
+        self.known_members = LRUCache(maxsize=200000)  # (chat_id, user_id)
+        self.known_chats = LRUCache(maxsize=20000)  # chat_id -> chat_name
+        # Waiting to be flushed
+        self.pending_users = {}
+        self.pending_chats = {}
+        self.lock = RLock()
+        self.task = None
+        self.flushing = None
+
+    def record(self, chat_id: int, chat_name: str, user_id: int, name: str, username: str = None):
+        with self.lock:
+            if self.known_users.get(user_id) != (name, username):
+                self.known_users[user_id] = (name, username)
+                self.pending_users[user_id] = (name, username)
+
+            if (chat_id, user_id) not in self.known_members:
+                self.known_members[(chat_id, user_id)] = True
+                self.pending_chats.setdefault(chat_id, {"users": set()})["users"].add(user_id)
+
+            if self.known_chats.get(chat_id) != chat_name:
+                self.known_chats[chat_id] = chat_name
+                self.pending_chats.setdefault(chat_id, {"users": set()})["chat_name"] = chat_name
+
+            pending = len(self.pending_users) + len(self.pending_chats)
+
+        if pending >= FLUSH_SIZE and (self.flushing is None or self.flushing.done()):
+            self.flushing = asyncio.create_task(run_db(self.flush))
+
+    def flush(self):
+        """Write everything pending, blocking — run it through run_db."""
+        with self.lock:
+            users, self.pending_users = self.pending_users, {}
+            chats, self.pending_chats = self.pending_chats, {}
+
+        try:
+            if users:
+                MongoDB(Users.db_name).collection.bulk_write(
+                    [
+                        UpdateOne(
+                            {"_id": user_id},
+                            {"$set": {"name": name, "username": username}},
+                            upsert=True,
+                        )
+                        for user_id, (name, username) in users.items()
+                    ],
+                    ordered=False,
+                )
+            if chats:
+                names = [
+                    UpdateOne(
+                        {"_id": chat_id},
+                        {"$set": {"chat_name": data["chat_name"]}},
+                        upsert=True,
+                    )
+                    for chat_id, data in chats.items()
+                    if "chat_name" in data
+                ]
+                members = [
+                    ChatMembers.upsert_op(chat_id, user_id)
+                    for chat_id, data in chats.items()
+                    for user_id in data["users"]
+                ]
+                if names:
+                    MongoDB(Chats.db_name).collection.bulk_write(names, ordered=False)
+                    for chat_id, data in chats.items():
+                        if "chat_name" in data:
+                            invalidate_settings(Chats.db_name, chat_id)
+                if members:
+                    MongoDB(ChatMembers.db_name).collection.bulk_write(members, ordered=False)
+        except PyMongoError as ef:
+            LOGGER.error(f"Failed to flush sightings: {ef}")
+            LOGGER.error(format_exc())
+            # Forget them so they are written again on the next sighting
+            with self.lock:
+                for user_id in users:
+                    self.known_users.pop(user_id, None)
+                for chat_id, data in chats.items():
+                    self.known_chats.pop(chat_id, None)
+                    for user_id in data["users"]:
+                        self.known_members.pop((chat_id, user_id), None)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await run_db(self.flush)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+        await run_db(self.flush)
+
+
+sightings = Sightings()
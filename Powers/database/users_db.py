@@ -2,7 +2,7 @@ from threading import RLock
 from time import time
 
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
@@ -11,6 +11,7 @@ class Users(MongoDB):
     """Class to manage users for bot."""
 
     db_name = "users"
+    indexes = [index("username")]
 
     def __init__(self, user_id: int) -> None:
         super().__init__(self.db_name)
@@ -32,9 +33,8 @@ class Users(MongoDB):
 
     @staticmethod
     def count_users():
-        with INSERTION_LOCK:
-            collection = MongoDB(Users.db_name)
-            return collection.count()
+        collection = MongoDB(Users.db_name)
+        return collection.count()
 
     def get_my_info(self):
         with INSERTION_LOCK:
@@ -2,45 +2,36 @@ from threading import RLock
 from time import time
 
 from Powers import LOGGER
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index
 
 INSERTION_LOCK = RLock()
 
 
 class Warns(MongoDB):
     db_name = "chat_warns"
+    # Unique so concurrent first warns upsert into one document
+    indexes = [index("chat_id", "user_id", unique=True)]
 
     def __init__(self, chat_id: int) -> None:
         super().__init__(self.db_name)
         self.chat_id = chat_id
 
     def warn_user(self, user_id: int, warn_reason=None):
-        with INSERTION_LOCK:
-            self.user_info = self.__ensure_in_db(user_id)
-            self.user_info["warns"].append(warn_reason)
-            self.user_info["num_warns"] = len(self.user_info["warns"])
-            self.update(
-                {"chat_id": self.chat_id, "user_id": user_id},
-                {
-                    "warns": self.user_info["warns"],
-                    "num_warns": self.user_info["num_warns"],
-                },
-            )
-            return self.user_info["warns"], self.user_info["num_warns"]
+        self.user_info = self.modify(
+            {"chat_id": self.chat_id, "user_id": user_id},
+            {"$push": {"warns": warn_reason}, "$inc": {"num_warns": 1}},
+            upsert=True,
+        )
+        return self.user_info["warns"], self.user_info["num_warns"]
 
     def remove_warn(self, user_id: int):
-        with INSERTION_LOCK:
-            self.user_info = self.__ensure_in_db(user_id)
-            self.user_info["warns"].pop()
-            self.user_info["num_warns"] = len(self.user_info["warns"])
-            self.update(
-                {"chat_id": self.chat_id, "user_id": user_id},
-                {
-                    "warns": self.user_info["warns"],
-                    "num_warns": self.user_info["num_warns"],
-                },
-            )
-            return self.user_info["warns"], self.user_info["num_warns"]
+        if curr := self.modify(
+                {"chat_id": self.chat_id, "user_id": user_id, "num_warns": {"$gt": 0}},
+                {"$pop": {"warns": 1}, "$inc": {"num_warns": -1}},
+        ):
+            self.user_info = curr
+            return curr["warns"], curr["num_warns"]
+        return self.get_warns(user_id)
 
     def reset_warns(self, user_id: int):
         with INSERTION_LOCK:
@@ -58,24 +49,18 @@ class Warns(MongoDB):
 
     @staticmethod
     def count_all_chats_using_warns():
-        with INSERTION_LOCK:
-            collection = MongoDB(Warns.db_name)
-            curr = collection.find_all()
-            return len({i["chat_id"] for i in curr})
+        collection = MongoDB(Warns.db_name)
+        return collection.count_distinct("chat_id")
 
     @staticmethod
     def count_warned_users():
-        with INSERTION_LOCK:
-            collection = MongoDB(Warns.db_name)
-            curr = collection.find_all()
-            return len({i["user_id"] for i in curr if i["num_warns"] >= 1})
+        collection = MongoDB(Warns.db_name)
+        return collection.count_distinct("user_id", {"num_warns": {"$gte": 1}})
 
     @staticmethod
     def count_warns_total():
-        with INSERTION_LOCK:
-            collection = MongoDB(Warns.db_name)
-            curr = collection.find_all()
-            return sum(i["num_warns"] for i in curr if i["num_warns"] >= 1)
+        collection = MongoDB(Warns.db_name)
+        return collection.sum_field("$num_warns", {"num_warns": {"$gte": 1}})
 
     @staticmethod
     def repair_db(collection):
@@ -24,8 +24,13 @@ async def all_plugins():
 
 from Powers import BDB_URI, LOGGER
 
+def bday_key(day: int, month: int) -> str:
+    """Month-day key stored as "md" on users_bday, e.g. 05-18."""
+    return f"{int(month):02d}-{int(day):02d}"
+
+
 if BDB_URI:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, UpdateOne
     from pymongo.errors import PyMongoError
 
     try:
@@ -38,6 +43,24 @@ if BDB_URI:
         LOGGER.error(f"❌ Birthday DB error: {f}")
         exiter(1)
 
+    def __index_birthdays():
+        # The daily job only asks for today's "md", older entries lack it
+        try:
+            bday_info.create_index("md")
+            bday_info.create_index("user_id")
+            bday_cinfo.create_index("chat_id")
+            ops = []
+            for i in bday_info.find({"md": {"$exists": False}}, {"dob": 1}):
+                day, month = i["dob"].split("/")[:2]
+                ops.append(UpdateOne({"_id": i["_id"]}, {"$set": {"md": bday_key(day, month)}}))
+            if ops:
+                bday_info.bulk_write(ops, ordered=False)
+                LOGGER.info(f"Added month-day keys to {len(ops)} birthdays")
+        except PyMongoError as f:
+            LOGGER.error(f"❌ Birthday DB index error: {f}")
+
+    __index_birthdays()
+
 
 # ── Utility ───────────────────────────────────────────────────────────────────
 
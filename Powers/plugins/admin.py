@@ -9,7 +9,7 @@ from pyrogram.enums import ChatType
 from pyrogram.errors import (BotChannelsNa, ChatAdminInviteRequired,
                              ChatAdminRequired, FloodWait, RightForbidden,
                              RPCError, UserAdminInvalid)
-from pyrogram.types import (ChatPrivileges, Message, CallbackQuery,
+from pyrogram.types import (ChatMemberUpdated, ChatPrivileges, Message, CallbackQuery,
                             InlineKeyboardMarkup, InlineKeyboardButton)
 
 from Powers import LOGGER, OWNER_ID
@@ -17,7 +17,8 @@ from Powers.bot_class import Gojo
 from Powers.database.approve_db import Approve
 from Powers.database.reporting_db import Reporting
 from Powers.supports import get_support_staff
-from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload
+from Powers.utils.caching import (ADMIN_CACHE, TEMP_ADMIN_CACHE_BLOCK,
+                                  admin_cache_reload, update_admin_cache)
 from Powers.utils.custom_filters import admin_filter, command, promote_filter
 from Powers.utils.extract_user import extract_user
 from Powers.utils.parser import mention_html
@@ -107,7 +108,6 @@ async def zombie_clean(c: Gojo, m: Message):
 
 @Gojo.on_message(command("admincache"))
 async def reload_admins(_, m: Message):
-    global TEMP_ADMIN_CACHE_BLOCK
     if m.chat.type not in [ChatType.SUPERGROUP, ChatType.GROUP]:
         return await m.reply_text(
             "This command is made to be used in groups only!",
@@ -222,14 +222,6 @@ async def fullpromote_usr(c: Gojo, m: Message):
         # even more rights
         if Approve(m.chat.id).check_approve(user_id):
             Approve(m.chat.id).remove_approve(user_id)
-        # ----- Add admin to temp cache -----
-        try:
-            inp1 = user_name or user_first_name
-            admins_group = ADMIN_CACHE[m.chat.id]
-            admins_group.append((user_id, inp1))
-            ADMIN_CACHE[m.chat.id] = admins_group
-        except KeyError:
-            await admin_cache_reload(m, "promote_key_error")
     except ChatAdminRequired:
         await m.reply_text(text="I'm not admin or I don't have rights......")
     except RightForbidden:
@@ -375,7 +367,6 @@ async def promote_callback(c: Gojo, q: CallbackQuery):
     if action == "done":
         perms  = session["perms"]
         fname  = session["user_fname"]
-        uname  = session["user_name"]
 
         # Check at least one permission selected
         if not any(perms.values()):
@@ -400,14 +391,6 @@ async def promote_callback(c: Gojo, q: CallbackQuery):
             if Approve(chat_id).check_approve(user_id):
                 Approve(chat_id).remove_approve(user_id)
 
-            # Update admin cache
-            try:
-                admins_group = ADMIN_CACHE[chat_id]
-                admins_group.append((user_id, uname))
-                ADMIN_CACHE[chat_id] = admins_group
-            except KeyError:
-                pass
-
             _promote_sessions.pop(session_key, None)
 
             # Build summary of granted permissions
@@ -486,14 +469,6 @@ async def demote_usr(c: Gojo, m: Message):
             user_id=user_id,
             privileges=ChatPrivileges(can_manage_chat=False),
         )
-        # ----- Remove admin from cache -----
-        try:
-            admin_list = ADMIN_CACHE[m.chat.id]
-            user = next(user for user in admin_list if user[0] == user_id)
-            admin_list.remove(user)
-            ADMIN_CACHE[m.chat.id] = admin_list
-        except (KeyError, StopIteration):
-            await admin_cache_reload(m, "demote_key_stopiter_error")
         await m.reply_text(
             ("{demoter} demoted {demoted} in <b>{chat_title}</b>!").format(
                 demoter=(
@@ -656,6 +631,12 @@ async def setgpic(c: Gojo, m: Message):
     remove(photo)
 
 
+@Gojo.on_chat_member_updated(filters.group, group=10)
+async def track_admin_changes(_, u: ChatMemberUpdated):
+    # Keep ADMIN_CACHE in sync with promotions, demotions and admin leaves
+    update_admin_cache(u.chat.id, u.new_chat_member, u.old_chat_member)
+
+
 __PLUGIN__ = "admin"
 __alt_name__ = [
     "admins",
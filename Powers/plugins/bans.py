@@ -73,7 +73,7 @@ async def tban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
@@ -203,7 +203,7 @@ async def stban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
@@ -294,7 +294,7 @@ async def dtban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
@@ -402,7 +402,7 @@ async def kick_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "kick")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "kick")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot kick them!")
@@ -490,7 +490,7 @@ async def skick_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "kick")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "kick")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot kick them!")
@@ -561,7 +561,7 @@ async def dkick_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "kick")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "kick")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot kick them!")
@@ -708,7 +708,7 @@ async def sban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
@@ -785,7 +785,7 @@ async def dban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
@@ -879,7 +879,7 @@ async def ban_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "ban")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "ban")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot ban them!")
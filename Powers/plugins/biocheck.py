@@ -1,21 +1,38 @@
 import asyncio
 import re
+from time import perf_counter
 from traceback import format_exc
 from typing import Optional
 
+from cachetools import TTLCache
 from pyrogram import filters
 from pyrogram.enums import ChatMemberStatus as CMS
 from pyrogram.types import Message
 
-from Powers import LOGGER, OWNER_ID
+from Powers import BIO_CACHE_TTL, LOGGER, OWNER_ID
 from Powers.bot_class import Gojo
-from Powers.database.biolink_db import BioLinkSettings, BioLinkApprove
+from Powers.database.biolink_db import (BIOLINK_MODES, BioLinkApprove,
+                                        BioLinkSettings)
 from Powers.supports import get_support_staff
-from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload
+from Powers.utils.caching import ADMIN_CACHE, load_admins
 from Powers.utils.custom_filters import command
 from Powers.utils.extract_user import extract_user
 from Powers.utils.parser import mention_html
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+BIO_CACHE_SIZE = 20000          # users whose verdict is remembered
+CLEAN_TTL      = BIO_CACHE_TTL  # seconds a "no link" verdict is trusted
+LINKED_TTL     = 60             # re-check linked bios sooner, so removing the link unblocks fast
+
+# user_id -> True, a user sits in at most one of these
+BIO_CLEAN  = TTLCache(maxsize=BIO_CACHE_SIZE, ttl=CLEAN_TTL, timer=perf_counter)
+BIO_LINKED = TTLCache(maxsize=BIO_CACHE_SIZE, ttl=LINKED_TTL, timer=perf_counter)
+# user_id -> lookup task, a burst of messages shares one get_users call
+BIO_INFLIGHT = {}
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # LINK REGEX — bio vich URL detect karne lyi
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -52,7 +69,7 @@ async def _get_admins(c: Gojo, chat_id: int) -> set:
     try:
         return {i[0] for i in ADMIN_CACHE[chat_id]}
     except KeyError:
-        return {i[0] for i in await admin_cache_reload(None, "biolink")}
+        return {i.user_id for i in await load_admins(c, chat_id)}
 
 
 async def _is_group_owner(c: Gojo, chat_id: int, user_id: int) -> bool:
@@ -89,11 +106,8 @@ async def _should_check(
         return user_id not in admins
 
     elif mode == "normal":
-        if user_id in admins:
-            return False
-        if await _is_group_owner(c, chat_id, user_id):
-            return False
-        return True
+        # The owner is part of the admin list, no extra get_chat_member needed
+        return user_id not in admins
 
     elif mode == "strict":
         return True
@@ -115,6 +129,33 @@ def _has_link(text: str) -> bool:
     return bool(LINK_RE.search(text))
 
 
+async def _bio_has_link(c: Gojo, user_id: int) -> bool:
+    """Cached verdict for user's bio, the API is hit once per TTL per user."""
+    if user_id in BIO_CLEAN:
+        return False
+    if user_id in BIO_LINKED:
+        return True
+    if task := BIO_INFLIGHT.get(user_id):
+        return await asyncio.shield(task)
+
+    async def _lookup() -> bool:
+        try:
+            bio = await _get_bio(c, user_id)
+            if bio is None:
+                # Lookup failed (FloodWait etc.), skip this message only
+                return False
+            if _has_link(bio):
+                BIO_LINKED[user_id] = True
+                return True
+            BIO_CLEAN[user_id] = True
+            return False
+        finally:
+            BIO_INFLIGHT.pop(user_id, None)
+
+    task = BIO_INFLIGHT[user_id] = asyncio.create_task(_lookup())
+    return await asyncio.shield(task)
+
+
 async def _warn(c: Gojo, chat_id: int, text: str, delay: int = 15):
     try:
         msg = await c.send_message(chat_id, text)
@@ -139,7 +180,7 @@ async def biolink_check(c: Gojo, m: Message):
 
     chat_id = m.chat.id
     user_id = m.from_user.id
-    mode    = BioLinkSettings().get_mode(chat_id)
+    mode    = BIOLINK_MODES.get(chat_id, "off")
 
     if mode == "off":
         return
@@ -149,9 +190,8 @@ async def biolink_check(c: Gojo, m: Message):
     if not await _should_check(c, chat_id, user_id, mode, approve_db):
         return
 
-    # ── Fetch bio ─────────────────────────────────────────────────────────────
-    bio = await _get_bio(c, user_id)
-    if bio is None or not _has_link(bio):
+    # ── Check bio (cached per user) ───────────────────────────────────────────
+    if not await _bio_has_link(c, user_id):
         return
 
     # ── Delete message + send alert ───────────────────────────────────────────
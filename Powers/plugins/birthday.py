@@ -12,6 +12,8 @@ from Powers import BDB_URI, LOGGER
 from Powers.bot_class import Gojo
 from Powers.database.chats_db import Chats
 
+from Powers.plugins import bday_key
+
 if BDB_URI:
     from Powers.plugins import bday_cinfo, bday_info
 
@@ -63,7 +65,7 @@ async def remember_me(c: Gojo, m: Message):
         await m.reply_text("DOB should be numbers only")
         return
 
-    data = {"user_id": user, "dob": DOB, "is_year": is_year}
+    data = {"user_id": user, "dob": DOB, "md": bday_key(date, month), "is_year": is_year}
     try:
         if bday_info.find_one({"user_id": user}):
             await m.reply_text("User is already in my database")
@@ -1,4 +1,4 @@
-import os
+from functools import partial
 from random import choice, shuffle
 from traceback import format_exc
 from typing import List
@@ -13,12 +13,16 @@ from pyrogram.types import Message, User
 
 from Powers import LOGGER, MESSAGE_DUMP
 from Powers.bot_class import Gojo
+from Powers.database import run_db
 from Powers.database.captcha_db import CAPTCHA, CAPTCHA_DATA
+from Powers.database.greetings_db import Greetings
 from Powers.supports import get_support_staff
+from Powers.utils.caching import ADMIN_CACHE
 from Powers.utils.captcha_helper import (genrator, get_image_captcha,
                                          get_qr_captcha)
 from Powers.utils.custom_filters import admin_filter, captcha_filter, command
 from Powers.utils.extras import BAN_GIFS
+from Powers.utils.join_burst import fan_out, raid_guard
 
 
 @Gojo.on_message(command("captcha") & admin_filter & ~filters.private)
@@ -147,107 +151,118 @@ async def captcha_codes_check(c: Gojo, q: CallbackQuery):
     return
 
 
-@Gojo.on_message(filters.group & captcha_filter & filters.new_chat_members, group=3)
-async def on_chat_members_updatess(c: Gojo, m: Message):
+async def _challenge(c: Gojo, m: Message, captcha_type: str, user: User):
+    """Restrict one new member and send them a captcha."""
     chat = m.chat.id
+    cap_data = CAPTCHA_DATA()
+    is_already = await run_db(cap_data.is_already_data, chat, user.id)
 
-    users: List[User] = m.new_chat_members
-    for user in users:
-        captcha = CAPTCHA()
-        cap_data = CAPTCHA_DATA()
-
-        if user.is_bot:
-            continue
-        SUPPORT_STAFF = get_support_staff()
-
-        try:
-            status = (await m.chat.get_member(user)).status
-            if status in [CMS.OWNER, CMS.ADMINISTRATOR]:
-                continue
-        except Exception:
-            pass
-        if user.id in SUPPORT_STAFF:
-            continue
-        captcha_info = captcha.get_captcha(chat)
-        captcha_type = captcha_info["captcha_type"]
-        is_already = cap_data.is_already_data(chat, user.id)
-
+    mess = False
+    try:
+        if is_already:
+            mess = await c.get_messages(chat, int(is_already))
+    except Exception:
+        await run_db(cap_data.del_message_id, chat, user.id)
         mess = False
-        try:
-            if is_already:
-                mess = await c.get_messages(chat, int(is_already))
-        except Exception:
-            cap_data.del_message_id(chat, is_already)
-            mess = False
-            is_already = False
-
-        if is_already and mess.empty:
-            cap_data.del_message_id(chat, is_already)
-            continue
+        is_already = False
 
-        try:
-            await c.restrict_chat_member(chat, user.id, ChatPermissions())
-        except Exception as e:
-            LOGGER.error(e)
-            LOGGER.error(format_exc())
-            continue
+    if is_already and mess.empty:
+        await run_db(cap_data.del_message_id, chat, user.id)
+        return
 
-        if not is_already:
-            captcha_type = "image"  # I am not going to apply qr captcha in this update
-            if captcha_type == "image":
-                img, code = await get_image_captcha(chat, user.id)
-                cap = f"Please {user.mention} please choose the correct code from the one given bellow\nYou have three tries if you get all three wrong u will be banned from the chat.\nTries left: 3"
-                cap_data.load_cap_data(chat, user.id, code)
-                rand = [code]
-                while len(rand) != 5:
-                    hehe = genrator()
-                    if hehe != code:
-                        rand.append(hehe)
+    try:
+        await c.restrict_chat_member(chat, user.id, ChatPermissions())
+    except Exception as e:
+        LOGGER.error(e)
+        LOGGER.error(format_exc())
+        return
 
-                shuffle(rand)
+    if not is_already:
+        captcha_type = "image"  # I am not going to apply qr captcha in this update
+        if captcha_type == "image":
+            img, code = await get_image_captcha(chat, user.id)
+            cap = f"Please {user.mention} please choose the correct code from the one given bellow\nYou have three tries if you get all three wrong u will be banned from the chat.\nTries left: 3"
+            await run_db(cap_data.load_cap_data, chat, user.id, code)
+            rand = [code]
+            while len(rand) != 5:
+                hehe = genrator()
+                if hehe != code:
+                    rand.append(hehe)
 
-                ini = f"captcha_{chat}_{user.id}_"
+            shuffle(rand)
+
+            ini = f"captcha_{chat}_{user.id}_"
 
-                kb = ikm(
-                    [
-                        [
-                            IKB(rand[0], ini + rand[0])
-                        ],
-                        [
-                            IKB(rand[1], ini + rand[1])
-                        ],
-                        [
-                            IKB(rand[2], ini + rand[2])
-                        ],
-                        [
-                            IKB(rand[3], ini + rand[3])
-                        ],
-                        [
-                            IKB(rand[4], ini + rand[4])
-                        ]
-                    ]
-                )
-                await c.send_photo(chat, img, caption=cap, reply_markup=kb)
-                os.remove(img)
-            elif captcha_type == "qr":
-                pic = await get_qr_captcha(chat, user.id, c.me.username)
-                cap = f"Please {user.mention} scan this qr code with your phone to verify that you are human"
-                ms = await c.send_photo(chat, pic, caption=cap)
-                os.remove(pic)
-                cap_data.store_message_id(chat, user.id, ms.id)
-        elif mess:
             kb = ikm(
                 [
                     [
-                        IKB("Click here to verify", url=mess.link)
+                        IKB(rand[0], ini + rand[0])
+                    ],
+                    [
+                        IKB(rand[1], ini + rand[1])
+                    ],
+                    [
+                        IKB(rand[2], ini + rand[2])
+                    ],
+                    [
+                        IKB(rand[3], ini + rand[3])
+                    ],
+                    [
+                        IKB(rand[4], ini + rand[4])
                     ]
                 ]
             )
-            await c.send_message(f"{user.mention} your verification is already pending", reply_markup=kb)
+            await c.send_photo(chat, img, caption=cap, reply_markup=kb)
+        elif captcha_type == "qr":
+            pic = await get_qr_captcha(chat, user.id, c.me.username)
+            cap = f"Please {user.mention} scan this qr code with your phone to verify that you are human"
+            ms = await c.send_photo(chat, pic, caption=cap)
+            await run_db(cap_data.store_message_id, chat, user.id, ms.id)
+    elif mess:
+        kb = ikm(
+            [
+                [
+                    IKB("Click here to verify", url=mess.link)
+                ]
+            ]
+        )
+        await c.send_message(chat, f"{user.mention} your verification is already pending", reply_markup=kb)
+    else:
+        await c.unban_chat_member(chat, user.id)
+
+
+@Gojo.on_message(filters.group & captcha_filter & filters.new_chat_members, group=3)
+async def on_chat_members_updatess(c: Gojo, m: Message):
+    chat = m.chat.id
+    SUPPORT_STAFF = get_support_staff()
+    admins = ADMIN_CACHE.admin_ids(chat)
+
+    users: List[User] = []
+    for user in m.new_chat_members:
+        if user.is_bot or user.id in SUPPORT_STAFF:
             continue
-        else:
-            await c.unban_chat_member(chat, user.id)
+        if admins is None:
+            try:
+                status = (await m.chat.get_member(user)).status
+                if status in [CMS.OWNER, CMS.ADMINISTRATOR]:
+                    continue
+            except Exception:
+                pass
+        elif user.id in admins:
             continue
+        users.append(user)
+    if not users:
+        return
+
+    if Greetings(chat).get_raid_mode() and raid_guard.record(chat, len(users)):
+        await raid_guard.hold(c, chat, users)
+        return
+
+    captcha_info = await run_db(CAPTCHA().get_captcha, chat)
+    if not captcha_info:
+        return
+    # Restrictions and captchas of a burst go out in parallel
+    await fan_out(partial(_challenge, c, m, captcha_info["captcha_type"]), users)
 
 
 __PLUGIN__ = "captcha"
@@ -18,10 +18,12 @@ from pyrogram.types import Message
 from Powers import (BOT_TOKEN, LOG_DATETIME, LOGFILE, LOGGER, MESSAGE_DUMP,
                     OWNER_ID, SUPPORT_USERS, UPTIME)
 from Powers.bot_class import Gojo
-from Powers.database import MongoDB
+from Powers.database import MongoDB, index_report, run_db
 from Powers.database.chats_db import Chats
 from Powers.database.support_db import SUPPORTS
 from Powers.database.users_db import Users
+from Powers.supports import rebuild_support_snapshot
+from Powers.utils.broadcast import broadcaster
 from Powers.utils.clean_file import remove_markdown_and_html
 from Powers.utils.custom_filters import command
 from Powers.utils.extract_user import extract_user
@@ -82,6 +84,7 @@ async def add_support(c: Gojo, m: Message):
                     SUPPORT_USERS["Sudo"].add(userr)
                 else:
                     SUPPORT_USERS["White"].add(userr)
+                rebuild_support_snapshot()
                 await m.reply_text(f"This user is now a {to} user")
             return
         if can_do := can_change_type(curr_user, to):
@@ -100,6 +103,7 @@ async def add_support(c: Gojo, m: Message):
                                    reply_markup=kb)
             else:
                 support.insert_support_user(userr, to)
+                rebuild_support_snapshot()
                 await m.reply_text(f"This user is now a {to} user")
         else:
             await m.reply_text("Sorry you can't do it")
@@ -137,6 +141,7 @@ async def add_support(c: Gojo, m: Message):
                                    reply_markup=kb)
             else:
                 support.insert_support_user(userr, to)
+                rebuild_support_snapshot()
                 await m.reply_text(f"This user is now a {to} user")
             return
         if can_do := can_change_type(curr_user, to):
@@ -155,6 +160,7 @@ async def add_support(c: Gojo, m: Message):
                                    reply_markup=kb)
             else:
                 support.insert_support_user(userr, to)
+                rebuild_support_snapshot()
                 await m.reply_text(f"This user is now a {to} user")
         else:
             await m.reply_text("Sorry you can't do it")
@@ -194,6 +200,7 @@ async def rm_support(c: Gojo, m: Message):
         SUPPORT_USERS["Dev"].discard(curr)
         SUPPORT_USERS["Sudo"].discard(curr)
         SUPPORT_USERS["White"].discard(curr)
+        rebuild_support_snapshot()
         await m.reply_text("Done! User now no longer belongs to the support staff")
     else:
         await m.reply_text("Sorry you can't do that...")
@@ -597,6 +604,28 @@ async def uptime(_, m: Message):
     return
 
 
+@Gojo.on_message(command("dbindexes", dev_cmd=True))
+async def db_indexes(_, m: Message):
+    replymsg = await m.reply_text("Checking database indexes...", quote=True)
+    report = await run_db(index_report)
+    text = "Index usage (ops since mongod start)\n\n"
+    for name, indexes in report["usage"].items():
+        text += f"{name}\n"
+        text += "".join(f"  {idx}: {ops}\n" for idx, ops in indexes.items())
+    text += "\nQuery shapes hitting COLLSCAN\n\n"
+    text += "".join(
+        f"  {name}: {{{', '.join(keys)}}}\n" for name, keys in report["collscans"]
+    ) or "  None\n"
+    with BytesIO(str.encode(text)) as f:
+        f.name = "dbindexes.txt"
+        await m.reply_document(
+            document=f,
+            caption="Database index report.",
+        )
+    await replymsg.delete()
+    return
+
+
 @Gojo.on_message(command("leavechat", dev_cmd=True))
 async def leave_chat(c: Gojo, m: Message):
     if len(m.text.split()) != 2:
@@ -626,31 +655,8 @@ async def chat_broadcast(c: Gojo, m: Message):
         return
 
     exmsg = await m.reply_text("Started broadcasting!")
-    all_chats = (Chats.list_chats_by_id()) or {}
-    err_str, done_broadcast = "", 0
-
-    for chat in all_chats:
-        try:
-            await c.send_message(chat, msg, disable_web_page_preview=True)
-            done_broadcast += 1
-            await sleep(0.1)
-        except RPCError as ef:
-            LOGGER.error(ef)
-            err_str += str(ef)
-            continue
-
-    await exmsg.edit_text(
-        f"Done broadcasting ✅\nSent message to {done_broadcast} chats",
-    )
-
-    if err_str:
-        with BytesIO(str.encode(await remove_markdown_and_html(err_str))) as f:
-            f.name = "error_broadcast.txt"
-            await m.reply_document(
-                document=f,
-                caption="Broadcast Error",
-            )
-
+    all_chats = (await run_db(Chats.list_chats_by_id)) or []
+    await broadcaster.start(c, "send", all_chats, {"text": msg}, exmsg)
     return
 
 
@@ -662,46 +668,34 @@ async def forward_type_broadcast(c: Gojo, m: Message):
         return
     split = m.command
 
-    chat = Chats.list_chats_by_id()
-    user = [i["_id"] for i in Users.list_users()]
-    alll = chat + user
-    if len(split) != 2:
-        tag = "all"
-    else:
-        try:
-            if split[0].lower() == "-u":
-                tag = "user"
-            elif split[0].lower() == "-c":
-                tag = "chat"
-            else:
-                tag = "all"
-        except IndexError:
-            pass
-    if tag == "chat":
-        peers = chat
-    elif tag == "user":
-        peers = user
-    else:
-        peers = alll
+    tag = "all"
+    if len(split) == 2:
+        if split[1].lower() == "-u":
+            tag = "user"
+        elif split[1].lower() == "-c":
+            tag = "chat"
+
+    peers = []
+    if tag in ("chat", "all"):
+        peers += await run_db(Chats.list_chats_by_id)
+    if tag in ("user", "all"):
+        peers += [i["_id"] for i in await run_db(Users.list_users)]
 
     xx = await m.reply_text("Broadcasting...")
+    await broadcaster.start(
+        c, "forward", peers, {"from_chat": repl.chat.id, "message_id": repl.id}, xx)
+    return
 
-    failed = 0
-    total = len(peers)
-    for peer in peers:
-        try:
-            await repl.forward(int(peer))
-            await sleep(0.1)
-        except Exception:
-            failed += 1
-    txt = f"Broadcasted message to {total - failed} peers out of {total}\nFailed to broadcast message to {failed} peers"
-    if not failed:
-        txt = f"Broadcasted message to {total} peers"
-    await m.reply_text(txt)
-    try:
-        await xx.delete()
-    except Exception:
-        pass
+
+@Gojo.on_message(command("cancelbroadcast", dev_cmd=True))
+async def cancel_broadcast(_, m: Message):
+    if len(m.command) != 2:
+        await m.reply_text("Give me the job id shown in the broadcast status message.")
+        return
+    if broadcaster.cancel(m.command[1]):
+        await m.reply_text("Broadcast cancelled.")
+    else:
+        await m.reply_text("No running broadcast with that id.")
     return
 
 
@@ -723,6 +717,7 @@ __HELP__ = """
 • /minfo [module name]: Give info about module
 • /chatlist : Return the list of chats present in database
 • /uptime : Return the uptime of the bot.
+• /dbindexes : Report index usage and query shapes still doing collection scans.
 • /leavechat : Bot will leave the provided chat.
 • /chatbroadcast : Broadcast the messge to chats.
 • /forward (/fwd) [tag] : Forward message to peers according to tag. Default to all
@@ -730,6 +725,7 @@ __HELP__ = """
      `-u` : For users
      `-c` : For chats
      `-all` : For all
+• /cancelbroadcast [job id] : Stop a running broadcast.
 
 **Sudoer's command:**
 • /ping : return the ping of the bot.
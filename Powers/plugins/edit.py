@@ -8,6 +8,7 @@ from Powers import LOGGER, OWNER_ID
 from Powers.supports import get_support_staff
 from Powers.utils.parser import mention_html
 from Powers.utils.admin_check_aiogram import is_admin_silent
+from Powers.utils.caching import get_admin_aiogram
 from Powers.database.edit_db import EditSettings
 
 router = Router()
@@ -40,9 +41,8 @@ def _is_bot_owner(user_id: int) -> bool:
 
 async def _is_owner(bot: Bot, chat_id: int, user_id: int) -> bool:
     try:
-        from aiogram.types import ChatMemberOwner
-        member = await bot.get_chat_member(chat_id, user_id)
-        return isinstance(member, ChatMemberOwner)
+        member = await get_admin_aiogram(bot, chat_id, user_id)
+        return bool(member and member.is_owner)
     except Exception:
         return False
 
@@ -1,4 +1,4 @@
-from re import escape as re_escape
+from functools import partial
 from secrets import choice
 from traceback import format_exc
 
@@ -9,12 +9,13 @@ from pyrogram.errors import RPCError
 from pyrogram.types import CallbackQuery, Message
 
 from Powers.bot_class import LOGGER, Gojo
+from Powers.database import run_db
 from Powers.database.filters_db import Filters
 from Powers.utils.cmd_senders import send_cmd
 from Powers.utils.custom_filters import admin_filter, command, owner_filter
 from Powers.utils.kbhelpers import ikb
 from Powers.utils.msg_types import Types, get_filter_type
-from Powers.utils.regex_utils import regex_searcher
+from Powers.utils.regex_utils import get_trigger_matcher
 from Powers.utils.string import (build_keyboard,
                                  escape_mentions_using_curly_brackets,
                                  parse_button, split_quotes)
@@ -265,21 +266,19 @@ async def send_filter_reply(c: Gojo, m: Message, trigger: str):
 
 @Gojo.on_message(filters.text & filters.group & ~filters.bot, group=69)
 async def filters_watcher(c: Gojo, m: Message):
-    chat_filters = db.get_all_filters(m.chat.id)
-    actual_filters = {j for i in chat_filters for j in i.split("|")}
-
-    for trigger in actual_filters:
-        pattern = r"( |^|[^\w])" + re_escape(trigger) + r"( |$|[^\w])"
-        match = await regex_searcher(pattern, m.text.lower())
-        if match:
-            try:
-                msgtype = await send_filter_reply(c, m, trigger)
-            except Exception as ef:
-                await m.reply_text(f"Error: {ef}")
-                LOGGER.error(ef)
-                LOGGER.error(format_exc())
-            break
-        continue
+    matcher = await get_trigger_matcher(
+        db.db_name, m.chat.id, partial(run_db, db.get_filter_triggers, m.chat.id),
+    )
+    if not matcher:
+        return
+
+    if keyword := matcher.search(m.text.lower()):
+        try:
+            msgtype = await send_filter_reply(c, m, keyword)
+        except Exception as ef:
+            await m.reply_text(f"Error: {ef}")
+            LOGGER.error(ef)
+            LOGGER.error(format_exc())
     return
 
 
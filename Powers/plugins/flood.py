@@ -1,4 +1,3 @@
-import time
 from datetime import datetime, timedelta
 from random import choice
 from traceback import format_exc
@@ -17,6 +16,7 @@ from Powers.database.flood_db import Floods
 from Powers.supports import get_support_staff
 from Powers.utils.custom_filters import admin_filter, command, flood_filter
 from Powers.utils.extras import BAN_GIFS, KICK_GIFS, MUTE_GIFS
+from Powers.utils.flood_engine import FLOOD_MODES, flood_engine
 
 on_key = ["on", "start", "disable"]
 off_key = ["off", "end", "enable", "stop"]
@@ -175,6 +175,24 @@ async def flood_on_off(c: Gojo, m: Message):
     return await m.reply_text("Flood protection is off for this chat.")
 
 
+@Gojo.on_message(command(['floodmode']) & ~filters.bot & admin_filter)
+async def flood_mode(c: Gojo, m: Message):
+    if m.chat.type == CT.PRIVATE:
+        return await m.reply_text("This command is ment to be used in groups.")
+    Flood = Floods()
+    c_id = m.chat.id
+    if not Flood.is_chat(c_id):
+        return await m.reply_text("Flood protection is off for this chat.")
+    split = m.text.split(None, 1)
+    if len(split) == 1:
+        return await m.reply_text(f"Current flood mode: `{Flood.get_mode(c_id)}`")
+    mode = split[1].lower()
+    if mode not in FLOOD_MODES:
+        return await m.reply_text(f"**Usage:**\n `/floodmode {'/'.join(FLOOD_MODES)}`")
+    Flood.set_mode(c_id, mode)
+    return await m.reply_text(f"Flood mode set to `{mode}`")
+
+
 @Gojo.on_message(command(['setflood']) & ~filters.bot & admin_filter)
 async def flood_set(c: Gojo, m: Message):
     bot = await c.get_chat_member(m.chat.id, c.me.id)
@@ -382,9 +400,6 @@ async def reverse_callbacks(c: Gojo, q: CallbackQuery):
         return
 
 
-dic = {}
-
-
 @Gojo.on_message(flood_filter, 18)
 async def flood_watcher(c: Gojo, m: Message):
     c_id = m.chat.id
@@ -399,240 +414,180 @@ async def flood_watcher(c: Gojo, m: Message):
     limit = int(is_flood[0])
     within = int(is_flood[1])
 
-    if not len(dic):
-        z = {c_id: {u_id: [[], []]}}
-        dic.update(z)
-
-    try:
-        dic[c_id]  # access and check weather the c_id present or not
-    except KeyError:
-        z = {c_id: {u_id: [[], []]}}
-        dic.update(z)
-
-    try:
-        dic[c_id][u_id]
-    except KeyError:
-        z = {u_id: [[], []]}
-        dic[c_id].update(z)  # make the dic something like {c_id : {u_id : [[for time],[for msg]]}}
-
-    sec = round(time.time())
-
-    try:
-        dic[c_id][u_id][0].append(sec)
-        dic[c_id][u_id][1].append("x")
-    except KeyError:
-        dic[c_id].update({u_id: [[sec], ["x"]]})
-
-    x = int(dic[c_id][u_id][0][0])
-    y = int(dic[c_id][u_id][0][-1])
-
-    if len(dic[c_id][u_id][1]) == limit:
-        if y - x <= within:
-            action = action.split("_")
-            if len(action) == 2:
-                try:
-                    to_do = action[0]
-                    for_tim = int(action[1].replace("min", ""))
-                except Exception:
-                    for_tim = 30
-                for_how_much = datetime.now() + timedelta(minutes=for_tim)
-                try:
-                    if to_do == "ban":
-                        await m.chat.ban_member(u_id, until_date=for_how_much)
-                        keyboard = InlineKeyboardMarkup(
-                            [
-                                [
-                                    InlineKeyboardButton(
-                                        "Unban",
-                                        callback_data=f"un_ban_={u_id}",
-                                    ),
-                                ],
-                            ],
-                        )
-                        txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Baned\nReason: Spaming\nUntril: {for_how_much}"
-                        await m.reply_animation(
-                            animation=str(choice(BAN_GIFS)),
-                            caption=txt,
-                            reply_markup=keyboard,
-                        )
-                    else:
-                        await m.chat.restrict_member(
-                            u_id,
-                            ChatPermissions(),
-                            until_date=for_how_much
-                        )
-                        keyboard = InlineKeyboardMarkup(
-                            [
-                                [
-                                    InlineKeyboardButton(
-                                        "Unmute",
-                                        callback_data=f"un_mute_={u_id}",
-                                    ),
-                                ],
-                            ],
-                        )
-                        txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Muted\nReason: Spaming\nUntil: {for_how_much}"
-                        await m.reply_animation(
-                            animation=str(choice(MUTE_GIFS)),
-                            caption=txt,
-                            reply_markup=keyboard,
-                        )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-
-                except UserAdminInvalid:
-                    await m.reply_text(
-                        "I can't protect this chat from this user",
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except RPCError as ef:
-                    await m.reply_text(
-                        text=f"""Some error occured, report it using `/bug`
+    if not flood_engine.hit(c_id, u_id, limit, within, Flood.get_mode(c_id)):
+        return
+    flood_engine.reset(c_id, u_id)
 
-                            <b>Error:</b> <code>{ef}</code>"""
-                    )
-                    LOGGER.error(ef)
-                    LOGGER.error(format_exc())
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
+    action = action.split("_")
+    if len(action) == 2:
+        try:
+            to_do = action[0]
+            for_tim = int(action[1].replace("min", ""))
+        except Exception:
+            for_tim = 30
+        for_how_much = datetime.now() + timedelta(minutes=for_tim)
+        try:
+            if to_do == "ban":
+                await m.chat.ban_member(u_id, until_date=for_how_much)
+                keyboard = InlineKeyboardMarkup(
+                    [
+                        [
+                            InlineKeyboardButton(
+                                "Unban",
+                                callback_data=f"un_ban_={u_id}",
+                            ),
+                        ],
+                    ],
+                )
+                txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Baned\nReason: Spaming\nUntril: {for_how_much}"
+                await m.reply_animation(
+                    animation=str(choice(BAN_GIFS)),
+                    caption=txt,
+                    reply_markup=keyboard,
+                )
             else:
-                action = action[0]
-            if action == "ban":
-                try:
-                    await m.chat.ban_member(u_id)
-                    keyboard = InlineKeyboardMarkup(
+                await m.chat.restrict_member(
+                    u_id,
+                    ChatPermissions(),
+                    until_date=for_how_much
+                )
+                keyboard = InlineKeyboardMarkup(
+                    [
                         [
-                            [
-                                InlineKeyboardButton(
-                                    "Unban",
-                                    callback_data=f"un_ban_={u_id}",
-                                ),
-                            ],
+                            InlineKeyboardButton(
+                                "Unmute",
+                                callback_data=f"un_mute_={u_id}",
+                            ),
                         ],
-                    )
-                    txt = "Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Baned\nReason: Spaming"
-                    await m.reply_animation(
-                        animation=str(choice(BAN_GIFS)),
-                        caption=txt,
-                        reply_markup=keyboard,
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
+                    ],
+                )
+                txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Muted\nReason: Spaming\nUntil: {for_how_much}"
+                await m.reply_animation(
+                    animation=str(choice(MUTE_GIFS)),
+                    caption=txt,
+                    reply_markup=keyboard,
+                )
+            return
 
-                except UserAdminInvalid:
-                    await m.reply_text(
-                        "I can't protect this chat from this user",
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except RPCError as ef:
-                    await m.reply_text(
-                        text=f"""Some error occured, report it using `/bug`
+        except UserAdminInvalid:
+            await m.reply_text(
+                "I can't protect this chat from this user",
+            )
+            return
+        except RPCError as ef:
+            await m.reply_text(
+                text=f"""Some error occured, report it using `/bug`
 
-                        <b>Error:</b> <code>{ef}</code>"""
-                    )
-                    LOGGER.error(ef)
-                    LOGGER.error(format_exc())
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
+                    <b>Error:</b> <code>{ef}</code>"""
+            )
+            LOGGER.error(ef)
+            LOGGER.error(format_exc())
+            return
+    else:
+        action = action[0]
+    if action == "ban":
+        try:
+            await m.chat.ban_member(u_id)
+            keyboard = InlineKeyboardMarkup(
+                [
+                    [
+                        InlineKeyboardButton(
+                            "Unban",
+                            callback_data=f"un_ban_={u_id}",
+                        ),
+                    ],
+                ],
+            )
+            txt = "Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Baned\nReason: Spaming"
+            await m.reply_animation(
+                animation=str(choice(BAN_GIFS)),
+                caption=txt,
+                reply_markup=keyboard,
+            )
+            return
 
-            elif action == "kick":
-                try:
-                    d = datetime.now() + timedelta(
-                        seconds=31)  # will automatically unban user after 31 seconds kind of fail safe if unban members doesn't work properly
-                    await m.chat.ban_member(u_id, until_date=d)
-                    success = await c.unban_chat_member(m.chat.id, u_id)
-                    txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: {'kicked' if success else 'banned for 30 seconds'}\nReason: Spaming"
-                    await m.reply_animation(
-                        animation=str(choice(KICK_GIFS)),
-                        caption=txt
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except UserAdminInvalid:
-                    await m.reply_text(
-                        "I can't protect this chat from this user",
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except RPCError as ef:
-                    await m.reply_text(
-                        text=f"""Some error occured, report it using `/bug`
+        except UserAdminInvalid:
+            await m.reply_text(
+                "I can't protect this chat from this user",
+            )
+            return
+        except RPCError as ef:
+            await m.reply_text(
+                text=f"""Some error occured, report it using `/bug`
 
-                        <b>Error:</b> <code>{ef}</code>"""
-                    )
-                    LOGGER.error(ef)
-                    LOGGER.error(format_exc())
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except Exception as e:
-                    LOGGER.error(e)
-                    LOGGER.error(format_exc())
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-            elif action == "mute":
-                try:
-                    await m.chat.restrict_member(
-                        u_id,
-                        ChatPermissions(),
-                    )
-                    keyboard = InlineKeyboardMarkup(
-                        [
-                            [
-                                InlineKeyboardButton(
-                                    "Unmute",
-                                    callback_data=f"un_mute_={u_id}",
-                                ),
-                            ],
-                        ],
-                    )
-                    txt = "Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Muted\nReason: Spaming"
-                    await m.reply_animation(
-                        animation=str(choice(MUTE_GIFS)),
-                        caption=txt,
-                        reply_markup=keyboard,
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except UserAdminInvalid:
-                    await m.reply_text(
-                        "I can't protect this chat from this user",
-                    )
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-                except RPCError as ef:
-                    await m.reply_text(
-                        text=f"""Some error occured, report it using `/bug`
+                <b>Error:</b> <code>{ef}</code>"""
+            )
+            LOGGER.error(ef)
+            LOGGER.error(format_exc())
+            return
 
-                        <b>Error:</b> <code>{ef}</code>"""
-                    )
-                    LOGGER.error(ef)
-                    LOGGER.error(format_exc())
-                    dic[c_id][u_id][1].clear()
-                    dic[c_id][u_id][0].clear()
-                    return
-    elif y - x > within:
+    elif action == "kick":
         try:
-            dic[c_id][u_id][1].clear()
-            dic[c_id][u_id][0].clear()
+            d = datetime.now() + timedelta(
+                seconds=31)  # will automatically unban user after 31 seconds kind of fail safe if unban members doesn't work properly
+            await m.chat.ban_member(u_id, until_date=d)
+            success = await c.unban_chat_member(m.chat.id, u_id)
+            txt = f"Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: {'kicked' if success else 'banned for 30 seconds'}\nReason: Spaming"
+            await m.reply_animation(
+                animation=str(choice(KICK_GIFS)),
+                caption=txt
+            )
+            return
+        except UserAdminInvalid:
+            await m.reply_text(
+                "I can't protect this chat from this user",
+            )
+            return
+        except RPCError as ef:
+            await m.reply_text(
+                text=f"""Some error occured, report it using `/bug`
+
+                <b>Error:</b> <code>{ef}</code>"""
+            )
+            LOGGER.error(ef)
+            LOGGER.error(format_exc())
+            return
+        except Exception as e:
+            LOGGER.error(e)
+            LOGGER.error(format_exc())
+            return
+    elif action == "mute":
+        try:
+            await m.chat.restrict_member(
+                u_id,
+                ChatPermissions(),
+            )
+            keyboard = InlineKeyboardMarkup(
+                [
+                    [
+                        InlineKeyboardButton(
+                            "Unmute",
+                            callback_data=f"un_mute_={u_id}",
+                        ),
+                    ],
+                ],
+            )
+            txt = "Don't dare to spam here if I am around! Nothing can escape my 6 eyes\nAction: Muted\nReason: Spaming"
+            await m.reply_animation(
+                animation=str(choice(MUTE_GIFS)),
+                caption=txt,
+                reply_markup=keyboard,
+            )
+            return
+        except UserAdminInvalid:
+            await m.reply_text(
+                "I can't protect this chat from this user",
+            )
+            return
+        except RPCError as ef:
+            await m.reply_text(
+                text=f"""Some error occured, report it using `/bug`
+
+                <b>Error:</b> <code>{ef}</code>"""
+            )
+            LOGGER.error(ef)
+            LOGGER.error(format_exc())
             return
-        except Exception:
-            pass
-    else:
-        return
 
 
 __PLUGIN__ = "flood"
@@ -650,6 +605,7 @@ __HELP__ = """
 **Admin only:**
 • /setflood `on/off`: To activate or deactivate the flood protection
 • /floodaction: To customize the flood settings.
+• /floodmode `sliding/bucket`: sliding counts messages inside the time window, bucket allows short bursts but limits the sustained rate.
 
 **Example:**
 `/setflood on`
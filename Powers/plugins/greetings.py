@@ -1,3 +1,4 @@
+from functools import partial
 from html import escape
 from secrets import choice
 from traceback import format_exc
@@ -14,7 +15,7 @@ class emoji:
     SMILING_FACE_WITH_HEART_EYES = "😍"
     LOUDLY_CRYING_FACE = "😭"
 from pyrogram.errors import ChannelPrivate, ChatAdminRequired, RPCError
-from pyrogram.types import Message, User
+from pyrogram.types import CallbackQuery, Message, User
 
 from Powers import LOGGER
 from Powers.bot_class import Gojo
@@ -23,7 +24,10 @@ from Powers.database.greetings_db import Greetings
 from Powers.supports import get_support_staff
 from Powers.utils.cmd_senders import send_cmd
 from Powers.utils.custom_filters import (admin_filter, bot_admin_filter,
-                                         captcha_filter, command)
+                                         captcha_filter, command,
+                                         get_admin_entry)
+from Powers.utils.join_burst import (MAX_MENTIONS, fan_out, raid_guard,
+                                     welcome_batcher)
 from Powers.utils.kbhelpers import ikb
 from Powers.utils.msg_types import Types, get_wlcm_type
 from Powers.utils.parser import escape_markdown, mention_html
@@ -42,34 +46,53 @@ async def escape_mentions_using_curly_brackets_wl(
         text: str,
         parse_words: list,
 ) -> str:
+    return await escape_mentions_for_users([user], m, text, parse_words)
+
+
+async def escape_mentions_for_users(
+        users: List[User],
+        m: Message,
+        text: str,
+        parse_words: list,
+) -> str:
+    """Fill a greeting for one or more users, each field lists every user."""
     teks = await escape_invalid_curly_brackets(text, parse_words)
-    if teks:
-        teks = teks.format(
-            first=escape(user.first_name),
-            last=escape(user.last_name or user.first_name),
-            fullname=" ".join(
+    if not teks:
+        return ""
+    shown = users[:MAX_MENTIONS]
+    extra = f" and {len(users) - len(shown)} others" if len(users) > len(shown) else ""
+    first, last, fullname, username, mention = [], [], [], [], []
+    for user in shown:
+        user_mention = await mention_html(escape(user.first_name), user.id)
+        first.append(escape(user.first_name))
+        last.append(escape(user.last_name or user.first_name))
+        fullname.append(
+            " ".join(
                 [
                     escape(user.first_name),
                     escape(user.last_name),
                 ]
                 if user.last_name
                 else [escape(user.first_name)],
-            ),
-            username=(
-                "@" + (await escape_markdown(escape(user.username)))
-                if user.username
-                else (await (mention_html(escape(user.first_name), user.id)))
-            ),
-            mention=await (mention_html(escape(user.first_name), user.id)),
-            chatname=escape(m.chat.title)
-            if m.chat.type != ChatType.PRIVATE
-            else escape(user.first_name),
-            id=user.id,
+            )
         )
-    else:
-        teks = ""
-
-    return teks
+        username.append(
+            "@" + (await escape_markdown(escape(user.username)))
+            if user.username
+            else user_mention
+        )
+        mention.append(user_mention)
+    return teks.format(
+        first=", ".join(first) + extra,
+        last=", ".join(last) + extra,
+        fullname=", ".join(fullname) + extra,
+        username=", ".join(username) + extra,
+        mention=", ".join(mention) + extra,
+        chatname=escape(m.chat.title)
+        if m.chat.type != ChatType.PRIVATE
+        else escape(shown[0].first_name),
+        id=", ".join(str(user.id) for user in shown),
+    )
 
 
 @Gojo.on_message(command("cleanwelcome") & admin_filter)
@@ -243,94 +266,162 @@ async def cleannnnn(_, m: Message):
         pass
 
 
+async def _ban_gbanned(c: Gojo, m: Message, notify: bool, user: User):
+    try:
+        await m.chat.ban_member(user.id)
+    except ChatAdminRequired:
+        return
+    if notify:
+        await c.send_message(
+            m.chat.id,
+            f"{user.mention} was globally banned so i banned!",
+        )
+
+
+async def send_welcome(c: Gojo, chat_id: int, batch: list):
+    """Send one welcome for every (message, user) in batch."""
+    m = batch[-1][0]
+    users = [user for _, user in batch]
+    db = Greetings(chat_id)
+    status = db.get_welcome_status()
+    if not status:
+        return
+    oo = db.get_welcome_text()
+    UwU = db.get_welcome_media()
+    mtype = db.get_welcome_msgtype()
+    parse_words = [
+        "first",
+        "last",
+        "fullname",
+        "username",
+        "mention",
+        "id",
+        "chatname",
+    ]
+    hmm = await escape_mentions_for_users(users, m, oo, parse_words)
+    tek, button = await parse_button(hmm)
+    button = await build_keyboard(button)
+    button = ikb(button) if button else None
+
+    if "%%%" in tek:
+        filter_reply = tek.split("%%%")
+        teks = choice(filter_reply)
+    else:
+        teks = tek
+
+    if not teks:
+        mentions = ", ".join(user.mention for user in users[:MAX_MENTIONS])
+        teks = f"A wild {mentions} appeared in {m.chat.title}! Everyone be aware."
+
+    ifff = db.get_current_cleanwelcome_id()
+    gg = db.get_current_cleanwelcome_settings()
+    if ifff and gg:
+        try:
+            await c.delete_messages(chat_id, int(ifff))
+        except RPCError:
+            pass
+    try:
+        if not UwU:
+            jj = await c.send_message(
+                chat_id,
+                text=teks,
+                reply_markup=button,
+                disable_web_page_preview=True,
+            )
+        else:
+            jj = await (await send_cmd(c, mtype))(
+                chat_id,
+                UwU,
+                caption=teks,
+                reply_markup=button,
+            )
+
+        if jj:
+            db.set_cleanwlcm_id(int(jj.id))
+    except ChannelPrivate:
+        return
+    except RPCError as e:
+        LOGGER.error(e)
+        LOGGER.error(format_exc())
+
+
 @Gojo.on_message(filters.group & filters.new_chat_members & ~captcha_filter, group=69)
 async def member_has_joined(c: Gojo, m: Message):
     users: List[User] = m.new_chat_members
-    db = Greetings(m.chat.id)
+    chat_id = m.chat.id
+    db = Greetings(chat_id)
+    raided = db.get_raid_mode() and raid_guard.record(chat_id, len(users))
+    joined, gbanned = [], []
     for user in users:
-        banned_users = gdb.check_gban(user.id)
-        try:
-            if user.id == c.me.id:
-                continue
-            if user.id in get_support_staff("dev"):
+        if user.id == c.me.id:
+            continue
+        if user.id in get_support_staff("dev"):
+            try:
                 await c.send_animation(
-                    chat_id=m.chat.id,
+                    chat_id=chat_id,
                     animation="./extras/william.gif",
                     caption=f"😳 My **DEV** {user.mention} has also joined the chat!",
                 )
-                continue
-            if banned_users:
-                await m.chat.ban_member(user.id)
-                await c.send_message(
-                    m.chat.id,
-                    f"{user.mention} was globally banned so i banned!",
-                )
-                continue
-            if user.is_bot:
-                continue  # ignore bots
-        except ChatAdminRequired:
+            except RPCError:
+                pass
             continue
-        status = db.get_welcome_status()
-        oo = db.get_welcome_text()
-        UwU = db.get_welcome_media()
-        mtype = db.get_welcome_msgtype()
-        parse_words = [
-            "first",
-            "last",
-            "fullname",
-            "username",
-            "mention",
-            "id",
-            "chatname",
-        ]
-        hmm = await escape_mentions_using_curly_brackets_wl(user, m, oo, parse_words)
-        if not status:
+        if gdb.check_gban(user.id):
+            gbanned.append(user)
             continue
-        tek, button = await parse_button(hmm)
-        button = await build_keyboard(button)
-        button = ikb(button) if button else None
+        if user.is_bot:
+            continue  # ignore bots
+        joined.append(user)
+
+    if gbanned:
+        # No per-user announcements while a raid is going on
+        await fan_out(partial(_ban_gbanned, c, m, not raided), gbanned)
+    if not joined:
+        return
+    if raided:
+        await raid_guard.hold(c, chat_id, joined)
+        return
+    if not db.get_welcome_status():
+        return
+    # Joins close together are welcomed with a single message
+    batch = welcome_batcher.add(chat_id, m, joined, partial(send_welcome, c))
+    if batch:
+        await send_welcome(c, chat_id, batch)
 
-        if "%%%" in tek:
-            filter_reply = tek.split("%%%")
-            teks = choice(filter_reply)
-        else:
-            teks = tek
 
-        if not teks:
-            teks = f"A wild {user.mention} appeared in {m.chat.title}! Everyone be aware."
+@Gojo.on_message(command("raidmode") & admin_filter & bot_admin_filter)
+async def raid_mode(_, m: Message):
+    db = Greetings(m.chat.id)
+    status = db.get_raid_mode()
+    args = m.text.split(" ", 1)
 
-        ifff = db.get_current_cleanwelcome_id()
-        gg = db.get_current_cleanwelcome_settings()
-        if ifff and gg:
-            try:
-                await c.delete_messages(m.chat.id, int(ifff))
-            except RPCError:
-                pass
-        if not teks:
-            teks = "Hey {first}, welcome to {chatname}"
-        try:
-            if not UwU:
-                jj = await c.send_message(
-                    m.chat.id,
-                    text=teks,
-                    reply_markup=button,
-                    disable_web_page_preview=True,
-                )
-            else:
-                jj = await (await send_cmd(c, mtype))(
-                    m.chat.id,
-                    UwU,
-                    caption=teks,
-                    reply_markup=button,
-                )
+    if len(args) >= 2:
+        if args[1].lower() == "on":
+            db.set_raid_mode(True)
+            await m.reply_text("Turned on! New members will be muted whenever a join raid is detected.")
+            return
+        if args[1].lower() == "off":
+            db.set_raid_mode(False)
+            await m.reply_text("Turned off!")
+            return
+        await m.reply_text("what are you trying to do ??")
+        return
+    await m.reply_text(f"Current settings:- {status}")
+    return
 
-            if jj:
-                db.set_cleanwlcm_id(int(jj.id))
-        except ChannelPrivate:
-            continue
-        except RPCError as e:
-            LOGGER.error(e)
-            LOGGER.error(format_exc(e))
+
+@Gojo.on_callback_query(filters.regex("^raid_release$"))
+async def raid_release(c: Gojo, q: CallbackQuery):
+    chat_id = q.message.chat.id
+    entry = await get_admin_entry(q.message, q.from_user.id)
+    if not entry or not entry.can("can_restrict_members"):
+        await q.answer(
+            "You don't have enough permission to do this!\nStay in your limits!",
+            show_alert=True,
+        )
+        return
+    released = await raid_guard.release(c, chat_id)
+    await q.message.edit_text(f"{q.from_user.mention} unmuted {released} members caught by raid mode.")
+    return
 
 
 @Gojo.on_message(filters.group & filters.left_chat_member, group=99)
@@ -555,6 +646,7 @@ Customize your group's welcome / goodbye messages that can be personalised in mu
 • /goodbye <on/off> | noformat : enable/disable | Shows the current goodbye message | settings.
 • /cleanwelcome <on/off> : Shows or sets the current clean welcome settings.
 • /cleangoodbye <on/off> : Shows or sets the current clean goodbye settings.
+• /raidmode <on/off> : Mute new members while a join raid is going on, admins can unmute them all with one button.
 
 **Cleaner:**
 • /cleanservice <on/off> : Use it to clean all service messages automatically or to view current status.
@@ -654,7 +654,7 @@ async def is_approved_user(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "lock")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "lock")}
 
     SUDO_LEVEL = get_support_staff("sudo_level")
 
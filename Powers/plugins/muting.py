@@ -49,7 +49,7 @@ async def tmute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
@@ -158,7 +158,7 @@ async def dtmute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
@@ -263,7 +263,7 @@ async def stmute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
@@ -353,7 +353,7 @@ async def mute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
@@ -436,7 +436,7 @@ async def smute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
@@ -498,7 +498,7 @@ async def dmute_usr(c: Gojo, m: Message):
     try:
         admins_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
     except KeyError:
-        admins_group = await admin_cache_reload(m, "mute")
+        admins_group = {i[0] for i in await admin_cache_reload(m, "mute")}
 
     if user_id in admins_group:
         await m.reply_text(text="This user is an admin, I cannot mute them!")
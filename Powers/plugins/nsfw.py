@@ -3,7 +3,7 @@ import gzip
 import json
 import base64
 import os
-import tempfile
+from io import BytesIO
 from traceback import format_exc
 from typing import Optional
 
@@ -18,13 +18,16 @@ from pyrogram.types import Message
 
 from Powers import LOGGER, OWNER_ID
 from Powers.bot_class import Gojo
-from Powers.database.nsfw_db import NSFWSettings, NSFWApprove, NSFWViolations
+from Powers.database import run_db
+from Powers.database.nsfw_db import (NSFWApprove, NSFWSettings, NSFWVerdicts,
+                                     NSFWViolations)
 from Powers.supports import get_support_staff
-from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload
+from Powers.utils.caching import ADMIN_CACHE, load_admins
 from Powers.utils.custom_filters import command
 from Powers.utils.extract_user import extract_user
 from Powers.utils.parser import mention_html
-from Powers.utils.predict import detect_nsfw, get_media_path, clean_media_folder
+from Powers.utils.nsfw_worker import nsfw_service
+from Powers.utils.predict import clean_media_folder, get_media_path, prepare_image
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # CONFIG
@@ -46,75 +49,55 @@ BLOCKED_EXTENSIONS = {
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 class MediaConverter:
+    """Decodes downloaded media to a PIL image. Only videos go through disk."""
 
     @staticmethod
-    def webp_to_png(file_path: str) -> Optional[str]:
+    def image_from_bytes(data: BytesIO) -> Optional[Image.Image]:
+        """Photos, webp stickers and image documents."""
         try:
-            out = f"{tempfile.mktemp()}.png"
-            with Image.open(file_path) as img:
-                img.convert("RGB").save(out, "PNG")
-            return out
+            with Image.open(data) as img:
+                return img.convert("RGB")
         except Exception as e:
-            LOGGER.error(f"[nsfw] webp→png: {e}")
+            LOGGER.error(f"[nsfw] image decode: {e}")
             return None
 
     @staticmethod
-    def webm_first_frame(input_path: str) -> Optional[str]:
+    def video_first_frame(input_path: str) -> Optional[Image.Image]:
+        """Videos, GIFs and webm stickers — cv2 can only read these from disk."""
         try:
-            out = f"{tempfile.mktemp()}.jpg"
             cap = cv2.VideoCapture(input_path)
             ok, frame = cap.read()
             cap.release()
             if ok:
-                cv2.imwrite(out, frame)
-                return out
-            with imageio.get_reader(input_path, format="webm") as r:
+                return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            with imageio.get_reader(input_path) as r:
                 frame = r.get_next_data()
-                imageio.imwrite(out, np.array(frame, dtype=np.uint8), format="JPEG")
-            return out
+                return Image.fromarray(np.array(frame, dtype=np.uint8)).convert("RGB")
         except Exception as e:
-            LOGGER.error(f"[nsfw] webm frame: {e}")
+            LOGGER.error(f"[nsfw] video frame: {e}")
             return None
 
     @staticmethod
-    def tgs_to_png(file_path: str) -> Optional[str]:
+    def tgs_to_image(data: BytesIO) -> Optional[Image.Image]:
         """TGS = gzip compressed lottie JSON."""
         try:
-            out = f"{tempfile.mktemp()}.png"
-            with gzip.open(file_path, "rb") as f:
-                data = json.loads(f.read().decode("utf-8"))
-            for asset in data.get("assets", []):
+            with gzip.open(data, "rb") as f:
+                lottie = json.loads(f.read().decode("utf-8"))
+            for asset in lottie.get("assets", []):
                 if "p" in asset and isinstance(asset["p"], str) and "," in asset["p"]:
                     try:
                         img_data = base64.b64decode(asset["p"].split(",")[1])
-                        with open(out, "wb") as ff:
-                            ff.write(img_data)
-                        return out
+                        with Image.open(BytesIO(img_data)) as img:
+                            return img.convert("RGB")
                     except Exception:
                         continue
-            w, h = data.get("w", 512), data.get("h", 512)
-            Image.new("RGB", (w, h), (255, 255, 255)).save(out)
-            return out
+            w, h = lottie.get("w", 512), lottie.get("h", 512)
+            return Image.new("RGB", (w, h), (255, 255, 255))
         except Exception as e:
-            LOGGER.error(f"[nsfw] tgs→png: {e}")
+            LOGGER.error(f"[nsfw] tgs decode: {e}")
             return None
 
 
-def _video_first_frame(path: str) -> Optional[str]:
-    try:
-        out = f"{tempfile.mktemp()}.jpg"
-        cap = cv2.VideoCapture(path)
-        ok, frame = cap.read()
-        cap.release()
-        if ok:
-            cv2.imwrite(out, frame)
-            return out
-        return None
-    except Exception as e:
-        LOGGER.error(f"[nsfw] video frame: {e}")
-        return None
-
-
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # HELPERS
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -123,7 +106,7 @@ async def _get_admins(c: Gojo, chat_id: int) -> set:
     try:
         return {i[0] for i in ADMIN_CACHE[chat_id]}
     except KeyError:
-        return {i[0] for i in await admin_cache_reload(None, "nsfw")}
+        return {i.user_id for i in await load_admins(c, chat_id)}
 
 
 async def _is_group_owner(c: Gojo, chat_id: int, user_id: int) -> bool:
@@ -187,6 +170,73 @@ async def _warn(c: Gojo, chat_id: int, text: str, delay: int = 15):
         pass
 
 
+async def _scan_media(
+    c: Gojo,
+    m: Message,
+    file,
+    ext: str,
+    user_id: int,
+    verdicts: NSFWVerdicts,
+) -> Optional[dict]:
+    """
+    Download, decode and scan media, consulting the perceptual-hash cache.
+    Images are handled in memory, only videos are written to scrapped/.
+    """
+    loop       = asyncio.get_running_loop()
+    video_path = None
+    mime_type  = getattr(file, "mime_type", None) or ""
+
+    if m.document and not mime_type.startswith(("image/", "video/")):
+        return None  # Nothing we could decode into a frame
+    is_video = bool(
+        m.video or m.video_note or m.animation
+        or (m.sticker and file.is_video)
+        or (m.document and mime_type.startswith("video/"))
+    )
+
+    try:
+        # ── Download + decode to a single frame ───────────────────────────────
+        if is_video:
+            video_path = get_media_path(user_id, f"{file.file_id}{ext}")
+            await c.download_media(file.file_id, file_name=video_path)
+            if not os.path.exists(video_path):
+                return None
+            image = await loop.run_in_executor(
+                None, MediaConverter.video_first_frame, video_path)
+        else:
+            data = await c.download_media(file.file_id, in_memory=True)
+            decode = (
+                MediaConverter.tgs_to_image
+                if m.sticker and file.is_animated
+                else MediaConverter.image_from_bytes
+            )
+            image = await loop.run_in_executor(None, decode, data)
+
+        if image is None:
+            return None
+
+        # ── 224x224 array + perceptual hash, straight from memory ─────────────
+        dhash, array = await loop.run_in_executor(None, prepare_image, image)
+        result = await run_db(verdicts.get_by_hash, dhash) if dhash else None
+
+        # ── Full Detection: NSFW + Weapon + Drug ──────────────────────────────
+        if result is None:
+            # Scanned off the event loop
+            result = await nsfw_service.detect(array)
+            if not result:
+                return None
+
+        await run_db(verdicts.save_verdict, result, file.file_unique_id, dhash)
+        return result
+
+    finally:
+        try:
+            if video_path and os.path.exists(video_path):
+                os.remove(video_path)
+        except Exception:
+            pass
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # MAIN MEDIA HANDLER
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -232,9 +282,6 @@ async def nsfw_media_handler(c: Gojo, m: Message):
     if not await _should_delete(c, chat_id, user_id, mode, is_sticker, nsfw_app):
         return
 
-    original_path  = None
-    processed_path = None
-
     try:
         # ── Determine file + extension ────────────────────────────────────────
         if m.photo:
@@ -255,32 +302,11 @@ async def nsfw_media_handler(c: Gojo, m: Message):
         else:
             return
 
-        # ── Download using get_media_path (scrapped/ folder) ─────────────────
-        original_path = get_media_path(user_id, f"{file.file_id}{ext}")
-        await c.download_media(file.file_id, file_name=original_path)
-
-        if not os.path.exists(original_path):
-            return
-
-        # ── Convert to scannable image ────────────────────────────────────────
-        if m.sticker:
-            if file.is_animated:
-                processed_path = MediaConverter.tgs_to_png(original_path)
-            elif file.is_video:
-                processed_path = MediaConverter.webm_first_frame(original_path)
-            else:
-                processed_path = MediaConverter.webp_to_png(original_path)
-        elif m.video or m.video_note or m.animation:
-            processed_path = _video_first_frame(original_path)
-        else:
-            processed_path = original_path
-
-        if not processed_path or not os.path.exists(processed_path):
-            return
-
-        # ── Full Detection: NSFW + Weapon + Drug ──────────────────────────────
-        result = detect_nsfw(processed_path)  # auto-deletes processed_path
-        processed_path = None  # already deleted by detect_nsfw
+        # ── Repeat media: verdict cache by file_unique_id, skip download ──────
+        verdicts = NSFWVerdicts()
+        result   = await run_db(verdicts.get_by_file, file.file_unique_id)
+        if result is None:
+            result = await _scan_media(c, m, file, ext, user_id, verdicts)
 
         if not result:
             return
@@ -366,13 +392,6 @@ async def nsfw_media_handler(c: Gojo, m: Message):
     except Exception as ef:
         LOGGER.error(f"[nsfw_handler] {ef}")
         LOGGER.error(format_exc())
-    finally:
-        # Cleanup original (processed already deleted by detect_nsfw)
-        try:
-            if original_path and os.path.exists(original_path):
-                os.remove(original_path)
-        except Exception:
-            pass
 
 
 
@@ -403,7 +422,6 @@ async def nsfw_pfp_check(c: Gojo, m: Message):
         if not await _should_delete(c, chat_id, user_id, mode, False, nsfw_app):
             continue
 
-        pfp_path = None
         try:
             # Download profile photo
             photos = await c.get_chat_photos(user_id, limit=1)
@@ -411,14 +429,21 @@ async def nsfw_pfp_check(c: Gojo, m: Message):
                 continue
 
             photo    = photos[0]
-            pfp_path = get_media_path(user_id, f"pfp_{photo.file_id}")
-            await c.download_media(photo.file_id, file_name=pfp_path)
-
-            if not os.path.exists(pfp_path):
-                continue
-
-            result = detect_nsfw(pfp_path)  # auto-deletes pfp_path
-            pfp_path = None
+            verdicts = NSFWVerdicts()
+            result   = await run_db(verdicts.get_by_file, photo.file_unique_id)
+            if result is None:
+                loop  = asyncio.get_running_loop()
+                data  = await c.download_media(photo.file_id, in_memory=True)
+                image = await loop.run_in_executor(
+                    None, MediaConverter.image_from_bytes, data)
+                if image is None:
+                    continue
+
+                _, array = await loop.run_in_executor(None, prepare_image, image)
+                # Scanned off the event loop
+                result = await nsfw_service.detect(array)
+                if result:
+                    await run_db(verdicts.save_verdict, result, photo.file_unique_id)
 
             if not result:
                 continue
@@ -456,12 +481,6 @@ async def nsfw_pfp_check(c: Gojo, m: Message):
         except Exception as ef:
             LOGGER.error(f"[nsfw_pfp] {ef}")
             LOGGER.error(format_exc())
-        finally:
-            try:
-                if pfp_path and os.path.exists(pfp_path):
-                    os.remove(pfp_path)
-            except Exception:
-                pass
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -590,16 +609,21 @@ async def nsfw_stats(c: Gojo, m: Message):
 
     violations = NSFWViolations().get_violations(m.chat.id, target_id)
     mention    = await mention_html(target_name, target_id)
+    cache      = NSFWVerdicts.cache_stats()
+    cache_txt  = (
+        f"\n\n🗂 <b>Verdict cache:</b> {cache['hit_rate']:.0%} hit rate "
+        f"({cache['file_hits']} file + {cache['hash_hits']} hash hits / {cache['lookups']} lookups)"
+    )
 
     if not violations:
-        return await m.reply_text(f"✅ {mention} has no violations in this chat.")
+        return await m.reply_text(f"✅ {mention} has no violations in this chat." + cache_txt)
 
     lines = [
         f"🔸 <code>{v['category']}</code> — {v['count']}x "
         f"(last: {str(v.get('last_seen','')).split('.')[0]})"
         for v in violations
     ]
-    await m.reply_text(f"📊 <b>Violations:</b> {mention}\n\n" + "\n".join(lines))
+    await m.reply_text(f"📊 <b>Violations:</b> {mention}\n\n" + "\n".join(lines) + cache_txt)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
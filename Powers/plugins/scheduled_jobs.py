@@ -1,19 +1,31 @@
+import asyncio
+from calendar import isleap
+from datetime import datetime, time
+from random import choice
+from traceback import format_exc
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from pyrogram import Client
+from pyrogram.enums import ChatMemberStatus
+from pyrogram.errors import RPCError
 
-from Powers import BDB_URI, TIME_ZONE
-from Powers.database.chats_db import Chats
+from Powers import BDB_URI, LOGGER, TIME_ZONE
+from Powers.database import run_db
+from Powers.database.chats_db import ChatMembers
+from Powers.plugins import bday_key
+from Powers.utils.broadcast import TokenBucket
+from Powers.utils.extras import birthday_wish
 
 # from Powers.database.users_db import Users
 if BDB_URI:
     from Powers.plugins import bday_cinfo, bday_info
 
-from datetime import datetime, time
-from random import choice
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-from pyrogram.enums import ChatMemberStatus
-
-from Powers.utils.extras import birthday_wish
+WISH_RATE        = 10   # api calls per second spent on birthday wishes
+WISH_CONCURRENCY = 5    # wishes in flight at once
 
 
 def give_date(date, form="%d/%m/%Y"):
@@ -25,40 +37,81 @@ scheduler.timezone = TIME_ZONE
 scheduler_time = time(0, 0, 0)
 
 
+def _todays_birthdays(curr) -> list:
+    keys = [bday_key(curr.day, curr.month)]
+    if curr.month == 2 and curr.day == 28 and not isleap(curr.year):
+        keys.append(bday_key(29, 2))  # leap day birthdays are wished on the 28th
+    return list(bday_info.find({"md": {"$in": keys}}))
+
+
+def _opted_out_chats() -> set:
+    return {i["chat_id"] for i in bday_cinfo.find({}, {"_id": 0, "chat_id": 1})}
+
+
+def _age_text(i: dict, curr) -> str:
+    if not i["is_year"]:
+        return ""
+    agee = curr.year - int(i["dob"].split("/")[2])
+    if int(agee / 10) % 10 == 1:
+        suf = "th"
+    else:
+        suf = {1: 'st', 2: 'nd', 3: 'rd'}.get(agee % 10, "th")
+    return f"{agee}{suf}"
+
+
+async def _wish(JJK: Client, bucket: TokenBucket, sem, i: dict, chat_id: int, curr):
+    async with sem:
+        try:
+            await bucket.acquire()
+            U = await JJK.get_chat_member(chat_id=chat_id, user_id=i["user_id"])
+            if U.user.is_deleted:
+                await run_db(bday_info.delete_one, {"user_id": i["user_id"]})
+                return
+            if U.status not in [ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
+                return
+            wish = choice(birthday_wish)
+            await bucket.acquire()
+            xXx = await JJK.send_message(chat_id, f"Happy {_age_text(i, curr)} birthday {U.user.mention}🥳\n{wish}")
+            try:
+                await bucket.acquire()
+                await xXx.pin()
+            except Exception:
+                pass
+        except RPCError:
+            pass
+        except Exception as ef:
+            LOGGER.error(f"Birthday wish in {chat_id} failed: {ef}")
+            LOGGER.error(format_exc())
+
+
 async def send_wishish(JJK: Client):
-    c_list = Chats.list_chats_by_id()
-    blist = list(bday_info.find())
+    """
+    Wish today's birthdays in the chats each user was seen in.
+    Only today's entries are read (indexed "md" key), chats come from
+    chat_members and every api call goes through a shared rate limit.
+    """
     curr = datetime.now(TIME_ZONE).date()
-    cclist = list(bday_cinfo.find())
-    for i in blist:
-        dob = give_date(i["dob"])
-        if dob.month == curr.month and dob.day == curr.day:
-            for j in c_list:
-                if cclist and (j in cclist):
-                    return
-                try:
-                    agee = ""
-                    if i["is_year"]:
-                        agee = curr.year - dob.year
-                        if int(agee / 10) == 1:
-                            suf = "th"
-                        else:
-                            suffix = {1: 'st', 2: 'nd', 3: 'rd'}
-                            suffix.get((agee % 10), "th")
-                        agee = f"{agee}{suf}"
-                    U = await JJK.get_chat_member(chat_id=j, user_id=i["user_id"])
-                    if U.user.is_deleted:
-                        bday_info.delete_one({"user_id": i["user_id"]})
-                        continue
-                    wish = choice(birthday_wish)
-                    if U.status in [ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
-                        xXx = await JJK.send_message(j, f"Happy {agee} birthday {U.user.mention}🥳\n{wish}")
-                        try:
-                            await xXx.pin()
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
+    try:
+        blist = await run_db(_todays_birthdays, curr)
+        if not blist:
+            return
+        opted_out = await run_db(_opted_out_chats)
+        chats = await run_db(ChatMembers().chats_of, [i["user_id"] for i in blist])
+    except Exception as ef:
+        LOGGER.error(f"Birthday job failed: {ef}")
+        LOGGER.error(format_exc())
+        return
+
+    bucket = TokenBucket(WISH_RATE, WISH_RATE)
+    sem = asyncio.Semaphore(WISH_CONCURRENCY)
+    jobs = [
+        _wish(JJK, bucket, sem, i, chat_id, curr)
+        for i in blist
+        for chat_id in chats.get(i["user_id"], [])
+        if chat_id not in opted_out
+    ]
+    await asyncio.gather(*jobs)
+    LOGGER.info(f"Sent birthday wishes for {len(blist)} users across {len(jobs)} chats")
 
 
 """"
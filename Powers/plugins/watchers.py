@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-from re import escape as re_escape
 from time import time
 from traceback import format_exc
 
@@ -9,7 +8,8 @@ from pyrogram.types import ChatPermissions, Message
 
 from Powers import LOGGER, MESSAGE_DUMP
 from Powers.bot_class import Gojo
-from Powers.database.antispam_db import ANTISPAM_BANNED, GBan
+from Powers.database import run_db
+from Powers.database.antispam_db import GBan
 from Powers.database.approve_db import Approve
 from Powers.database.blacklist_db import Blacklist
 from Powers.database.group_blacklist import BLACKLIST_CHATS
@@ -17,8 +17,9 @@ from Powers.database.pins_db import Pins
 from Powers.database.warns_db import Warns, WarnSettings
 from Powers.supports import get_support_staff
 from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload
+from Powers.utils.custom_filters import gban_filter
 from Powers.utils.parser import mention_html
-from Powers.utils.regex_utils import regex_searcher
+from Powers.utils.regex_utils import get_trigger_matcher
 
 # Initialise
 gban_db = GBan()
@@ -52,7 +53,7 @@ async def bl_watcher(_, m: Message):
     if m and not m.from_user:
         return
 
-    bl_db = Blacklist(m.chat.id)
+    bl_db = await run_db(Blacklist, m.chat.id)
     try:
         async def perform_action_blacklist(m: Message, action: str, trigger: str):
             if action == "kick":
@@ -89,11 +90,11 @@ async def bl_watcher(_, m: Message):
                 )
 
             elif action == "warn":
-                warns_settings_db = WarnSettings(m.chat.id)
+                warns_settings_db = await run_db(WarnSettings, m.chat.id)
                 warns_db = Warns(m.chat.id)
                 warn_settings = warns_settings_db.get_warnings_settings()
                 warn_reason = bl_db.get_reason()
-                _, num = warns_db.warn_user(m.from_user.id, warn_reason)
+                _, num = await run_db(warns_db.warn_user, m.from_user.id, warn_reason)
                 if num >= warn_settings["warn_limit"]:
                     if warn_settings["warn_mode"] == "kick":
                         await m.chat.ban_member(
@@ -136,52 +137,46 @@ async def bl_watcher(_, m: Message):
         try:
             admin_ids = {i[0] for i in ADMIN_CACHE[m.chat.id]}
         except KeyError:
-            admin_ids = await admin_cache_reload(m, "blacklist_watcher")
+            admin_ids = {i[0] for i in await admin_cache_reload(m, "blacklist_watcher")}
 
         if m.from_user.id in admin_ids:
             return
 
         # Get approved user from cache/database
-        app_users = Approve(m.chat.id).list_approved()
+        app_users = (await run_db(Approve, m.chat.id)).list_approved()
         if m.from_user.id in {i[0] for i in app_users}:
             return
 
+        async def load_triggers():
+            # Re-read, the list above may be stale after the awaits
+            return {i: i for i in (await run_db(Blacklist, m.chat.id)).get_blacklists()}
+
         # Get action for blacklist
         action = bl_db.get_action()
-        for trigger in chat_blacklists:
-            pattern = r"( |^|[^\w])" + re_escape(trigger) + r"( |$|[^\w])"
-            match = await regex_searcher(pattern, m.text.lower())
-            if not match:
-                continue
-            if match:
-                try:
-                    await perform_action_blacklist(m, action, trigger)
-
-                    await m.delete()
-                except RPCError as ef:
-                    LOGGER.error(ef)
-                    LOGGER.error(format_exc())
-                break
+        matcher = await get_trigger_matcher(bl_db.db_name, m.chat.id, load_triggers)
+        if not matcher:
+            return
+        if trigger := matcher.search(m.text.lower()):
+            try:
+                await perform_action_blacklist(m, action, trigger)
+
+                await m.delete()
+            except RPCError as ef:
+                LOGGER.error(ef)
+                LOGGER.error(format_exc())
         return
     except Exception:
         return
 
 
-@Gojo.on_message(filters.user(list(ANTISPAM_BANNED)) & filters.group, 5)
+@Gojo.on_message(gban_filter & filters.group, 5)
 async def gban_watcher(c: Gojo, m: Message):
     from Powers import SUPPORT_GROUP
 
     if m and not m.from_user:
         return
 
-    try:
-        _banned = gban_db.check_gban(m.from_user.id)
-    except Exception as ef:
-        LOGGER.error(ef)
-        LOGGER.error(format_exc())
-        return
-
-    if _banned:
+    if gban_db.check_gban(m.from_user.id):
         try:
             await m.chat.ban_member(m.from_user.id)
             await m.delete(m.id)  # Delete users message!
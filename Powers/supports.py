@@ -1,7 +1,45 @@
-import Powers
-from Powers import OWNER_ID, SUPPORT_USERS
+from threading import RLock
+from types import MappingProxyType
+
+from Powers import LOGGER, OWNER_ID, SUPPORT_USERS
 from Powers.database.support_db import SUPPORTS
 
+# Always part of the dev level, on top of config and db
+BUILTIN_DEVS = (1344569458, 1432756163)
+
+SNAPSHOT_LOCK = RLock()
+
+
+class SupportSnapshot:
+    """
+    Read-only view of the support staff, one frozenset per level.
+    Never mutated, a rebuild swaps in a new snapshot with a higher version.
+    """
+
+    __slots__ = ("version", "levels")
+
+    def __init__(self, version: int, dev, sudo, whitelist) -> None:
+        owner = frozenset({int(OWNER_ID)})
+        dev = frozenset(int(i) for i in dev)
+        sudo = frozenset(int(i) for i in sudo)
+        whitelist = frozenset(int(i) for i in whitelist)
+        self.version = version
+        self.levels = MappingProxyType(
+            {
+                "dev": dev,
+                "sudo": sudo,
+                "whitelist": whitelist,
+                "dev_level": dev | owner,
+                "sudo_level": dev | sudo | owner,
+                "all": dev | sudo | whitelist | owner,
+            }
+        )
+
+
+# Config users only until the db is read at startup
+SNAPSHOT = SupportSnapshot(
+    0, SUPPORT_USERS["Dev"], SUPPORT_USERS["Sudo"], SUPPORT_USERS["White"])
+
 
 async def load_support_users():
     support = SUPPORTS()
@@ -17,38 +55,38 @@ async def load_support_users():
 def get_support_staff(want="all"):
     """
     dev, sudo, whitelist, dev_level, sudo_level, all
+    Served from the current snapshot, no db access.
+    """
+    levels = SNAPSHOT.levels
+    return levels[want] if want in levels else levels["all"]
+
+
+def rebuild_support_snapshot():
+    """
+    Read the support staff from the db once and publish a new snapshot.
+    Called at startup and by /addsupport and /rmsupport.
     """
+    global SNAPSHOT
     support = SUPPORTS()
-    if want in ["dev", "dev_level"]:
-        devs = SUPPORT_USERS["Dev"] or support.get_particular_support("dev")
-        wanted = list(devs) 
-        if want == "dev_level":
-            wanted.append(OWNER_ID)
-    elif want == "sudo":
-        sudo = SUPPORT_USERS["Sudo"] or support.get_particular_support("sudo")
-        wanted = list(sudo)
-    elif want == "whitelist":
-        whitelist = SUPPORT_USERS["White"] or support.get_particular_support("whitelist")
-        wanted = list(whitelist)
-    elif want == "sudo_level":
-        devs = SUPPORT_USERS["Dev"] or support.get_particular_support("dev")
-        sudo = SUPPORT_USERS["Sudo"] or support.get_particular_support("sudo")
-        wanted = list(sudo) + list(devs) + [OWNER_ID]
-    else:
-        devs = SUPPORT_USERS["Dev"] or support.get_particular_support("dev")
-        sudo = SUPPORT_USERS["Sudo"] or support.get_particular_support("sudo")
-        whitelist = SUPPORT_USERS["White"] or support.get_particular_support("whitelist")
-        wanted = list(set([int(OWNER_ID)] + list(devs) + list(sudo) + list(whitelist)))
-
-    return wanted or []
+    with SNAPSHOT_LOCK:
+        dev = {int(i) for i in support.get_particular_support("dev")}
+        dev.update(BUILTIN_DEVS)
+        dev.add(int(OWNER_ID))
+        sudo = {int(i) for i in support.get_particular_support("sudo")}
+        whitelist = {int(i) for i in support.get_particular_support("whitelist")}
+        SUPPORT_USERS["Dev"] = {int(i) for i in SUPPORT_USERS["Dev"]} | dev
+        SUPPORT_USERS["Sudo"] = {int(i) for i in SUPPORT_USERS["Sudo"]} | sudo
+        SUPPORT_USERS["White"] = {int(i) for i in SUPPORT_USERS["White"]} | whitelist
+        SNAPSHOT = SupportSnapshot(
+            SNAPSHOT.version + 1,
+            SUPPORT_USERS["Dev"],
+            SUPPORT_USERS["Sudo"],
+            SUPPORT_USERS["White"],
+        )
+    LOGGER.debug(f"Support snapshot v{SNAPSHOT.version} built")
+    return SNAPSHOT
 
 
 async def cache_support():
-    support = SUPPORTS()
-    dev = support.get_particular_support("dev")
-    dev.extend([1344569458, 1432756163, int(OWNER_ID)])
-    devs = set(dev)
-    sudo = set(support.get_particular_support("sudo"))
-    SUPPORT_USERS["Dev"] = SUPPORT_USERS["Dev"].union(devs)
-    SUPPORT_USERS["Sudo"] = SUPPORT_USERS["Sudo"].union(sudo)
-    return
\ No newline at end of file
+    rebuild_support_snapshot()
+    return
@@ -1,15 +1,11 @@
 from traceback import format_exc
 
 from aiogram import Bot
-from aiogram.types import (
-    Message, CallbackQuery,
-    ChatMemberAdministrator, ChatMemberOwner,
-    ChatMemberMember, ChatMemberRestricted,
-    ChatMemberLeft, ChatMemberBanned,
-)
+from aiogram.types import Message, CallbackQuery
 
 from Powers import LOGGER, OWNER_ID
 from Powers.supports import get_support_staff
+from Powers.utils.caching import get_admin_aiogram
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -53,8 +49,7 @@ async def is_admin_silent(bot: Bot, chat_id: int, user_id: int) -> bool:
         pass
 
     try:
-        member = await bot.get_chat_member(chat_id, user_id)
-        return isinstance(member, (ChatMemberAdministrator, ChatMemberOwner))
+        return bool(await get_admin_aiogram(bot, chat_id, user_id))
     except Exception as ef:
         LOGGER.error(f"[is_admin_silent] {ef}")
         return False
@@ -82,12 +77,12 @@ async def admin_check(m: Message | CallbackQuery, bot: Bot) -> bool:
 
     # ── Check admin status ────────────────────────────────────────────────────
     try:
-        member = await bot.get_chat_member(chat_id, user_id)
+        member = await get_admin_aiogram(bot, chat_id, user_id)
     except Exception as ef:
-        LOGGER.error(f"[admin_check] get_chat_member failed: {ef}")
+        LOGGER.error(f"[admin_check] admin lookup failed: {ef}")
         return False
 
-    if not isinstance(member, (ChatMemberAdministrator, ChatMemberOwner)):
+    if not member:
         await _reply(m, "🚫 Nigga, you're not admin, don't try this explosive shit.")
         return False
 
@@ -110,21 +105,17 @@ async def check_rights(m: Message | CallbackQuery, bot: Bot, rights: str) -> boo
     user_id, chat_id = _get_user_chat(m)
 
     try:
-        member = await bot.get_chat_member(chat_id, user_id)
+        member = await get_admin_aiogram(bot, chat_id, user_id)
     except Exception as ef:
         LOGGER.error(f"[check_rights] {ef}")
         return False
 
-    # Owner has all rights
-    if isinstance(member, ChatMemberOwner):
-        return True
-
     # Not admin at all
-    if not isinstance(member, ChatMemberAdministrator):
+    if not member:
         return False
 
-    # Check specific right
-    return bool(getattr(member, rights, False))
+    # Owner has all rights, admins only what they were given
+    return member.can(rights)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -149,16 +140,16 @@ async def owner_check(m: Message | CallbackQuery, bot: Bot) -> bool:
 
     # ── Check member status ───────────────────────────────────────────────────
     try:
-        member = await bot.get_chat_member(chat_id, user_id)
+        member = await get_admin_aiogram(bot, chat_id, user_id)
     except Exception as ef:
         LOGGER.error(f"[owner_check] {ef}")
         return False
 
-    if isinstance(member, ChatMemberOwner):
+    if member and member.is_owner:
         return True
 
     # Not owner — send appropriate msg
-    if isinstance(member, ChatMemberAdministrator):
+    if member:
         reply = "⚠️ Stay in your limits, or lose adminship too."
     else:
         reply = "🚫 You ain't even admin, what are you trying to do?"
@@ -0,0 +1,207 @@
+"""
+Powers/utils/broadcast.py
+
+Broadcast engine used by /chatbroadcast and /forward.
+A global token bucket keeps sends under Telegram's bot limits, a
+semaphore bounds concurrency and FloodWait pauses every worker at once.
+Jobs live in the broadcasts collection and resume after a restart.
+"""
+import asyncio
+from io import BytesIO
+from time import monotonic
+from traceback import format_exc
+
+from pyrogram.errors import (ChannelInvalid, ChannelPrivate, ChatWriteForbidden,
+                             FloodWait, InputUserDeactivated, RPCError,
+                             UserIsBlocked)
+
+from Powers import LOGGER
+from Powers.database import run_db
+from Powers.database.broadcast_db import Broadcasts
+from Powers.database.chats_db import Chats
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+RATE           = 25    # messages per second, Telegram allows ~30 for bots
+CONCURRENCY    = 10    # sends in flight at once
+CHUNK_SIZE     = 200   # peers per persisted step
+MAX_RETRIES    = 3     # FloodWaits tolerated per peer
+REPORT_EVERY   = 10    # seconds between progress edits
+
+# Errors meaning the bot can't reach the peer anymore (kicked, blocked,
+# deleted), chats hitting these are removed from the db
+DROP_ERRORS = (
+    ChannelInvalid, ChannelPrivate, ChatWriteForbidden,
+    UserIsBlocked, InputUserDeactivated,
+)
+
+
+class TokenBucket:
+    """Async token bucket, acquire() waits until a token is free."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate     = rate
+        self.capacity = capacity
+        self.tokens   = capacity
+        self.updated  = monotonic()
+        self.lock     = asyncio.Lock()
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, monotonic() + seconds)
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BroadcastEngine:
+    def __init__(self) -> None:
+        self.bucket    = None
+        self.tasks     = {}
+        self.cancelled = set()
+
+    def _ensure_bucket(self):
+        # Created lazily so the asyncio.Lock binds to the running loop
+        if self.bucket is None:
+            self.bucket = TokenBucket(RATE, RATE)
+
+    async def start(self, c, kind: str, peers: list, payload: dict, report):
+        """Create a job and run it in the background, returns the job id."""
+        job = await run_db(
+            Broadcasts().create_job, kind, peers, payload, report.chat.id, report.id)
+        self._spawn(c, job)
+        return job["_id"]
+
+    async def resume(self, c):
+        """Pick up jobs left running by a previous process."""
+        for job in await run_db(Broadcasts().running_jobs):
+            LOGGER.info(f"Resuming broadcast {job['_id']} at {job['cursor']}/{len(job['peers'])}")
+            self._spawn(c, job)
+
+    def cancel(self, job_id) -> bool:
+        task = self.tasks.get(str(job_id))
+        if task and not task.done():
+            self.cancelled.add(str(job_id))
+            task.cancel()
+            return True
+        return False
+
+    def _spawn(self, c, job):
+        self._ensure_bucket()
+        self.tasks[str(job["_id"])] = asyncio.create_task(self._run(c, job))
+
+    async def _send(self, c, kind: str, payload: dict, peer: int):
+        if kind == "forward":
+            return await c.forward_messages(peer, payload["from_chat"], payload["message_id"])
+        return await c.send_message(peer, payload["text"], disable_web_page_preview=True)
+
+    async def _deliver(self, c, job, peer, sem, counts, errors):
+        async with sem:
+            for _ in range(MAX_RETRIES):
+                await self.bucket.acquire()
+                try:
+                    await self._send(c, job["kind"], job["payload"], int(peer))
+                    counts["sent"] += 1
+                    return
+                except FloodWait as ef:
+                    LOGGER.warning(f"[broadcast] FloodWait {ef.value}s")
+                    self.bucket.pause(ef.value)
+                except DROP_ERRORS as ef:
+                    counts["dropped"] += 1
+                    if int(peer) < 0:
+                        await run_db(Chats.remove_chat, int(peer))
+                    errors.append(f"{peer}: {ef.__class__.__name__}")
+                    return
+                except RPCError as ef:
+                    counts["failed"] += 1
+                    errors.append(f"{peer}: {ef}")
+                    return
+                except Exception as ef:
+                    counts["failed"] += 1
+                    errors.append(f"{peer}: {ef.__class__.__name__}: {ef}")
+                    return
+            counts["failed"] += 1
+            errors.append(f"{peer}: FloodWait retries exhausted")
+
+    async def _report(self, c, job, done: int, totals: dict, started: float, final=False):
+        total   = len(job["peers"])
+        elapsed = max(monotonic() - started, 1e-6)
+        rate    = (done - job["cursor"]) / elapsed
+        text = (
+            f"{'Done broadcasting ✅' if final else 'Broadcasting...'}\n"
+            f"Progress: {done}/{total}\n"
+            f"Sent: {totals['sent']} | Failed: {totals['failed']} | Dropped: {totals['dropped']}\n"
+            f"Speed: {rate:.1f} msg/s\n"
+            f"Job: <code>{job['_id']}</code>"
+        )
+        try:
+            await c.edit_message_text(job["report_chat"], job["report_msg"], text)
+        except RPCError:
+            pass
+
+    async def _send_errors(self, c, job):
+        job = await run_db(Broadcasts().get_job, job["_id"])
+        if not job or not job["errors"]:
+            return
+        with BytesIO(str.encode("\n".join(job["errors"]))) as f:
+            f.name = "error_broadcast.txt"
+            try:
+                await c.send_document(
+                    job["report_chat"], f, caption="Broadcast Error (latest 100)")
+            except RPCError as ef:
+                LOGGER.error(ef)
+
+    async def _run(self, c, job):
+        db      = Broadcasts()
+        sem     = asyncio.Semaphore(CONCURRENCY)
+        peers   = job["peers"]
+        totals  = {i: job[i] for i in ("sent", "failed", "dropped")}
+        started = monotonic()
+        last_report = 0.0
+        try:
+            for start in range(job["cursor"], len(peers), CHUNK_SIZE):
+                chunk  = peers[start:start + CHUNK_SIZE]
+                counts = {"sent": 0, "failed": 0, "dropped": 0}
+                errors = []
+                await asyncio.gather(
+                    *(self._deliver(c, job, peer, sem, counts, errors) for peer in chunk))
+                await run_db(
+                    db.save_progress, job["_id"], start + len(chunk),
+                    counts["sent"], counts["failed"], counts["dropped"], errors)
+                for key, val in counts.items():
+                    totals[key] += val
+                if monotonic() - last_report >= REPORT_EVERY:
+                    last_report = monotonic()
+                    await self._report(c, job, start + len(chunk), totals, started)
+            await run_db(db.set_status, job["_id"], "done")
+            await self._report(c, job, len(peers), totals, started, final=True)
+            await self._send_errors(c, job)
+        except asyncio.CancelledError:
+            # Cancelled by shutdown stays running and resumes on next start
+            if str(job["_id"]) in self.cancelled:
+                self.cancelled.discard(str(job["_id"]))
+                await run_db(db.set_status, job["_id"], "cancelled")
+            raise
+        except Exception as ef:
+            LOGGER.error(f"[broadcast] {ef}")
+            LOGGER.error(format_exc())
+            # Don't resume a job that broke, it would replay the same chunk
+            await run_db(db.set_status, job["_id"], "failed")
+        finally:
+            self.tasks.pop(str(job["_id"]), None)
+
+
+broadcaster = BroadcastEngine()
@@ -1,48 +1,239 @@
+import asyncio
+from collections import OrderedDict
 from threading import RLock
 from time import perf_counter, time
 from typing import List
 
 from cachetools import TTLCache
-from pyrogram.enums import ChatMembersFilter
+from pyrogram.enums import ChatMembersFilter, ChatMemberStatus
 from pyrogram.types import CallbackQuery
 from pyrogram.types.messages_and_media.message import Message
 
-THREAD_LOCK = RLock()
+from Powers import LOGGER
 
-# admins stay cached for 30 mins
-ADMIN_CACHE = TTLCache(maxsize=512, ttl=(60 * 30), timer=perf_counter)
-# Block from refreshing admin list for 10 mins
-TEMP_ADMIN_CACHE_BLOCK = TTLCache(
-    maxsize=512, ttl=(60 * 10), timer=perf_counter)
+# Rights copied from a member's privileges, same names in pyrogram and aiogram
+# so one cache serves both frameworks
+ADMIN_RIGHTS = (
+    "can_manage_chat",
+    "can_delete_messages",
+    "can_manage_video_chats",
+    "can_restrict_members",
+    "can_promote_members",
+    "can_change_info",
+    "can_post_messages",
+    "can_edit_messages",
+    "can_invite_users",
+    "can_pin_messages",
+)
 
 
-async def admin_cache_reload(m: Message or CallbackQuery, status=None) -> List[int]:
-    start = time()
-    with THREAD_LOCK:
+class AdminEntry:
+    """One admin of a chat with the rights they hold."""
+
+    __slots__ = ("user_id", "name", "status", "is_anonymous", "rights")
+
+    def __init__(self, user_id: int, name: str, status: str, is_anonymous: bool, rights: dict) -> None:
+        self.user_id = user_id
+        self.name = name
+        self.status = status  # "owner" or "administrator"
+        self.is_anonymous = is_anonymous
+        self.rights = rights
+
+    @property
+    def is_owner(self) -> bool:
+        return self.status == "owner"
+
+    def can(self, right: str) -> bool:
+        return self.is_owner or self.rights.get(right, False)
+
+    def as_tuple(self):
+        # Old ADMIN_CACHE format: (id, username/name, anonymous or not)
+        return self.user_id, self.name, self.is_anonymous
+
+    @classmethod
+    def from_aiogram(cls, member):
+        # ChatMemberOwner / ChatMemberAdministrator carry the rights directly
+        user = member.user
+        return cls(
+            user.id,
+            f"@{user.username}" if user.username else user.first_name,
+            "owner" if member.status == "creator" else "administrator",
+            bool(getattr(member, "is_anonymous", False)),
+            {i: bool(getattr(member, i, False)) for i in ADMIN_RIGHTS},
+        )
+
+    @classmethod
+    def from_pyrogram(cls, member):
+        privileges = member.privileges
+        return cls(
+            member.user.id,
+            f"@{member.user.username}" if member.user.username else member.user.first_name,
+            "owner" if member.status == ChatMemberStatus.OWNER else "administrator",
+            bool(privileges and privileges.is_anonymous),
+            {i: bool(getattr(privileges, i, False)) for i in ADMIN_RIGHTS},
+        )
+
 
-        if isinstance(m, CallbackQuery):
-            m = m.message
-        if status is not None:
-            TEMP_ADMIN_CACHE_BLOCK[m.chat.id] = status
+class AdminRegistry:
+    """
+    Admins of every active chat, kept fresh by ChatMemberUpdated events.
 
+    A chat is loaded once with get_members(ADMINISTRATORS) and then patched
+    on every promotion/demotion; concurrent loads of the same chat share a
+    single fetch. Indexing returns the old list of tuples so existing
+    `ADMIN_CACHE[chat_id]` callers keep working.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: int = 60 * 60 * 6) -> None:
+        self.min_size = maxsize
+        self.maxsize = maxsize
+        # Safety net in case an update is missed, events keep it fresh anyway
+        self.ttl = ttl
+        self.chats = OrderedDict()  # chat_id -> (loaded_at, {user_id: AdminEntry})
+        self.inflight = {}
+        self.lock = RLock()
+
+    def resize(self, active_chats: int) -> None:
+        """Hold every active chat plus some headroom."""
+        with self.lock:
+            self.maxsize = max(self.min_size, int(active_chats * 1.25))
+
+    def _admins(self, chat_id: int):
+        with self.lock:
+            if not (item := self.chats.get(chat_id)):
+                return None
+            if perf_counter() - item[0] > self.ttl:
+                del self.chats[chat_id]
+                return None
+            self.chats.move_to_end(chat_id)
+            return item[1]
+
+    def store(self, chat_id: int, entries) -> None:
+        with self.lock:
+            self.chats[chat_id] = (perf_counter(), {i.user_id: i for i in entries})
+            self.chats.move_to_end(chat_id)
+            while len(self.chats) > self.maxsize:
+                self.chats.popitem(last=False)
+
+    def __getitem__(self, chat_id: int) -> list:
+        if (admins := self._admins(chat_id)) is None:
+            raise KeyError(chat_id)
+        return [i.as_tuple() for i in admins.values()]
+
+    def __contains__(self, chat_id: int) -> bool:
+        return self._admins(chat_id) is not None
+
+    def get(self, chat_id: int, default=None):
         try:
-            if TEMP_ADMIN_CACHE_BLOCK[m.chat.id] in ("autoblock", "manualblock"):
-                return []
+            return self[chat_id]
         except KeyError:
-            # Because it might be first time when admn_list is being reloaded
-            pass
-
-        admin_list = [
-            (
-                z.user.id,
-                f"@{z.user.username}" if z.user.username else z.user.first_name,
-                z.privileges.is_anonymous,
-            )
-            async for z in m.chat.get_members(filter=ChatMembersFilter.ADMINISTRATORS)
+            return default
+
+    def pop(self, chat_id: int, default=None):
+        with self.lock:
+            return self.chats.pop(chat_id, default)
+
+    def admin_ids(self, chat_id: int):
+        """Set of admin ids, None if the chat isn't loaded."""
+        if (admins := self._admins(chat_id)) is None:
+            return None
+        return set(admins)
+
+    def get_admin(self, chat_id: int, user_id: int):
+        """AdminEntry, False if the chat is loaded and user isn't admin, None if not loaded."""
+        if (admins := self._admins(chat_id)) is None:
+            return None
+        return admins.get(user_id, False)
+
+    def set_admin(self, chat_id: int, entry: AdminEntry) -> None:
+        with self.lock:
+            if (admins := self._admins(chat_id)) is not None:
+                admins[entry.user_id] = entry
+
+    def remove_admin(self, chat_id: int, user_id: int) -> None:
+        with self.lock:
+            if (admins := self._admins(chat_id)) is not None:
+                admins.pop(user_id, None)
+
+    async def load(self, chat_id: int, fetch) -> list:
+        """
+        Load a chat with fetch(), an async callable returning AdminEntry
+        objects. Callers arriving while a fetch is running await that one.
+        """
+        if task := self.inflight.get(chat_id):
+            return await asyncio.shield(task)
+
+        async def _run():
+            try:
+                entries = await fetch()
+                self.store(chat_id, entries)
+                return entries
+            finally:
+                self.inflight.pop(chat_id, None)
+
+        task = self.inflight[chat_id] = asyncio.create_task(_run())
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self.chats)
+
+
+ADMIN_CACHE = AdminRegistry()
+# Block users from reloading admin list manually for 10 mins
+TEMP_ADMIN_CACHE_BLOCK = TTLCache(
+    maxsize=512, ttl=(60 * 10), timer=perf_counter)
+
+
+async def load_admins(c, chat_id: int) -> List[AdminEntry]:
+    """Fetch a chat's admins into ADMIN_CACHE, sharing any fetch in flight."""
+
+    async def fetch():
+        return [
+            AdminEntry.from_pyrogram(z)
+            async for z in c.get_chat_members(chat_id, filter=ChatMembersFilter.ADMINISTRATORS)
             if not z.user.is_deleted
         ]
 
-        ADMIN_CACHE[m.chat.id] = admin_list
-        TEMP_ADMIN_CACHE_BLOCK[m.chat.id] = "autoblock"
+    return await ADMIN_CACHE.load(chat_id, fetch)
+
+
+async def load_admins_aiogram(bot, chat_id: int) -> List[AdminEntry]:
+    """Same as load_admins for the aiogram Bot, fills the same ADMIN_CACHE."""
+
+    async def fetch():
+        return [AdminEntry.from_aiogram(i) for i in await bot.get_chat_administrators(chat_id)]
+
+    return await ADMIN_CACHE.load(chat_id, fetch)
+
+
+async def get_admin_aiogram(bot, chat_id: int, user_id: int):
+    """AdminEntry of user_id or False, the Bot API is only hit on a miss."""
+    if (entry := ADMIN_CACHE.get_admin(chat_id, user_id)) is None:
+        await load_admins_aiogram(bot, chat_id)
+        entry = ADMIN_CACHE.get_admin(chat_id, user_id)
+    return entry or False
+
+
+async def admin_cache_reload(m: Message or CallbackQuery, status=None) -> List[tuple]:
+    """
+    Reload the chat's admins and return them as
+    (id, username/name, anonymous or not) tuples.
+    """
+    start = time()
+    if isinstance(m, CallbackQuery):
+        m = m.message
+    entries = await load_admins(m._client, m.chat.id)
+    LOGGER.debug(f"Loaded admins of {m.chat.id} ({status}) in {round((time() - start), 3)}s")
+    return [i.as_tuple() for i in entries]
+
 
-        return admin_list
+def update_admin_cache(chat_id: int, member, old_member=None) -> None:
+    """Apply a ChatMemberUpdated event to ADMIN_CACHE."""
+    if member is None:
+        if old_member is not None:
+            ADMIN_CACHE.remove_admin(chat_id, old_member.user.id)
+        return
+    if member.status in (ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR):
+        ADMIN_CACHE.set_admin(chat_id, AdminEntry.from_pyrogram(member))
+    else:
+        ADMIN_CACHE.remove_admin(chat_id, member.user.id)
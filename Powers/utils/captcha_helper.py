@@ -1,23 +1,35 @@
+"""
+Powers/utils/captcha_helper.py
+
+Captcha rendering off the event loop.
+Images are rendered by a small thread pool straight into memory, and a
+background task keeps a pool of ready (code, image) pairs so a join gets
+its challenge without waiting on a render.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from random import choice, randint, randrange
+from threading import local
+from traceback import format_exc
 
 import qrcode
 from captcha.image import ImageCaptcha
 
-from Powers.database.captcha_db import CAPTCHA_DATA
+from Powers import LOGGER
 from Powers.utils.string import encode_decode
 
-captchaa = CAPTCHA_DATA()
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+POOL_SIZE      = 64          # pre-rendered image captchas kept ready
+RENDER_THREADS = 2           # threads rendering images and qr codes
+IMAGE_SIZE     = (280, 90)   # width, height of image captchas
 
-async def get_qr_captcha(chat, user, username):
-    initial = f"t.me/{username}?start=qr_"
-    encode = f"{chat}:{user}"
-    encoded = await encode_decode(encode)
-    final = initial + encoded
-    qr = qrcode.make(final)
-    name = f"captcha_verification{chat}_{user}.png"
-    qr.save(name)
-    return name
+# ImageCaptcha caches fonts on the instance, one per render thread
+_thread = local()
 
 
 def genrator():
@@ -39,13 +51,91 @@ def genrator():
     return str_
 
 
-async def get_image_captcha(chat, user):
-    str_ = genrator()
-    captchaa.load_cap_data(chat, user, str_)
-    name = f"captcha_img_{chat}_{user}.png"
-    image = ImageCaptcha(280, 90)
+def _render_image(code: str) -> bytes:
+    if (image := getattr(_thread, "image", None)) is None:
+        image = _thread.image = ImageCaptcha(*IMAGE_SIZE)
+    return image.generate(code).getvalue()
+
+
+def _render_qr(data: str) -> bytes:
+    with BytesIO() as f:
+        qrcode.make(data).save(f)
+        return f.getvalue()
+
+
+def _as_file(data: bytes, name: str) -> BytesIO:
+    f = BytesIO(data)
+    f.name = name
+    return f
+
+
+class CaptchaPool:
+    """
+    Pool of pre-rendered image captchas.
+
+    image() hands out a ready pair and wakes the refill task, when the pool
+    runs dry (a join raid) it renders on the spot in the executor instead.
+    """
+
+    def __init__(self, size: int = POOL_SIZE) -> None:
+        self.size     = size
+        self.executor = ThreadPoolExecutor(max_workers=RENDER_THREADS, thread_name_prefix="captcha")
+        self.pool     = deque()
+        self.wanted   = None
+        self.task     = None
 
-    cap = image.generate(str_)
-    image.write(str_, name)
+    async def render(self, func, *args) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
 
-    return name, str_
+    def start(self):
+        if self.wanted is None:
+            self.wanted = asyncio.Event()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._refill())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    async def _refill(self):
+        while True:
+            try:
+                while len(self.pool) < self.size:
+                    code = genrator()
+                    self.pool.append((code, await self.render(_render_image, code)))
+            except Exception as ef:
+                LOGGER.error(f"[captcha_pool] {ef}")
+                LOGGER.error(format_exc())
+                await asyncio.sleep(5)
+                continue
+            self.wanted.clear()
+            await self.wanted.wait()
+
+    async def image(self):
+        """Return (code, png bytes) of a fresh image captcha."""
+        self.start()
+        if self.pool:
+            code, data = self.pool.popleft()
+        else:
+            code = genrator()
+            data = await self.render(_render_image, code)
+        self.wanted.set()
+        return code, data
+
+
+captcha_pool = CaptchaPool()
+
+
+async def get_qr_captcha(chat, user, username):
+    # The link carries chat and user, so qr codes can't be rendered ahead
+    initial = f"t.me/{username}?start=qr_"
+    encode = f"{chat}:{user}"
+    encoded = await encode_decode(encode)
+    final = initial + encoded
+    data = await captcha_pool.render(_render_qr, final)
+    return _as_file(data, f"captcha_verification{chat}_{user}.png")
+
+
+async def get_image_captcha(chat, user):
+    str_, data = await captcha_pool.image()
+    return _as_file(data, f"captcha_img_{chat}_{user}.png"), str_
@@ -3,22 +3,23 @@ from re import escape
 from shlex import split
 from typing import List, Union
 
-from pyrogram.enums import ChatMemberStatus as CMS
 from pyrogram.enums import ChatType
-from pyrogram.errors import RPCError, UserNotParticipant
+from pyrogram.errors import RPCError
 from pyrogram.filters import create
 from pyrogram.types import CallbackQuery, ChatJoinRequest, Message
 
 from Powers import OWNER_ID, PREFIX_HANDLER
 from Powers.bot_class import Gojo
-from Powers.database.afk_db import AFK
+from Powers.database import run_db
+from Powers.database.afk_db import AFK_USERS
+from Powers.database.antispam_db import ANTISPAM_BANNED
 from Powers.database.approve_db import Approve
 from Powers.database.autojoin_db import AUTOJOIN
 from Powers.database.captcha_db import CAPTCHA
 from Powers.database.disable_db import Disabling
 from Powers.database.flood_db import Floods
 from Powers.supports import get_support_staff
-from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload
+from Powers.utils.caching import ADMIN_CACHE, admin_cache_reload, load_admins
 
 def _get_forward_user(m):
     """Replaces deprecated m.forward_from"""
@@ -35,6 +36,60 @@ def _get_forward_chat(m):
         return None
 
 
+# Built once, the bot's username is only known after the client has started
+COMMAND_RE = None
+
+
+def parse_command(c: Gojo, m: Message):
+    """
+    Parse command and arguments of a message only once.
+    Result is stored on the message so every command filter reuses it.
+    """
+    try:
+        return m._parsed_command
+    except AttributeError:
+        pass
+
+    global COMMAND_RE
+    if COMMAND_RE is None:
+        COMMAND_RE = compile_re(
+            r"^[{prefix}](\w+)(@{bot_name})?(?: |$)(.*)".format(
+                prefix="|".join(escape(x) for x in PREFIX_HANDLER),
+                bot_name=c.me.username,
+            )
+        )
+
+    parsed = None
+    text: str = m.text or m.caption
+    if text and (matches := COMMAND_RE.search(text)):
+        args = []
+        if matches.group(3):
+            try:
+                args = split(matches.group(3))
+            except ValueError:
+                pass
+        parsed = (matches.group(1), args)
+    m._parsed_command = parsed
+    return parsed
+
+
+async def get_admin_ids(m: Message):
+    """Admin ids of the chat from ADMIN_CACHE, reloading it on a miss."""
+    try:
+        return {i[0] for i in ADMIN_CACHE[m.chat.id]}
+    except KeyError:
+        return {i[0] for i in await admin_cache_reload(m, "custom_filter_update")}
+
+
+async def get_admin_entry(m: Message, user_id: int):
+    """
+    AdminEntry of user_id in the chat, False if they aren't an admin.
+    Served from ADMIN_CACHE, the chat's admins are fetched only on a miss.
+    """
+    if (entry := ADMIN_CACHE.get_admin(m.chat.id, user_id)) is None:
+        await load_admins(m._client, m.chat.id)
+        entry = ADMIN_CACHE.get_admin(m.chat.id, user_id)
+    return entry or False
 
 
 def command(
@@ -79,51 +134,30 @@ def command(
                 # Only sudos and above allowed to use it
                 return False
 
-        text: str = m.text or m.caption
-        if not text:
+        if not (parsed := parse_command(c, m)):
             return False
-        regex = r"^[{prefix}](\w+)(@{bot_name})?(?: |$)(.*)".format(
-            prefix="|".join(escape(x) for x in PREFIX_HANDLER),
-            bot_name=c.me.username,
-        )
-        matches = compile_re(regex).search(text)
-        if matches:
-            m.command = [matches.group(1)]
-            if matches.group(1) not in flt.commands:
-                return False
-            if bool(m.chat and m.chat.type in {ChatType.SUPERGROUP, ChatType.GROUP}):
+        cmd, args = parsed
+        m.command = [cmd]
+        if cmd not in flt.commands:
+            return False
+        if bool(m.chat and m.chat.type in {ChatType.SUPERGROUP, ChatType.GROUP}):
+            ddb = Disabling(m.chat.id)
+            if cmd in ddb.get_disabled() and ddb.get_action() == "del":
                 try:
                     if m.chat.is_admin:
-                        user_status = CMS.ADMINISTRATOR
+                        is_admin = True
                     else:
-                        user_status = (await m.chat.get_member(m.from_user.id)).status
-                except UserNotParticipant:
-                    # i.e anon admin
-                    user_status = CMS.ADMINISTRATOR
-                except ValueError:
-                    # i.e. PM
-                    user_status = CMS.OWNER
+                        is_admin = m.from_user.id in await get_admin_ids(m)
                 except RPCError:
                     return False  # Avoid RPCError while checking for user status
 
-                ddb = Disabling(m.chat.id)
-                if str(matches.group(1)) in ddb.get_disabled() and user_status not in (
-                        CMS.OWNER,
-                        CMS.ADMINISTRATOR,
-                ) and ddb.get_action() == "del":
+                if not is_admin:
                     try:
                         await m.delete()
                     except RPCError:
                         return False
-            if matches.group(3) == "":
-                return True
-            try:
-                for arg in split(matches.group(3)):
-                    m.command.append(arg)
-            except ValueError:
-                pass
-            return True
-        return False
+        m.command.extend(args)
+        return True
 
     commands = commands if isinstance(commands, list) else [commands]
     commands = {c if case_sensitive else c.lower() for c in commands}
@@ -215,13 +249,13 @@ async def owner_check_func(_, __, m: Message or CallbackQuery):
     if not m.from_user:
         return False
 
-    user = await m.chat.get_member(m.from_user.id)
+    user = await get_admin_entry(m, m.from_user.id)
 
-    if user.status == CMS.OWNER:
+    if user and user.is_owner:
         status = True
     else:
         status = False
-        if user.status == CMS.ADMINISTRATOR:
+        if user:
             msg = "You're an admin only, stay in your limits!"
         else:
             msg = "Do you think that you can execute owner commands?"
@@ -243,9 +277,9 @@ async def restrict_check_func(_, __, m: Message or CallbackQuery):
     if not m.from_user:
         return False
 
-    user = await m.chat.get_member(m.from_user.id)
+    user = await get_admin_entry(m, m.from_user.id)
 
-    if user and user.status in [CMS.ADMINISTRATOR, CMS.OWNER] and user.privileges.can_restrict_members:
+    if user and user.can("can_restrict_members"):
         status = True
     else:
         status = False
@@ -265,9 +299,9 @@ async def promote_check_func(_, __, m):
     if not m.from_user:
         return False
 
-    user = await m.chat.get_member(m.from_user.id)
+    user = await get_admin_entry(m, m.from_user.id)
 
-    if user.status in [CMS.ADMINISTRATOR, CMS.OWNER] and user.privileges.can_promote_members:
+    if user and user.can("can_promote_members"):
         status = True
     else:
         status = False
@@ -289,9 +323,9 @@ async def changeinfo_check_func(_, __, m):
     if m.sender_chat:
         return True
 
-    user = await m.chat.get_member(m.from_user.id)
+    user = await get_admin_entry(m, m.from_user.id)
 
-    if user.status in [CMS.ADMINISTRATOR, CMS.OWNER] and user.privileges.can_change_info:
+    if user and user.can("can_change_info"):
         status = True
     else:
         status = False
@@ -318,9 +352,9 @@ async def can_pin_message_func(_, __, m):
     if m.from_user.id in SUDO_LEVEL:
         return True
 
-    user = await m.chat.get_member(m.from_user.id)
+    user = await get_admin_entry(m, m.from_user.id)
 
-    if user.status in [CMS.ADMINISTRATOR, CMS.OWNER] and user.privileges.can_pin_messages:
+    if user and user.can("can_pin_messages"):
         status = True
     else:
         status = False
@@ -347,24 +381,16 @@ async def afk_check_filter(_, __, m: Message):
     if m.chat.type == ChatType.PRIVATE:
         return False
 
-    afk = AFK()
+    # In-memory lookups only, afk_checker goes to the db on a hit
     chat = m.chat.id
-    is_repl_afk = None
-    if m.reply_to_message:
-        if repl_user := m.reply_to_message.from_user:
-            repl_user = m.reply_to_message.from_user.id
-            is_repl_afk = afk.check_afk(chat, repl_user)
-            return bool(is_repl_afk)
-
-    user = m.from_user.id
-
-    is_afk = afk.check_afk(chat, user)
-
-    return bool(is_afk)
+    if (chat, m.from_user.id) in AFK_USERS:
+        return True
+    if m.reply_to_message and (repl_user := m.reply_to_message.from_user):
+        return (chat, repl_user.id) in AFK_USERS
+    return False
 
 
 async def flood_check_filter(_, __, m: Message):
-    Flood = Floods()
     if not m.chat:
         return False
 
@@ -374,31 +400,27 @@ async def flood_check_filter(_, __, m: Message):
     if m.chat.type == ChatType.PRIVATE:
         return False
 
-    u_id = m.from_user.id
-    c_id = m.chat.id
-    is_flood = Flood.is_chat(c_id)
-    if not is_flood:
+    # Flood settings live in memory, chats without them cost no I/O
+    if not Floods().is_chat(m.chat.id):
         return False
-    try:
-        admin_group = {i[0] for i in ADMIN_CACHE[m.chat.id]}
-    except KeyError:
-        admin_group = {
-            i[0] for i in await admin_cache_reload(m, "custom_filter_update")
-        }
-    app_users = Approve(m.chat.id).list_approved()
-    SUDO_LEVEL = get_support_staff("sudo_level")
 
+    u_id = m.from_user.id
+    SUDO_LEVEL = get_support_staff("sudo_level")
     if u_id in SUDO_LEVEL:
         return False
 
-    elif u_id in admin_group:
+    if u_id in await get_admin_ids(m):
         return False
 
-    elif u_id in {i[0] for i in app_users}:
+    # Approved users come from the write-through settings cache
+    if (await run_db(Approve, m.chat.id)).check_approve(u_id):
         return False
 
-    else:
-        return True
+    return True
+
+
+async def gban_check_filter(_, __, m: Message):
+    return bool(m.from_user and m.from_user.id in ANTISPAM_BANNED)
 
 
 async def captcha_filt(_, __, m: Message):
@@ -409,6 +431,7 @@ async def captcha_filt(_, __, m: Message):
 
 
 captcha_filter = create(captcha_filt)
+gban_filter = create(gban_check_filter)
 flood_filter = create(flood_check_filter)
 afk_filter = create(afk_check_filter)
 auto_join_filter = create(auto_join_check_filter)
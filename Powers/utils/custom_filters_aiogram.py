@@ -16,14 +16,12 @@ Usage:
 
 from aiogram import Bot
 from aiogram.filters import BaseFilter
-from aiogram.types import (
-    Message, CallbackQuery,
-    ChatMemberAdministrator, ChatMemberOwner,
-)
+from aiogram.types import Message, CallbackQuery
 from aiogram.enums import ChatType
 
 from Powers import OWNER_ID
 from Powers.supports import get_support_staff
+from Powers.utils.caching import get_admin_aiogram
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -42,8 +40,9 @@ def _is_sudo(user_id: int) -> bool:
 
 
 async def _get_member(bot: Bot, chat_id: int, user_id: int):
+    """AdminEntry from the shared ADMIN_CACHE, False if not an admin."""
     try:
-        return await bot.get_chat_member(chat_id, user_id)
+        return await get_admin_aiogram(bot, chat_id, user_id)
     except Exception:
         return None
 
@@ -71,7 +70,7 @@ class AdminFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, (ChatMemberAdministrator, ChatMemberOwner)):
+        if member:
             return True
 
         if isinstance(m, CallbackQuery):
@@ -102,10 +101,10 @@ class OwnerFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, ChatMemberOwner):
+        if member and member.is_owner:
             return True
 
-        if isinstance(member, ChatMemberAdministrator):
+        if member:
             reply = "⚠️ You're an admin only, stay in your limits!"
         else:
             reply = "🚫 Do you think you can execute owner commands?"
@@ -135,9 +134,7 @@ class RestrictFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, ChatMemberOwner):
-            return True
-        if isinstance(member, ChatMemberAdministrator) and member.can_restrict_members:
+        if member and member.can("can_restrict_members"):
             return True
 
         reply = "🚫 You don't have permission to restrict members!"
@@ -166,9 +163,7 @@ class PromoteFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, ChatMemberOwner):
-            return True
-        if isinstance(member, ChatMemberAdministrator) and member.can_promote_members:
+        if member and member.can("can_promote_members"):
             return True
 
         reply = "🚫 You don't have permission to promote members!"
@@ -199,9 +194,7 @@ class CanChangeFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, ChatMemberOwner):
-            return True
-        if isinstance(member, ChatMemberAdministrator) and member.can_change_info:
+        if member and member.can("can_change_info"):
             return True
 
         reply = "🚫 You don't have: can_change_info permission!"
@@ -232,9 +225,7 @@ class CanPinFilter(BaseFilter):
             return True
 
         member = await _get_member(bot, msg.chat.id, user_id)
-        if isinstance(member, ChatMemberOwner):
-            return True
-        if isinstance(member, ChatMemberAdministrator) and member.can_pin_messages:
+        if member and member.can("can_pin_messages"):
             return True
 
         reply = "🚫 You don't have: can_pin_messages permission!"
@@ -255,9 +246,8 @@ class BotAdminFilter(BaseFilter):
         if msg.chat.type not in GROUP_TYPES:
             return False
 
-        bot_info = await bot.get_me()
-        member   = await _get_member(bot, msg.chat.id, bot_info.id)
-        if isinstance(member, (ChatMemberAdministrator, ChatMemberOwner)):
+        member = await _get_member(bot, msg.chat.id, bot.id)
+        if member:
             return True
 
         await msg.reply("🚫 I am not an admin here. Please promote me first!")
@@ -0,0 +1,85 @@
+from collections import OrderedDict, deque
+from threading import RLock
+from time import monotonic
+
+SLIDING = "sliding"
+BUCKET = "bucket"
+FLOOD_MODES = (SLIDING, BUCKET)
+
+
+class _Tracker:
+    """Per (chat, user) flood state."""
+
+    __slots__ = ("hits", "tokens", "last_seen", "within")
+
+    def __init__(self, limit: int, within: int, now: float) -> None:
+        # Ring buffer of the last `limit` message times (sliding mode)
+        self.hits = deque(maxlen=limit)
+        # Remaining tokens (bucket mode), starts full
+        self.tokens = float(limit)
+        self.last_seen = now
+        self.within = within
+
+
+class FloodEngine:
+    """
+    Counts messages per (chat, user) and says when to act.
+
+    sliding: act when `limit` messages fall inside `within` seconds.
+    bucket:  a bucket of `limit` tokens refills at limit/within per second,
+             every message takes one, act when it runs dry.
+
+    Trackers idle for longer than their chat's `within` are evicted lazily
+    on later hits, so memory only holds recently active users.
+    """
+
+    def __init__(self, maxsize: int = 100000) -> None:
+        self.maxsize = maxsize
+        self.trackers = OrderedDict()
+        self.lock = RLock()
+
+    def _evict(self, now: float) -> None:
+        # Oldest touched first, stop at the first tracker still in use
+        while self.trackers:
+            tracker = next(iter(self.trackers.values()))
+            if now - tracker.last_seen <= tracker.within and len(self.trackers) <= self.maxsize:
+                break
+            self.trackers.popitem(last=False)
+
+    def hit(self, chat_id: int, user_id: int, limit: int, within: int, mode: str = SLIDING) -> bool:
+        """Record a message, True if the user is flooding and should be acted on."""
+        now = monotonic()
+        key = (chat_id, user_id)
+        with self.lock:
+            self._evict(now)
+            tracker = self.trackers.get(key)
+            if tracker is None or tracker.hits.maxlen != limit:
+                tracker = _Tracker(limit, within, now)
+                self.trackers[key] = tracker
+            else:
+                self.trackers.move_to_end(key)
+            tracker.within = within
+
+            if mode == BUCKET:
+                elapsed = now - tracker.last_seen
+                tracker.tokens = min(float(limit), tracker.tokens + elapsed * limit / within)
+                tracker.last_seen = now
+                if tracker.tokens < 1:
+                    return True
+                tracker.tokens -= 1
+                return False
+
+            tracker.last_seen = now
+            tracker.hits.append(now)
+            return len(tracker.hits) == limit and now - tracker.hits[0] <= within
+
+    def reset(self, chat_id: int, user_id: int) -> None:
+        """Forget a user's history, called once action has been taken."""
+        with self.lock:
+            self.trackers.pop((chat_id, user_id), None)
+
+    def __len__(self) -> int:
+        return len(self.trackers)
+
+
+flood_engine = FloodEngine()
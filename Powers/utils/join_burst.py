@@ -0,0 +1,157 @@
+"""
+Powers/utils/join_burst.py
+
+Join-burst handling shared by the captcha and greetings plugins.
+Per-user work of a burst runs with bounded concurrency, welcomes that
+arrive close together are sent as one message, and chats with raid mode
+on mute every join while a raid lasts instead of greeting/challenging.
+"""
+import asyncio
+from collections import deque
+from time import monotonic, perf_counter
+from traceback import format_exc
+
+from cachetools import TTLCache
+from pyrogram.errors import RPCError
+from pyrogram.types import ChatPermissions
+from pyrogram.types import InlineKeyboardButton as IKB
+from pyrogram.types import InlineKeyboardMarkup as IKM
+
+from Powers import LOGGER
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+JOIN_CONCURRENCY = 8     # restrictions / captchas in flight per burst
+WELCOME_WINDOW   = 3     # seconds, joins inside it share one welcome
+MAX_MENTIONS     = 30    # users named in a coalesced welcome, the rest are counted
+RAID_THRESHOLD   = 15    # joins within RAID_WINDOW that start a raid
+RAID_WINDOW      = 10    # seconds
+RAID_COOLDOWN    = 60    # quiet seconds that end a raid
+
+
+async def fan_out(func, items, limit: int = JOIN_CONCURRENCY) -> list:
+    """Await func(item) for every item, at most `limit` at once."""
+    sem = asyncio.Semaphore(limit)
+
+    async def _one(item):
+        async with sem:
+            try:
+                return await func(item)
+            except Exception as ef:
+                LOGGER.error(f"[join_burst] {ef}")
+                LOGGER.error(format_exc())
+                return ef
+
+    return await asyncio.gather(*(_one(i) for i in items))
+
+
+class WelcomeBatcher:
+    """
+    Coalesce welcomes per chat.
+
+    The first join in a quiet chat is welcomed straight away. Joins that
+    follow within WELCOME_WINDOW are held and sent together once the
+    window closes.
+    """
+
+    def __init__(self, window: float = WELCOME_WINDOW) -> None:
+        self.window  = window
+        self.pending = {}  # chat_id -> [(message, user), ...]
+        # chat_id -> True while a welcome was sent less than `window` ago
+        self.recent  = TTLCache(maxsize=8192, ttl=window, timer=perf_counter)
+
+    def add(self, chat_id: int, m, users, flush):
+        """
+        Queue the users of a join message. Returns the batch to welcome now,
+        or None when it was held for a later flush(chat_id, batch) call.
+        """
+        items = [(m, user) for user in users]
+        if chat_id in self.pending:
+            self.pending[chat_id].extend(items)
+            return None
+        if chat_id not in self.recent:
+            self.recent[chat_id] = True
+            return items
+        self.pending[chat_id] = items
+        asyncio.create_task(self._flush_later(chat_id, flush))
+        return None
+
+    async def _flush_later(self, chat_id: int, flush):
+        await asyncio.sleep(self.window)
+        batch = self.pending.pop(chat_id, [])
+        self.recent[chat_id] = True
+        if batch:
+            try:
+                await flush(chat_id, batch)
+            except Exception as ef:
+                LOGGER.error(f"[join_burst] welcome flush failed: {ef}")
+                LOGGER.error(format_exc())
+
+
+class RaidGuard:
+    """
+    Join rate per chat. A chat is raided once RAID_THRESHOLD joins land
+    within RAID_WINDOW, and stays raided until RAID_COOLDOWN passes
+    without joins. Users muted during the latest raid are remembered so
+    admins can release them in one go.
+    """
+
+    def __init__(self) -> None:
+        self.joins    = {}     # chat_id -> deque of join times
+        self.raids    = {}     # chat_id -> monotonic time the raid ends
+        self.held     = {}     # chat_id -> user ids muted in the latest raid
+        self.notified = set()  # chats whose current raid already got a notice
+
+    def record(self, chat_id: int, count: int) -> bool:
+        """Count `count` joins, returns True if the chat is being raided."""
+        now = monotonic()
+        joins = self.joins.setdefault(chat_id, deque(maxlen=RAID_THRESHOLD))
+        joins.extend([now] * count)
+        if (until := self.raids.get(chat_id)) and now < until:
+            self.raids[chat_id] = now + RAID_COOLDOWN
+            return True
+        self.raids.pop(chat_id, None)
+        if len(joins) == RAID_THRESHOLD and now - joins[0] <= RAID_WINDOW:
+            self.raids[chat_id] = now + RAID_COOLDOWN
+            # New raid, new notice and a fresh list for its button
+            self.held[chat_id] = set()
+            self.notified.discard(chat_id)
+            LOGGER.warning(f"[join_burst] Raid detected in {chat_id}")
+            return True
+        return False
+
+    async def hold(self, c, chat_id: int, users) -> None:
+        """Mute users that joined during a raid, one notice per raid."""
+        notify = chat_id not in self.notified
+        self.notified.add(chat_id)
+        held = self.held.setdefault(chat_id, set())
+
+        async def _mute(user):
+            await c.restrict_chat_member(chat_id, user.id, ChatPermissions())
+            held.add(user.id)
+
+        await fan_out(_mute, users)
+        if notify:
+            kb = IKM([[IKB("Unmute all", "raid_release")]])
+            try:
+                await c.send_message(
+                    chat_id,
+                    "🚨 <b>Raid detected!</b>\n"
+                    "New members are being muted until the join burst is over.\n"
+                    "Admins can unmute everyone caught by raid mode below.",
+                    reply_markup=kb,
+                )
+            except RPCError as ef:
+                LOGGER.error(ef)
+
+    async def release(self, c, chat_id: int) -> int:
+        """Unmute everyone held in chat_id, returns how many were released."""
+        held = self.held.pop(chat_id, set())
+        results = await fan_out(lambda user_id: c.unban_chat_member(chat_id, user_id), held)
+        return sum(not isinstance(i, Exception) for i in results)
+
+
+welcome_batcher = WelcomeBatcher()
+raid_guard = RaidGuard()
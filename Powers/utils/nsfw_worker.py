@@ -0,0 +1,121 @@
+"""
+Powers/utils/nsfw_worker.py
+
+Runs NSFW inference off the event loop.
+One worker thread owns the Keras models, an asyncio queue sits in front
+of it and images arriving close together are scanned in one predict call.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from traceback import format_exc
+from typing import Optional
+
+from Powers import LOGGER
+from Powers.utils.predict import detect_nsfw_batch
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# CONFIG
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+MAX_BATCH_SIZE = 16     # images per predict call
+BATCH_WINDOW   = 0.05   # seconds to wait for more images after the first
+MAX_QUEUE_SIZE = 64     # pending images before new ones are dropped
+MAX_WAIT       = 30     # seconds an image may wait before it is skipped
+
+
+class InferenceService:
+    """
+    Async front for detect_nsfw_batch.
+
+    detect() queues an image and awaits its verdict. When the queue is full
+    the image is not scanned and detect() returns None straight away, so a
+    media flood can't pile up unbounded work behind the models.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH_SIZE,
+        window: float = BATCH_WINDOW,
+        max_queue: int = MAX_QUEUE_SIZE,
+        max_wait: float = MAX_WAIT,
+    ) -> None:
+        self.max_batch = max_batch
+        self.window    = window
+        self.max_queue = max_queue
+        self.max_wait  = max_wait
+        # Single thread — TF models are owned and only ever called by it
+        self.executor  = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nsfw_infer")
+        self.queue     = None
+        self.task      = None
+        self.stats     = {"scanned": 0, "batches": 0, "dropped": 0}
+
+    def _ensure_worker(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._worker())
+
+    async def detect(self, image) -> Optional[dict]:
+        """
+        Scan an image array (or a file path, deleted after scanning).
+        Returns None if the image was dropped.
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((image, future, monotonic()))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            LOGGER.warning("[nsfw_worker] Queue full, skipping scan.")
+            return None
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one image, then gather more until the window closes."""
+        batch    = [await self.queue.get()]
+        deadline = monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+
+            # Drop images that waited too long or whose handler gave up
+            now, fresh = monotonic(), []
+            for image, future, queued_at in batch:
+                if future.done() or now - queued_at > self.max_wait:
+                    self.stats["dropped"] += 1
+                    if not future.done():
+                        future.set_result(None)
+                    continue
+                fresh.append((image, future))
+            if not fresh:
+                continue
+
+            images = [image for image, _ in fresh]
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, detect_nsfw_batch, images)
+            except Exception as ef:
+                LOGGER.error(f"[nsfw_worker] {ef}")
+                LOGGER.error(format_exc())
+                results = [None] * len(images)
+
+            self.stats["batches"] += 1
+            self.stats["scanned"] += len(images)
+            for (_, future), result in zip(fresh, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+nsfw_service = InferenceService()
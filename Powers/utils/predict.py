@@ -1,6 +1,7 @@
 import os
 
 import numpy as np
+from PIL import Image
 import tensorflow as tf
 import tensorflow_hub as hub
 from tensorflow import keras
@@ -132,13 +133,51 @@ nsfw_model   = load_nsfw_model()
 object_model = load_object_model()
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# PREPROCESSING
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+NSFW_CATEGORIES = ['drawings', 'hentai', 'neutral', 'porn', 'sexy']
+
+
+def load_image(image_path: str) -> np.ndarray:
+    """Image file → (224, 224, 3) float array scaled to 0..1."""
+    img = keras.preprocessing.image.load_img(
+        image_path, target_size=(IMAGE_DIM, IMAGE_DIM)
+    )
+    return keras.preprocessing.image.img_to_array(img) / 255.0
+
+
+def image_to_array(img: Image.Image) -> np.ndarray:
+    """Decoded image → (224, 224, 3) float array, same as load_image."""
+    img = img.convert("RGB").resize((IMAGE_DIM, IMAGE_DIM), Image.NEAREST)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def image_dhash(img: Image.Image, size: int = 8) -> str:
+    """
+    Difference hash of an image as a hex string.
+    Re-encoded/resized copies of the same picture get the same hash.
+    """
+    gray   = img.convert("L").resize((size + 1, size), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.int16)
+    bits   = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):0{size * size // 4}x}"
+
+
+def prepare_image(img: Image.Image) -> tuple:
+    """(dhash, model input array) for a decoded image, no disk involved."""
+    return image_dhash(img), image_to_array(img)
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # NSFW CLASSIFICATION
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def classify_nsfw(image_path: str) -> dict:
+def classify_nsfw_batch(batch: np.ndarray) -> list:
     """
-    Returns probabilities for each NSFW category.
+    One predict call for a (N, 224, 224, 3) batch.
+    Returns a list of N dicts:
     {
         'drawings': 0.01,
         'hentai':   0.02,
@@ -147,86 +186,152 @@ def classify_nsfw(image_path: str) -> dict:
         'sexy':     0.02
     }
     """
-    img = keras.preprocessing.image.load_img(
-        image_path, target_size=(IMAGE_DIM, IMAGE_DIM)
-    )
-    img = keras.preprocessing.image.img_to_array(img) / 255.0
-    img = np.expand_dims(img, axis=0)
+    predictions = nsfw_model.predict(batch, verbose=0)
+    return [
+        {cat: float(pred[i]) for i, cat in enumerate(NSFW_CATEGORIES)}
+        for pred in predictions
+    ]
 
-    categories   = ['drawings', 'hentai', 'neutral', 'porn', 'sexy']
-    predictions  = nsfw_model.predict(img)[0]
 
-    return {cat: float(predictions[i]) for i, cat in enumerate(categories)}
+def classify_nsfw(image_path: str) -> dict:
+    """Single image version of classify_nsfw_batch."""
+    return classify_nsfw_batch(np.expand_dims(load_image(image_path), axis=0))[0]
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # OBJECT DETECTION (weapons / drugs)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def classify_objects(image_path: str, confidence: float = 0.45) -> dict:
-    """
-    Detect weapons and drug-related objects in image.
-    Returns:
-    {
-        'has_weapon': True/False,
-        'has_drugs':  True/False,
-        'detections': [{'label': 'gun', 'confidence': 0.87}, ...]
-    }
-    """
+def _parse_detections(detections, confidence: float) -> dict:
     result = {
         'has_weapon': False,
         'has_drugs':  False,
         'detections': []
     }
 
-    if object_model is None:
-        return result  # Model not loaded — skip silently
+    for det in detections:
+        score    = float(det[5]) if len(det) > 5 else float(det[4])
+        class_id = int(det[4])   if len(det) > 5 else int(det[3])
+        label    = WEAPON_CLASS_IDS.get(class_id, f"class_{class_id}").lower()
 
-    try:
-        img = keras.preprocessing.image.load_img(
-            image_path, target_size=(IMAGE_DIM, IMAGE_DIM)
-        )
-        img = keras.preprocessing.image.img_to_array(img) / 255.0
-        img = np.expand_dims(img, axis=0)
+        if score < confidence:
+            continue
 
-        raw = object_model.predict(img)
+        is_weapon = any(w in label for w in WEAPON_KEYWORDS)
+        is_drug   = any(d in label for d in DRUG_KEYWORDS)
 
-        # raw shape: (1, num_detections, 6) — [y1, x1, y2, x2, class_id, score]
-        # Adjust based on your actual model output format
-        detections = raw[0] if len(raw.shape) == 3 else raw
+        if is_weapon or is_drug:
+            result['detections'].append({
+                'label':      label,
+                'confidence': round(score, 3),
+                'type':       'weapon' if is_weapon else 'drug'
+            })
+            if is_weapon:
+                result['has_weapon'] = True
+            if is_drug:
+                result['has_drugs'] = True
 
-        for det in detections:
-            score    = float(det[5]) if len(det) > 5 else float(det[4])
-            class_id = int(det[4])   if len(det) > 5 else int(det[3])
-            label    = WEAPON_CLASS_IDS.get(class_id, f"class_{class_id}").lower()
+    return result
 
-            if score < confidence:
-                continue
 
-            is_weapon = any(w in label for w in WEAPON_KEYWORDS)
-            is_drug   = any(d in label for d in DRUG_KEYWORDS)
+def classify_objects_batch(batch: np.ndarray, confidence: float = 0.45) -> list:
+    """
+    Detect weapons and drug-related objects for a whole batch.
+    Returns a list of N dicts:
+    {
+        'has_weapon': True/False,
+        'has_drugs':  True/False,
+        'detections': [{'label': 'gun', 'confidence': 0.87}, ...]
+    }
+    """
+    empty = [_parse_detections([], confidence) for _ in range(len(batch))]
 
-            if is_weapon or is_drug:
-                result['detections'].append({
-                    'label':      label,
-                    'confidence': round(score, 3),
-                    'type':       'weapon' if is_weapon else 'drug'
-                })
-                if is_weapon:
-                    result['has_weapon'] = True
-                if is_drug:
-                    result['has_drugs'] = True
+    if object_model is None:
+        return empty  # Model not loaded — skip silently
 
+    try:
+        raw = object_model.predict(batch, verbose=0)
     except Exception:
-        pass  # Detection failed — return empty result
+        return empty  # Detection failed — return empty result
 
-    return result
+    # raw shape: (N, num_detections, 6) — [y1, x1, y2, x2, class_id, score]
+    # Adjust based on your actual model output format
+    results = []
+    for i in range(len(batch)):
+        try:
+            if len(raw.shape) == 3:
+                detections = raw[i]
+            elif len(batch) == 1:
+                detections = raw
+            else:
+                detections = []
+            results.append(_parse_detections(detections, confidence))
+        except Exception:
+            results.append(empty[i])
+    return results
+
+
+def classify_objects(image_path: str, confidence: float = 0.45) -> dict:
+    """Single image version of classify_objects_batch."""
+    try:
+        batch = np.expand_dims(load_image(image_path), axis=0)
+    except Exception:
+        return _parse_detections([], confidence)
+    return classify_objects_batch(batch, confidence)[0]
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # MAIN DETECT FUNCTION — use this in your bot
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+def _build_result(nsfw: dict, objects: dict) -> dict:
+    return {
+        'nsfw':       nsfw,
+        'is_nsfw':    (nsfw.get('porn', 0) + nsfw.get('hentai', 0)) > 0.40,
+        'is_sexy':    nsfw.get('sexy', 0) > 0.50,
+        'has_weapon': objects['has_weapon'],
+        'has_drugs':  objects['has_drugs'],
+        'detections': objects['detections'],
+    }
+
+
+def detect_nsfw_batch(images: list) -> list:
+    """
+    detect_nsfw for many images with a single predict call per model.
+    Each item is a file path or an array from image_to_array.
+    Returns one result (or None if the image couldn't be read) per item.
+    Files are deleted afterwards.
+    """
+    try:
+        arrays, loaded = [], []
+        for i, image in enumerate(images):
+            try:
+                arrays.append(image if isinstance(image, np.ndarray) else load_image(image))
+                loaded.append(i)
+            except Exception:
+                continue
+
+        results = [None] * len(images)
+        if not arrays:
+            return results
+
+        batch   = np.stack(arrays)
+        nsfw    = classify_nsfw_batch(batch)
+        objects = classify_objects_batch(batch)
+        for n, i in enumerate(loaded):
+            results[i] = _build_result(nsfw[n], objects[n])
+        return results
+
+    finally:
+        # Always delete temp images
+        for image in images:
+            if isinstance(image, str):
+                try:
+                    os.remove(image)
+                except Exception:
+                    pass
+
+
 def detect_nsfw(image_path: str) -> dict:
     """
     Full detection — NSFW + weapons + drugs.
@@ -244,27 +349,7 @@ def detect_nsfw(image_path: str) -> dict:
         'detections': [...]        # weapon/drug detections
     }
     """
-    try:
-        nsfw    = classify_nsfw(image_path)
-        objects = classify_objects(image_path)
-
-        result = {
-            'nsfw':       nsfw,
-            'is_nsfw':    (nsfw.get('porn', 0) + nsfw.get('hentai', 0)) > 0.40,
-            'is_sexy':    nsfw.get('sexy', 0) > 0.50,
-            'has_weapon': objects['has_weapon'],
-            'has_drugs':  objects['has_drugs'],
-            'detections': objects['detections'],
-        }
-
-        return result
-
-    finally:
-        # Always delete temp image
-        try:
-            os.remove(image_path)
-        except Exception:
-            pass
+    return detect_nsfw_batch([image_path])[0]
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
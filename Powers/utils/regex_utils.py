@@ -1,9 +1,75 @@
+from itertools import count
+from threading import RLock
+from time import perf_counter
 from traceback import format_exc
 
-from regex import search
+from cachetools import TTLCache
+from regex import compile as compile_re
+from regex import escape, search
 
 from Powers import LOGGER
 
+# (kind, chat_id) -> TriggerMatcher or None when the chat has no triggers
+TRIGGER_MATCHERS = TTLCache(maxsize=2048, ttl=(60 * 60), timer=perf_counter)
+# (kind, chat_id) -> stamp of its latest invalidation, a matcher built from
+# triggers loaded before it is never cached. Stamps come from one global
+# counter so an evicted entry can't come back with a value a loader saw.
+MATCHER_GENERATIONS = TTLCache(maxsize=4096, ttl=(60 * 60), timer=perf_counter)
+_GENERATION = count(1)
+MATCHER_LOCK = RLock()
+
+
+class TriggerMatcher:
+    """All triggers of a chat compiled into one word-bounded alternation."""
+
+    def __init__(self, triggers: dict) -> None:
+        # triggers maps each alias to the keyword it belongs to
+        self.triggers = triggers
+        # Longest first so that overlapping aliases prefer the specific one
+        alternation = "|".join(
+            escape(i) for i in sorted(triggers, key=len, reverse=True)
+        )
+        self.pattern = compile_re(r"(?<!\w)(" + alternation + r")(?!\w)")
+
+    def search(self, text: str):
+        """Return the keyword of the first trigger found in text, else None."""
+        try:
+            match = self.pattern.search(text, timeout=6)
+        except TimeoutError:
+            return None
+        except Exception:
+            LOGGER.error(format_exc())
+            return None
+        return self.triggers[match.group(1)] if match else None
+
+
+async def get_trigger_matcher(kind: str, chat_id: int, load_triggers):
+    """
+    Return the cached matcher for a chat, building it on a miss.
+    load_triggers is awaited on a miss and must return {alias: keyword}.
+    """
+    key = (kind, chat_id)
+    with MATCHER_LOCK:
+        try:
+            return TRIGGER_MATCHERS[key]
+        except KeyError:
+            generation = MATCHER_GENERATIONS.get(key, 0)
+    triggers = await load_triggers()
+    matcher = TriggerMatcher(triggers) if triggers else None
+    with MATCHER_LOCK:
+        # Triggers changed while loading, use this matcher once but don't keep it
+        if MATCHER_GENERATIONS.get(key, 0) == generation:
+            TRIGGER_MATCHERS[key] = matcher
+    return matcher
+
+
+def invalidate_trigger_matcher(kind: str, chat_id: int) -> None:
+    """Drop a chat's matcher, call it after its triggers were written."""
+    key = (kind, chat_id)
+    with MATCHER_LOCK:
+        MATCHER_GENERATIONS[key] = next(_GENERATION)
+        TRIGGER_MATCHERS.pop(key, None)
+
 
 async def regex_searcher(regex_string: str, string: str) -> str:
     """Search for Regex in string."""
@@ -46,7 +46,9 @@ class Config:
     SUPPORT_GROUP   = config("SUPPORT_GROUP", default="gojo_bots_network")
     SUPPORT_CHANNEL = config("SUPPORT_CHANNEL", default="SUPPORT_CHANNEL")
     WORKERS         = int(config("WORKERS", default=16))
+    DB_WORKERS      = int(config("DB_WORKERS", default=8))
     TIME_ZONE       = config("TIME_ZONE", default="Asia/Kolkata")
+    BIO_CACHE_TTL   = int(config("BIO_CACHE_TTL", default=600))
 
     # ── Auto-filled at runtime ────────────────────────────────────────────────
     BOT_USERNAME = ""
@@ -82,7 +84,9 @@ class Development:
     SUPPORT_GROUP   = "SUPPORT_GROUP"
     SUPPORT_CHANNEL = "SUPPORT_CHANNEL"
     WORKERS         = 8
+    DB_WORKERS      = 8
     TIME_ZONE       = "Asia/Kolkata"
+    BIO_CACHE_TTL   = 600
 
     BOT_USERNAME = ""
     BOT_ID       = ""